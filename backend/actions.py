@@ -1,14 +1,16 @@
 from typing import List, Dict, Optional, Any
+from collections import Counter
 import json
 from langchain_core.tools import tool
 import os
-from collections import Counter
-from rapidfuzz import fuzz
+from concurrent.futures import ThreadPoolExecutor
 from backend.config import *
-import pandas as pd
 from backend.schemas import *
 from backend.prompt import *
-from backend.tools.rag_tools import ingest_endpoints_to_rag
+from backend.tools.rag_tools import attach_persisted_vectors, background_ingestion, ingest_endpoints_to_rag, semantic_rankings
+from backend.loader import load_collection_file
+from backend.snapshot import fingerprint_file
+from backend.workspace import LoadedCollection, missing_collection_message
 from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
 import backend.store as store
 
@@ -44,7 +46,7 @@ def normalize_path(file_path: str) -> str:
 
 
 @tool("load_postman_collection", args_schema=LoadPostmanCollectionInput)
-def load_postman_collection(file_path: str) -> str:
+def load_postman_collection(file_path: str, streaming: Optional[bool] = None) -> str:
     """
     Load and parse a Postman Collection JSON file from backend/data/collections only.
     """
@@ -60,53 +62,49 @@ def load_postman_collection(file_path: str) -> str:
         print(f"[load_postman_collection] Available files: {available_files}")
         return f"Error: File not found: {target_path}\nAvailable files in collections directory:\n{file_suggestions}"
     try:
-        print(f"[load_postman_collection] Opening file: {target_path}")
-        with open(target_path, "r", encoding="utf-8") as f:
-            store.collection_data = json.load(f)
-        print(f"[load_postman_collection] Loaded JSON successfully.")
-        collection_name = store.collection_data.get("info", {}).get("name", "Unnamed Collection")
+        name = os.path.splitext(os.path.basename(target_path))[0]
+        loaded = store.workspace.get(name)
+        if loaded is not None and loaded.fingerprint == fingerprint_file(target_path):
+            # Already resident and unchanged: keep its index and embeddings as they are
+            store.workspace.activate(loaded.name)
+            load_report = f"Collection '{name}' was already loaded and is unchanged."
+        else:
+            print(f"[load_postman_collection] Loading file: {target_path}")
+            # Parsed (or streamed) on first load, memory-mapped from the snapshot cache afterwards
+            load_result = load_collection_file(target_path, streaming=streaming)
+            loaded = store.workspace.add(LoadedCollection(
+                name=name,
+                source_path=target_path,
+                index=load_result.index,
+                header=load_result.header,
+            ))
+            load_report = load_result.summary()
+            # Built now so the first search or endpoint lookup does not pay for it
+            load_result.index.warm()
+        print(f"[load_postman_collection] {load_report}")
+
+        collection_name = loaded.title
         print(f"[load_postman_collection] Collection name: {collection_name}")
 
-        # Convert to DataFrame
-        def flatten_postman_items(items, parent_folder=''):
-            rows = []
-            for item in items:
-                if 'item' in item:
-                    # Folder level - recurse
-                    folder_name = f"{parent_folder}/{item['name']}" if parent_folder else item['name']
-                    print(f"[flatten_postman_items] Entering folder: {folder_name}")
-                    rows.extend(flatten_postman_items(item['item'], folder_name))
-                else:
-                    request = item.get('request', {})
-                    url = request.get('url', {})
-                    full_url = url.get('raw', '') if isinstance(url, dict) else url
-                    row = {
-                        'endpoint_name': item.get('name'),
-                        'endpoint_description': item.get('description'),
-                        'endpoint_method': request.get('method'),
-                        'endpoint_url': full_url,
-                        'endpoint_headers': request.get('header', []),
-                        'endpoint_body': request.get('body', {}),
-                        'parent_folder': parent_folder,
-                    }
-                    print(f"[flatten_postman_items] Adding endpoint: {row['endpoint_name']} (method: {row['endpoint_method']}, url: {row['endpoint_url']})")
-                    rows.append(row)
-            return rows
-
-        flattened = flatten_postman_items(store.collection_data.get('item', []))
-        print(f"[load_postman_collection] Flattened {len(flattened)} endpoints.")
-        store.collection_df = pd.DataFrame(flattened)
-        print(f"[load_postman_collection] DataFrame created with shape: {store.collection_df.shape}")
-
-        # Optional: trigger ingestion process
-        try:
-            print(f"[load_postman_collection] Triggering ingest_endpoints_to_rag()...")
-            ingest_result = ingest_endpoints_to_rag()
-            print(f"[load_postman_collection] Ingest result: {ingest_result}")
-        except Exception as e:
-            print(f"[load_postman_collection] Error ingesting to RAG: {str(e)}")
+        # Vectors persisted for this very version (e.g. before a restart) are reused without re-embedding
+        attach_persisted_vectors(loaded)
 
-        return f"Collection '{collection_name}' loaded, ingested to veector db, and converted to dataframe successfully and ready for analysis."
+        # Structural tools are ready now; embeddings for semantic search are built after this returns
+        if not loaded.loaded_to_rag and RAG_INGESTION_CONFIG["background"]:
+            background_ingestion.submit(loaded)
+            print("[load_postman_collection] Queued background ingestion")
+            return (f"Collection '{collection_name}' loaded and converted to dataframe successfully and ready for analysis. "
+                    f"Semantic search is being prepared in the background and answers from the endpoints ingested so far meanwhile.\n{load_report}")
+
+        if not loaded.loaded_to_rag:
+            try:
+                print(f"[load_postman_collection] Triggering ingest_endpoints_to_rag()...")
+                ingest_result = ingest_endpoints_to_rag(loaded)
+                print(f"[load_postman_collection] Ingest result: {ingest_result}")
+            except Exception as e:
+                print(f"[load_postman_collection] Error ingesting to RAG: {str(e)}")
+
+        return f"Collection '{collection_name}' loaded, ingested to veector db, and converted to dataframe successfully and ready for analysis.\n{load_report}"
 
     except json.JSONDecodeError as e:
         print(f"[load_postman_collection] JSONDecodeError: {str(e)}")
@@ -115,58 +113,60 @@ def load_postman_collection(file_path: str) -> str:
         print(f"[load_postman_collection] Exception: {str(e)}")
         return f"Failed to load collection: {str(e)}"
     
-@tool("clear_collection")
-def clear_collection() -> str:
+@tool("clear_collection", args_schema=CollectionSelectorInput)
+def clear_collection(collection: Optional[str] = None) -> str:
     """
-    Clear the currently loaded Postman Collection from memory. No input is required.
+    Clear a loaded Postman Collection from memory. Without input, the most recently loaded collection is cleared.
     """
-    store.collection_data = None
+    cleared = store.workspace.remove(collection)
+    if cleared is None:
+        return missing_collection_message(store.workspace, collection)
+
+    return f"Collection '{cleared.name}' has been successfully cleared from memory."
+
 
-    return "Collection has been successfully cleared from memory."
+@tool("list_loaded_collections")
+def list_loaded_collections() -> List[Dict[str, Any]]:
+    """
+    List the collections currently loaded in memory, marking the one tools use by default.
+    """
+    if not len(store.workspace):
+        return [{"error": missing_collection_message(store.workspace)}]
+
+    active = store.workspace.active
+    return [
+        {
+            "name": loaded.name,
+            "title": loaded.title,
+            "endpoints": len(loaded.index),
+            "active": loaded is active,
+            "semantic_search_ready": loaded.loaded_to_rag,
+            "rag_ingestion": background_ingestion.status(loaded),
+            "payload_memory": loaded.index.payload_stats.summary() if loaded.index.payload_stats else None,
+            "detail_cache": store.detail_cache.stats(loaded.fingerprint),
+        }
+        for loaded in store.workspace
+    ]
 
-@tool("list_all_endpoints")
-def list_all_endpoints() -> List[str]:
+@tool("list_all_endpoints", args_schema=CollectionSelectorInput)
+def list_all_endpoints(collection: Optional[str] = None) -> List[str]:
     """
     List all API endpoints from the loaded Postman Collection.
     """
 
-    if not store.collection_data:
-        return ["No collection loaded. Please load a collection first using the load_postman_collection tool."]
-    
-    endpoints = []
-    
-    def process_items(items, parent_folder=""):
-        for item in items:
-            name = item.get("name", "")
-            full_name = f"{parent_folder}/{name}" if parent_folder else name
-            
-            if "request" in item:
-                method = item["request"]["method"]
-                url = item["request"]["url"]
-                path = ""
-                if isinstance(url, dict):
-                    host = url.get("host", [])
-                    if isinstance(host, list):
-                        host = ".".join(host)
-                    path_array = url.get("path", [])
-                    if path_array:
-                        path = "/" + "/".join(path_array)
-                    elif "raw" in url:
-                        path = url["raw"]
-                else:
-                    path = str(url)
-            
-                endpoints.append({
-                    "parent_folder": parent_folder,
-                    "name": name,
-                    "method": method,
-                    "path": path,
-                })
-            
-            if "item" in item:
-                process_items(item["item"], full_name)
-    
-    process_items(store.collection_data.get("item", []))
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return [missing_collection_message(store.workspace, collection)]
+    
+    endpoints = [
+        {
+            "parent_folder": endpoint.parent_folder,
+            "name": endpoint.name,
+            "method": endpoint.method,
+            "path": endpoint.path,
+        }
+        for endpoint in loaded.index.endpoints
+    ]
     
     if not endpoints:
         return ["No endpoints found in the collection."]
@@ -175,258 +175,166 @@ def list_all_endpoints() -> List[str]:
 
 
 @tool("search_endpoints_by_keyword", args_schema=SearchEndpointsInput)
-def search_endpoints_by_keyword(keyword: str, threshold: int = 60, max_results: int = 20) -> List[str]:
+def search_endpoints_by_keyword(keyword: str, threshold: int = 60, max_results: int = 20, collection: Optional[str] = None) -> List[str]:
     """
     Search endpoints containing a specific keyword using fuzzy matching.
     Args:
         keyword: The keyword to search for
         threshold: Similarity threshold (0-100) for fuzzy matching. Default is 60.
         max_results: Maximum number of results to return. Default is 20.
+        collection: Name of the loaded collection to search. Defaults to the most recently loaded one.
     """
-    if not store.collection_data:
-        return ["No collection loaded. Please load a collection first using the load_postman_collection tool."]
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return [missing_collection_message(store.workspace, collection)]
     
     keyword = keyword.lower()
-    # Store matches with their scores
-    matches_with_scores = []
     
-    def search_items(items, parent_folder=""):
-        for item in items:
-            name = item.get("name", "").lower()
-            full_name = f"{parent_folder}/{name}" if parent_folder else name
-            
-            # Search in name with fuzzy matching
-            name_score = fuzz.partial_ratio(keyword, name)
-            if name_score >= threshold:
-                match_info = None
-                if "request" in item:
-                    method = item["request"]["method"]
-                    match_info = f"{method} - {full_name}"
-                else:
-                    match_info = f"Folder: {full_name}"
-                
-                if match_info:
-                    matches_with_scores.append((match_info, name_score))
-            
-            # Search in URL and headers
-            if "request" in item:
-                request = item["request"]
-                url = request.get("url", {})
-                
-                # Search in URL with fuzzy matching
-                if isinstance(url, dict):
-                    url_raw = url.get("raw", "").lower()
-                    url_score = fuzz.partial_ratio(keyword, url_raw)
-                    if url_score >= threshold:
-                        match_info = f"{request.get('method', 'UNKNOWN')} {url_raw} - {full_name}"
-                        matches_with_scores.append((match_info, url_score))
-                
-                # Search in headers
-                headers = request.get("header", [])
-                for header in headers:
-                    header_key = header.get("key", "").lower()
-                    header_value = header.get("value", "").lower()
-                    
-                    key_score = fuzz.partial_ratio(keyword, header_key)
-                    value_score = fuzz.partial_ratio(keyword, header_value)
-                    
-                    if max(key_score, value_score) >= threshold:
-                        match_info = f"{request.get('method', 'UNKNOWN')} {full_name} - Header: {header.get('key', '')}"
-                        matches_with_scores.append((match_info, max(key_score, value_score)))
-                
-                # Search in body
-                body = request.get("body", {})
-                if body and isinstance(body, dict):
-                    body_mode = body.get("mode", "")
-                    if body_mode == "raw":
-                        body_text = body.get("raw", "").lower()
-                        body_score = fuzz.partial_ratio(keyword, body_text)
-                        if body_score >= threshold:
-                            match_info = f"{request.get('method', 'UNKNOWN')} {full_name} - Found in request body"
-                            matches_with_scores.append((match_info, body_score))
-            
-            # Search in response examples
-            if "response" in item:
-                for resp in item["response"]:
-                    resp_text = json.dumps(resp).lower()
-                    resp_score = fuzz.partial_ratio(keyword, resp_text)
-                    if resp_score >= threshold:
-                        match_info = f"{full_name} - Found in response example"
-                        matches_with_scores.append((match_info, resp_score))
-            
-            # Recursively search in nested items
-            if "item" in item:
-                search_items(item["item"], full_name)
-    
-    search_items(store.collection_data.get("item", []))
-    
-    if not matches_with_scores:
+    # Bounded top-k: fields that cannot beat the current k-th score are never fully scored
+    top_matches = loaded.index.keyword_index.top_matches(keyword, threshold, max(max_results, 1))
+    if not top_matches:
         return [f"No items found containing '{keyword}' with similarity threshold of {threshold}%."]
     
-    # Sort matches by score in descending order and remove duplicates
-    unique_matches = {}
-    for match, score in matches_with_scores:
-        if match not in unique_matches or score > unique_matches[match]:
-            unique_matches[match] = score
-    
-    # Sort by score and format results with score
-    sorted_matches = sorted(
-        [(match, score) for match, score in unique_matches.items()], 
-        key=lambda x: x[1], 
-        reverse=True
-    )
-    
-    # Limit results and format with score percentage
+    # Format results with score percentage
     result_matches = []
-    for match, score in sorted_matches[:max_results]:
+    for match, score in top_matches[:max_results]:
         result_matches.append(f"[Match: {score}%] {match}")
     
     return result_matches
 
-@tool("get_endpoint_details", args_schema=EndpointDetailsInput)
-def get_endpoint_details(endpoint_name: str) -> str:
+@tool("lexical_search_endpoints", args_schema=LexicalSearchInput)
+def lexical_search_endpoints(query: str, max_results: int = 10, collection: Optional[str] = None) -> List[str]:
     """
-    Get detailed information about a specific endpoint, including parameters, headers, and example responses.
+    Rank endpoints by BM25 relevance to the query words. Matches in the endpoint name count most,
+    then the URL path, the description, the request body and the response examples.
+    Args:
+        query: Keywords to look up
+        max_results: Maximum number of results to return. Default is 10.
+        collection: Name of the loaded collection to search. Defaults to the most recently loaded one.
     """
-    if not store.collection_data:
-        return "No collection loaded. Please load a collection first using the load_postman_collection tool."
-    
-    endpoint_name = endpoint_name.lower()
-    found_endpoint = None
-    
-    def find_endpoint(items, parent_folder=""):
-        nonlocal found_endpoint
-        for item in items:
-            name = item.get("name", "").lower()
-            full_name = f"{parent_folder}/{name}" if parent_folder else name
-            
-            if endpoint_name in full_name and "request" in item:
-                found_endpoint = item
-                return True
-            
-            if "item" in item:
-                if find_endpoint(item["item"], full_name):
-                    return True
-        
-        return False
-    
-    find_endpoint(store.collection_data.get("item", []))
-    
-    if not found_endpoint:
-        return f"No endpoint found with name containing '{endpoint_name}'. Try using search_endpoints_by_keyword to find the correct name."
-    
-    # Extract endpoint details
-    name = found_endpoint.get("name", "")
-    request = found_endpoint.get("request", {})
-    method = request.get("method", "")
-    url = request.get("url", {})
-    
-    # Format URL
-    formatted_url = ""
-    if isinstance(url, dict):
-        if "raw" in url:
-            formatted_url = url["raw"]
-        else:
-            host = url.get("host", [])
-            if isinstance(host, list):
-                host = ".".join(host)
-            path = url.get("path", [])
-            if path:
-                path = "/" + "/".join(path)
-                formatted_url = f"{host}{path}"
-    else:
-        formatted_url = str(url)
-    
-    # Get headers
-    headers = request.get("header", [])
-    headers_text = "\n".join([f"- {h.get('key', '')}: {h.get('value', '')}" for h in headers]) if headers else "No headers"
-    
-    # Get query params
-    query = url.get("query", []) if isinstance(url, dict) else []
-    query_text = "\n".join([f"- {q.get('key', '')}: {q.get('value', '')}" for q in query]) if query else "No query parameters"
-    
-    # Get body
-    body = request.get("body", {})
-    body_text = "No body"
-    if body and isinstance(body, dict):
-        mode = body.get("mode", "")
-        if mode == "raw":
-            body_text = body.get("raw", "")
-            if len(body_text) > 500:
-                body_text = body_text[:500] + "...(truncated)"
-    
-    # Get responses
-    responses = found_endpoint.get("response", [])
-    response_text = "No example responses"
-    if responses:
-        response_text = f"{len(responses)} example response(s) available"
-        if responses:
-            sample_response = responses[0]
-            sample_code = sample_response.get("code", "")
-            sample_body = sample_response.get("body", "")
-            if sample_body and len(sample_body) > 500:
-                sample_body = sample_body[:500] + "...(truncated)"
-            response_text += f"\n\nSample Response (Status: {sample_code}):\n{sample_body}"
-    
-    # Compose detailed output
-    details = f"""
-# Endpoint: {name}
-
-- **Method**: {method}
-- **URL**: {formatted_url}
-
-## Headers
-{headers_text}
-
-## Query Parameters
-{query_text}
-
-## Request Body
-```
-{body_text}
-```
-
-## Responses
-{response_text}
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return [missing_collection_message(store.workspace, collection)]
+
+    ranked = loaded.index.bm25_index.search(query, max_results)
+    if not ranked:
+        return [f"No endpoints found matching '{query}'."]
+
+    return [f"[BM25: {score:.2f}] {endpoint.method} {endpoint.path} - {endpoint.full_name}"
+            for endpoint, score in ranked]
+
+@tool("hybrid_search_endpoints", args_schema=HybridSearchInput)
+def hybrid_search_endpoints(query: str, max_results: int = 10, threshold: int = 60, collection: Optional[str] = None) -> List[Dict[str, Any]]:
     """
-    
-    return details.strip()
+    Find endpoints with fuzzy keyword matching and semantic (RAG) search at the same time, merged into one ranking.
+    Works for exact keywords and endpoint names as well as natural language descriptions, so there is no need to
+    call search_endpoints_by_keyword and rag_search_endpoints one after the other.
+    Each result carries its fused score and the rank and score it got from each search (None when it did not match).
+    """
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return [{"error": missing_collection_message(store.workspace, collection)}]
+
+    candidates = max(HYBRID_SEARCH_CONFIG["candidates"], max_results)
+    # Both retrievers spend their time in native code (rapidfuzz, the embedding model), so threads overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fuzzy_future = executor.submit(loaded.index.keyword_index.top_endpoints, query.lower(), threshold, candidates)
+        # No waiting on a running ingestion: fuzzy matching covers the endpoints not embedded yet
+        semantic_future = executor.submit(semantic_rankings, loaded, query, candidates, 0)
+        fuzzy = fuzzy_future.result()
+        try:
+            semantic = semantic_future.result()
+        except Exception as e:
+            print(f"[hybrid_search_endpoints] Semantic search failed, using fuzzy matches only: {str(e)}")
+            semantic = []
+
+    # Reciprocal rank fusion, keyed by endpoint id; fuzzy matches first so they win ties
+    fused: Dict[str, Dict[str, Any]] = {}
+    for rank, (endpoint, score) in enumerate(fuzzy, start=1):
+        fused[endpoint.endpoint_id] = {
+            "name": endpoint.full_name,
+            "method": endpoint.method,
+            "url": endpoint.url,
+            "fuzzy_rank": rank,
+            "fuzzy_score": score,
+        }
+    for rank, hit in enumerate(semantic, start=1):
+        metadata = hit["metadata"] or {}
+        result = fused.setdefault(hit["id"], {
+            "name": metadata.get("name", hit["id"]),
+            "method": metadata.get("method", ""),
+            "url": metadata.get("url", ""),
+        })
+        result["semantic_rank"] = rank
+        result["semantic_distance"] = round(hit["distance"], 4)
+
+    if not fused:
+        return [{"message": f"No endpoints found for '{query}'."}]
+
+    rrf_k = HYBRID_SEARCH_CONFIG["rrf_k"]
+    results = []
+    for result in fused.values():
+        ranks = [result[key] for key in ("fuzzy_rank", "semantic_rank") if key in result]
+        results.append({
+            "name": result["name"],
+            "method": result["method"],
+            "url": result["url"],
+            "score": round(sum(1 / (rrf_k + rank) for rank in ranks), 6),
+            "fuzzy_rank": result.get("fuzzy_rank"),
+            "fuzzy_score": result.get("fuzzy_score"),
+            "semantic_rank": result.get("semantic_rank"),
+            "semantic_distance": result.get("semantic_distance"),
+        })
+    results.sort(key=lambda result: result["score"], reverse=True)
+    return results[:max_results]
 
-@tool("analyze_collection_methods")
-def analyze_collection_methods() -> str:
+@tool("get_endpoint_details", args_schema=EndpointDetailsInput)
+def get_endpoint_details(endpoint_name: str, collection: Optional[str] = None) -> str:
+    """
+    Get detailed information about a specific endpoint, including parameters, headers, and example responses.
+    The endpoint can be given by its full name (Folder/Endpoint), its name, its URL path, or part of its name.
+    When several endpoints match equally well, a ranked list of them is returned instead.
+    """
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return missing_collection_message(store.workspace, collection)
+    
+    ranked, unique = loaded.index.name_index.resolve(endpoint_name)
+    if not ranked:
+        return f"No endpoint found with name containing '{endpoint_name.lower()}'. Try using search_endpoints_by_keyword to find the correct name."
+    if not unique:
+        return _ambiguous_endpoint_message(endpoint_name, ranked)
+    return store.detail_cache.get(loaded.index, ranked[0].endpoint)
+
+def _ambiguous_endpoint_message(endpoint_name: str, ranked: List[Any]) -> str:
+    """Ranked shortlist returned instead of guessing when several endpoints match a name."""
+    shown = ranked[:ENDPOINT_LOOKUP_CONFIG["max_candidates"]]
+    full_names = Counter(match.endpoint.full_name.lower() for match in ranked)
+    lines = [f"{len(ranked)} endpoints match '{endpoint_name}'. Call get_endpoint_details again with the full name of the one you mean:"]
+    for i, match in enumerate(shown, start=1):
+        endpoint = match.endpoint
+        # Endpoints sharing a full name can only be told apart by their id
+        reference = endpoint.full_name if full_names[endpoint.full_name.lower()] == 1 else endpoint.endpoint_id
+        lines.append(f"{i}. {reference} ({endpoint.method} {endpoint.path})")
+    if len(ranked) > len(shown):
+        lines.append(f"...and {len(ranked) - len(shown)} more. Use a longer part of the name to narrow it down.")
+    return "\n".join(lines)
+
+@tool("analyze_collection_methods", args_schema=CollectionSelectorInput)
+def analyze_collection_methods(collection: Optional[str] = None) -> str:
     """
     Analyze the HTTP methods used in the collection and provide statistics.
     """
-    if not store.collection_data:
-        return "No collection loaded. Please load a collection first using the load_postman_collection tool."
-    
-    methods = []
-    endpoints_by_method = {}
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return missing_collection_message(store.workspace, collection)
     
-    def collect_methods(items, parent_folder=""):
-        for item in items:
-            name = item.get("name", "")
-            full_name = f"{parent_folder}/{name}" if parent_folder else name
-            
-            if "request" in item:
-                method = item["request"]["method"]
-                methods.append(method)
-                
-                if method not in endpoints_by_method:
-                    endpoints_by_method[method] = []
-                
-                endpoints_by_method[method].append(full_name)
-            
-            if "item" in item:
-                collect_methods(item["item"], full_name)
-    
-    collect_methods(store.collection_data.get("item", []))
-    
-    if not methods:
+    index = loaded.index
+    if not index.endpoints:
         return "No endpoints with HTTP methods found in the collection."
     
-    method_counts = dict(Counter(methods))
-    total_endpoints = len(methods)
+    method_counts = index.method_counts
+    total_endpoints = len(index.endpoints)
     
     # Sort methods by frequency
     sorted_methods = sorted(method_counts.items(), key=lambda x: x[1], reverse=True)
@@ -442,58 +350,34 @@ def analyze_collection_methods() -> str:
     
     analysis += "\n## Sample Endpoints by Method\n"
     
-    for method, endpoints in endpoints_by_method.items():
+    for method, endpoints in index.endpoints_by_method.items():
         analysis += f"\n### {method} Endpoints\n"
         # Show up to 5 examples per method
         for endpoint in endpoints[:5]:
-            analysis += f"- {endpoint}\n"
+            analysis += f"- {endpoint.full_name}\n"
         if len(endpoints) > 5:
             analysis += f"- ... and {len(endpoints) - 5} more\n"
     
     return analysis
 
-@tool("extract_request_examples")
-def extract_request_examples() -> str:
+@tool("extract_request_examples", args_schema=CollectionSelectorInput)
+def extract_request_examples(collection: Optional[str] = None) -> str:
     """
     Extract and analyze request examples from the collection.
     """
-    if not store.collection_data:
-        return "No collection loaded. Please load a collection first using the load_postman_collection tool."
-    
-    examples = []
-    
-    def extract_examples(items, parent_folder=""):
-        for item in items:
-            name = item.get("name", "")
-            full_name = f"{parent_folder}/{name}" if parent_folder else name
-            
-            if "request" in item:
-                request = item["request"]
-                method = request.get("method", "")
-                url = request.get("url", {})
-                url_str = url.get("raw", "") if isinstance(url, dict) else str(url)
-                
-                body = request.get("body", {})
-                body_content = None
-                
-                if body and isinstance(body, dict):
-                    mode = body.get("mode", "")
-                    if mode == "raw":
-                        body_content = body.get("raw", "")
-                
-                example = {
-                    "name": full_name,
-                    "method": method,
-                    "url": url_str,
-                    "body": body_content
-                }
-                
-                examples.append(example)
-            
-            if "item" in item:
-                extract_examples(item["item"], full_name)
-    
-    extract_examples(store.collection_data.get("item", []))
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return missing_collection_message(store.workspace, collection)
+    
+    examples = [
+        {
+            "name": endpoint.full_name,
+            "method": endpoint.method,
+            "url": endpoint.raw_url,
+            "body": endpoint.body_raw or None,
+        }
+        for endpoint in loaded.index.endpoints
+    ]
     
     if not examples:
         return "No request examples found in the collection."
@@ -504,10 +388,7 @@ def extract_request_examples() -> str:
     # Group by HTTP method
     methods = {}
     for example in examples:
-        method = example["method"]
-        if method not in methods:
-            methods[method] = []
-        methods[method].append(example)
+        methods.setdefault(example["method"], []).append(example)
     
     for method, method_examples in methods.items():
         analysis += f"## {method} Requests\n\n"
@@ -528,41 +409,19 @@ def extract_request_examples() -> str:
     return analysis
 
 
-@tool("count_endpoints")
-def count_endpoints() -> str:
+@tool("count_endpoints", args_schema=CollectionSelectorInput)
+def count_endpoints(collection: Optional[str] = None) -> str:
     """
     Count the total number of endpoints in the loaded Postman Collection and provide statistics.
     No input parameters are required for this tool.
     """
-    if not store.collection_data:
-        return "No collection loaded. Please load a collection first using the load_postman_collection tool."
-    
-    total_endpoints = 0
-    folders = {}
-    methods = {}
-    
-    def count_items(items, parent_folder=""):
-        nonlocal total_endpoints
-        
-        for item in items:
-            name = item.get("name", "")
-            current_folder = f"{parent_folder}/{name}" if parent_folder else name
-            
-            if "request" in item:
-                total_endpoints += 1
-                
-                # Count by folder
-                folder_name = parent_folder if parent_folder else "Root"
-                folders[folder_name] = folders.get(folder_name, 0) + 1
-                
-                # Count by HTTP method
-                method = item["request"]["method"]
-                methods[method] = methods.get(method, 0) + 1
-            
-            if "item" in item:
-                count_items(item["item"], current_folder)
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return missing_collection_message(store.workspace, collection)
     
-    count_items(store.collection_data.get("item", []))
+    total_endpoints = len(loaded.index.endpoints)
+    folders = loaded.index.folder_counts
+    methods = loaded.index.method_counts
     
     if total_endpoints == 0:
         return "No endpoints found in the collection."
@@ -591,59 +450,37 @@ def count_endpoints() -> str:
 
 
 
-@tool("summarize_collection")
-def summarize_collection() -> str:
+@tool("summarize_collection", args_schema=CollectionSelectorInput)
+def summarize_collection(collection: Optional[str] = None) -> str:
     """
     Provide a summary of the loaded Postman Collection, including LLM-based summary.
     """
 
     print("[summarize_collection] Called summarize_collection tool.")
 
-    if not store.collection_data:
+    loaded = store.workspace.get(collection)
+    if loaded is None:
         print("[summarize_collection] No collection loaded.")
-        return "No collection loaded. Please load a collection first using the load_postman_collection tool."
+        return missing_collection_message(store.workspace, collection)
 
     try:
         print("[summarize_collection] Extracting collection info...")
-        collection_info = store.collection_data.get("info", {})
+        index = loaded.index
+        collection_info = index.info
         name = collection_info.get("name", "Unnamed Collection")
         description = collection_info.get("description", "No description available")
         description_short = description.split("\n")[0][:250] + "..."
         print(f"[summarize_collection] Collection name: {name}")
         print(f"[summarize_collection] Description (short): {description_short}")
 
-        # Count endpoints and folders
-        endpoints_count = 0
-        folders_count = 0
-        endpoint_names = []
-
-        def count_items(items):
-            nonlocal endpoints_count, folders_count, endpoint_names
-            for item in items:
-                if "request" in item:
-                    endpoints_count += 1
-                    endpoint_names.append(item.get("name", ""))
-                if "item" in item:
-                    folders_count += 1
-                    count_items(item["item"])
-
-        print("[summarize_collection] Counting endpoints and folders...")
-        count_items(store.collection_data.get("item", []))
+        # Endpoint and folder counts come straight from the compiled index
+        endpoints_count = len(index.endpoints)
+        folders_count = len(index.folders)
+        endpoint_names = [endpoint.name for endpoint in index.endpoints]
         print(f"[summarize_collection] Total endpoints: {endpoints_count}")
         print(f"[summarize_collection] Total folders: {folders_count}")
 
-        # Count HTTP methods
-        methods = []
-        def collect_methods(items):
-            for item in items:
-                if "request" in item:
-                    method = item["request"]["method"]
-                    methods.append(method)
-                if "item" in item:
-                    collect_methods(item["item"])
-        print("[summarize_collection] Collecting HTTP methods...")
-        collect_methods(store.collection_data.get("item", []))
-        method_counts = dict(Counter(methods))
+        method_counts = index.method_counts
         print(f"[summarize_collection] HTTP method counts: {method_counts}")
         methods_summary = ", ".join([f"{method}: {count}" for method, count in method_counts.items()])
 
@@ -693,21 +530,24 @@ def summarize_collection() -> str:
 
 
 @tool("ask_collection_analyst", args_schema=DataframeAnalyzerInput)
-def ask_collection_analyst(query: str) -> str:
+def ask_collection_analyst(query: str, collection: Optional[str] = None) -> str:
     """
     Input a question and then the collection analyst will respond the answer based on the collection data.
     """
 
-    if store.collection_df is None or store.collection_df.empty:
-        return "No collection loaded. Please load a collection first using the load_postman_collection tool."
-    else:
-        print(store.collection_df.shape)
+    loaded = store.workspace.get(collection)
+    if loaded is None or not len(loaded.index):
+        return missing_collection_message(store.workspace, collection)
+
+    # The DataFrame is built from the compiled index on first use
+    collection_df = loaded.index.dataframe
+    print(collection_df.shape)
 
     from backend.agents import coder_llm
 
     collection_analyst_agent = create_pandas_dataframe_agent(
         coder_llm,
-        store.collection_df,
+        collection_df,
         verbose=True,
         allow_dangerous_code=True,
         name="collection_analyst_agent",
@@ -35,8 +35,11 @@ actions = [
     tavily_tool,
     load_postman_collection,
     clear_collection,
+    list_loaded_collections,
     list_all_endpoints,
     search_endpoints_by_keyword,
+    lexical_search_endpoints,
+    hybrid_search_endpoints,
     summarize_collection,
     get_endpoint_details,
     analyze_collection_methods,
@@ -0,0 +1,591 @@
+"""
+Benchmarks for the collection tools on synthetic collections.
+
+    python -m backend.benchmark load --sizes 1000 10000
+    python -m backend.benchmark keyword --sizes 1000 10000 100000
+    python -m backend.benchmark bm25 --sizes 1000 10000 100000
+    python -m backend.benchmark ingest --sizes 2000 --batch-sizes 16 64 256 --workers 1 2 4
+    python -m backend.benchmark vectors --sizes 10000 50000
+    python -m backend.benchmark hnsw --sizes 10000 30000 --m 8 16 32 --search-ef 10 50 100 200
+    python -m backend.benchmark hnsw --collection path/to/collection.json
+
+Collections are generated into a temporary directory and loaded through the
+regular loader, so timings include the snapshot-backed payload path.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import math
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz
+
+from backend.bm25_index import FIELDS, BM25Index, endpoint_fields, tokenize
+from backend.config import BM25_CONFIG, SNAPSHOT_CONFIG
+from backend.embedding_pipeline import embed_and_upsert
+from backend.index import EndpointIndex, compile_collection
+from backend.loader import load_collection_file, load_collection_streaming
+from backend.vector_store import ChromaVectorStore, NumpyVectorCollection, hnsw_metadata
+
+_RESOURCES = ["users", "orders", "products", "invoices", "payments", "sessions", "teams", "webhooks"]
+_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+DEFAULT_KEYWORDS = ["user", "order id", "authorization", "invoices/42", "webhook secret", "xyzzy"]
+DEFAULT_BM25_QUERIES = ["refund", "orders", "get user", "webhook signature", "owner id page", "xyzzy"]
+
+
+def synthetic_collection(endpoints: int, seed: int = 0) -> Dict[str, Any]:
+    """A Postman collection with `endpoints` requests spread over one folder per resource."""
+    rng = random.Random(seed)
+    folders: Dict[str, List[Dict[str, Any]]] = {resource: [] for resource in _RESOURCES}
+    for i in range(endpoints):
+        resource = rng.choice(_RESOURCES)
+        method = rng.choice(_METHODS)
+        example = {"id": i, resource: [{"name": f"{resource[:-1]} {j}", "owner_id": rng.randint(1, 999)}
+                                       for j in range(rng.randint(1, 4))]}
+        folders[resource].append({
+            "name": f"{method.title()} {resource} {i}",
+            "request": {
+                "method": method,
+                "header": [{"key": "Authorization", "value": "Bearer {{token}}"},
+                           {"key": "X-Request-Id", "value": str(i)}],
+                "url": {"raw": f"{{{{base_url}}}}/v1/{resource}/{i}", "path": ["v1", resource, str(i)]},
+                "body": {"mode": "raw", "raw": json.dumps({"filter": resource, "page": i % 10})},
+            },
+            "description": rng.choice(["", f"Returns the {resource} owned by the caller.",
+                                       f"Refund or cancel {resource} after the webhook signature is verified."]),
+            "response": [{"name": "OK", "code": 200, "body": json.dumps(example)}],
+        })
+    return {
+        "info": {"name": f"Synthetic {endpoints}"},
+        "item": [{"name": resource, "item": items} for resource, items in folders.items()],
+    }
+
+
+def vary_folder_keys(collection: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The collection with its folders nested one level deeper and written with every placement of
+    "id": none, before "item" and after it, plus a request sharing the full name of an id-less
+    folder. Streaming loads must identify all of them as the in-memory load does.
+    """
+    folders = []
+    for i, folder in enumerate(collection["item"]):
+        half = len(folder["item"]) // 2
+        archive = {"name": "archive", "item": folder["item"][half:], "id": f"archive-{i}"}
+        items = folder["item"][:half] + [archive]
+        if i % 3 == 0:
+            folders.append({"name": folder["name"], "item": items})
+        elif i % 3 == 1:
+            folders.append({"id": f"folder-{i}", "name": folder["name"], "item": items})
+        else:
+            folders.append({"name": folder["name"], "item": items, "id": f"folder-{i}"})
+    folders.append({"name": collection["item"][2]["name"], "request": {"method": "GET", "url": "{{base_url}}/v1"}})
+    return {**collection, "item": folders}
+
+
+def _identities(index: EndpointIndex) -> Tuple[List[Tuple[str, Tuple[str, ...]]], List[Tuple[str, Tuple[str, ...]]]]:
+    return ([(endpoint.endpoint_id, tuple(endpoint.folder_ids)) for endpoint in index.endpoints],
+            [(folder.folder_id, tuple(folder.folder_ids)) for folder in index.folders])
+
+
+def benchmark_loading(sizes: Sequence[int]) -> List[Dict[str, Any]]:
+    """
+    Time the in-memory, streaming and streaming-into-snapshot loads of collections whose folders
+    place "id" anywhere (see vary_folder_keys), and check all three assign the same endpoint and folder ids.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        previous_directory = SNAPSHOT_CONFIG["directory"]
+        SNAPSHOT_CONFIG["directory"] = os.path.join(directory, "snapshots")
+        try:
+            for size in sizes:
+                path = os.path.join(directory, f"synthetic_{size}.json")
+                with open(path, "w") as f:
+                    json.dump(vary_folder_keys(synthetic_collection(size)), f)
+
+                def in_memory():
+                    with open(path) as f:
+                        return compile_collection(json.load(f))
+
+                expected, memory_seconds = _timed(in_memory)
+                (streamed, _, _), stream_seconds = _timed(load_collection_streaming, path)
+                snapshot, snapshot_seconds = _timed(load_collection_file, path, True)
+                rows.append({
+                    "endpoints": size,
+                    "in_memory_s": memory_seconds,
+                    "streaming_s": stream_seconds,
+                    "snapshot_s": snapshot_seconds,
+                    "ids_match": _identities(streamed) == _identities(expected) == _identities(snapshot.index),
+                })
+        finally:
+            SNAPSHOT_CONFIG["directory"] = previous_directory
+    return rows
+
+
+def baseline_keyword_search(collection_data: Dict[str, Any], keyword: str, threshold: int = 60,
+                            max_results: int = 20) -> List[str]:
+    """
+    Reference: search_endpoints_by_keyword as it was before the endpoint index, walking the raw
+    collection recursively and scoring every field one string at a time.
+    """
+    keyword = keyword.lower()
+    matches_with_scores = []
+
+    def search_items(items, parent_folder=""):
+        for item in items:
+            name = item.get("name", "").lower()
+            full_name = f"{parent_folder}/{name}" if parent_folder else name
+
+            name_score = fuzz.partial_ratio(keyword, name)
+            if name_score >= threshold:
+                if "request" in item:
+                    matches_with_scores.append((f"{item['request']['method']} - {full_name}", name_score))
+                else:
+                    matches_with_scores.append((f"Folder: {full_name}", name_score))
+
+            if "request" in item:
+                request = item["request"]
+                url = request.get("url", {})
+                if isinstance(url, dict):
+                    url_raw = url.get("raw", "").lower()
+                    url_score = fuzz.partial_ratio(keyword, url_raw)
+                    if url_score >= threshold:
+                        matches_with_scores.append((f"{request.get('method', 'UNKNOWN')} {url_raw} - {full_name}", url_score))
+
+                for header in request.get("header", []):
+                    key_score = fuzz.partial_ratio(keyword, header.get("key", "").lower())
+                    value_score = fuzz.partial_ratio(keyword, header.get("value", "").lower())
+                    if max(key_score, value_score) >= threshold:
+                        matches_with_scores.append((f"{request.get('method', 'UNKNOWN')} {full_name} - Header: {header.get('key', '')}",
+                                                    max(key_score, value_score)))
+
+                body = request.get("body", {})
+                if body and isinstance(body, dict) and body.get("mode", "") == "raw":
+                    body_score = fuzz.partial_ratio(keyword, body.get("raw", "").lower())
+                    if body_score >= threshold:
+                        matches_with_scores.append((f"{request.get('method', 'UNKNOWN')} {full_name} - Found in request body", body_score))
+
+            for resp in item.get("response", []):
+                resp_score = fuzz.partial_ratio(keyword, json.dumps(resp).lower())
+                if resp_score >= threshold:
+                    matches_with_scores.append((f"{full_name} - Found in response example", resp_score))
+
+            if "item" in item:
+                search_items(item["item"], full_name)
+
+    search_items(collection_data.get("item", []))
+    if not matches_with_scores:
+        return [f"No items found containing '{keyword}' with similarity threshold of {threshold}%."]
+
+    unique_matches = {}
+    for match, score in matches_with_scores:
+        if match not in unique_matches or score > unique_matches[match]:
+            unique_matches[match] = score
+    sorted_matches = sorted(unique_matches.items(), key=lambda x: x[1], reverse=True)
+    return [f"[Match: {score}%] {match}" for match, score in sorted_matches[:max_results]]
+
+
+def reference_bm25_search(index: BM25Index, query: str, k: int) -> List[Tuple[Any, float]]:
+    """Reference: BM25F scored endpoint by endpoint from the field texts, with nothing precomputed."""
+    k1, b = BM25_CONFIG["k1"], BM25_CONFIG["b"]
+    field_tokens = [[Counter(tokenize(text)) for text in endpoint_fields(endpoint)] for endpoint in index.endpoints]
+    average = []
+    for field in range(len(FIELDS)):
+        lengths = [sum(fields[field].values()) for fields in field_tokens if fields[field]]
+        average.append(sum(lengths) / len(lengths) if lengths else 0)
+
+    scores = []
+    for position, fields in enumerate(field_tokens):
+        score = 0.0
+        for term in dict.fromkeys(tokenize(query)):
+            frequency = sum(1 for other in field_tokens if any(term in counts for counts in other))
+            pseudo = sum(BM25_CONFIG["field_weights"][name] * counts[term] /
+                         (1 - b + b * sum(counts.values()) / average[field])
+                         for field, (name, counts) in enumerate(zip(FIELDS, fields)) if term in counts)
+            if pseudo:
+                idf = math.log1p((len(field_tokens) - frequency + 0.5) / (frequency + 0.5))
+                score += idf * pseudo * (k1 + 1) / (pseudo + k1)
+        if score > 0:
+            scores.append((position, score))
+    scores.sort(key=lambda match: (-match[1], match[0]))
+    return [(index.endpoints[position], score) for position, score in scores[:k]]
+
+
+def _timed(function, *args) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_keyword_search(sizes: Sequence[int], keywords: Sequence[str] = DEFAULT_KEYWORDS,
+                             thresholds: Sequence[int] = (60, 90), top_k: int = 20) -> List[Dict[str, Any]]:
+    """
+    Time search_endpoints_by_keyword against its original recursive implementation per collection
+    size, and the index's full batched search; raises if the tool's results differ from the
+    original's, for the top k and for every match.
+    """
+    import backend.store as store
+    from backend.actions import search_endpoints_by_keyword
+    from backend.workspace import LoadedCollection
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        previous_directory = SNAPSHOT_CONFIG["directory"]
+        SNAPSHOT_CONFIG["directory"] = os.path.join(directory, "snapshots")
+        try:
+            for size in sizes:
+                path = os.path.join(directory, f"synthetic_{size}.json")
+                collection_data = synthetic_collection(size)
+                with open(path, "w") as f:
+                    json.dump(collection_data, f)
+                index: EndpointIndex = load_collection_file(path).index
+                _, build_seconds = _timed(lambda: index.keyword_index)
+                loaded = store.workspace.add(LoadedCollection(f"benchmark_keyword_{size}", path, index), activate=False)
+
+                def tool(keyword: str, threshold: int, max_results: int) -> List[str]:
+                    return search_endpoints_by_keyword.func(keyword, threshold, max_results, loaded.name)
+
+                try:
+                    for threshold in thresholds:
+                        baseline_seconds = search_seconds = tool_seconds = 0.0
+                        for keyword in keywords:
+                            expected, seconds = _timed(baseline_keyword_search, collection_data, keyword, threshold, top_k)
+                            baseline_seconds += seconds
+                            actual, seconds = _timed(tool, keyword, threshold, top_k)
+                            tool_seconds += seconds
+                            if actual != expected:
+                                raise AssertionError(f"top-{top_k} search differs for {keyword!r} at threshold {threshold}")
+                            if tool(keyword, threshold, size * 10) != baseline_keyword_search(collection_data, keyword,
+                                                                                                threshold, size * 10):
+                                raise AssertionError(f"search differs for {keyword!r} at threshold {threshold}")
+                            _, seconds = _timed(index.keyword_index.search, keyword, threshold)
+                            search_seconds += seconds
+                        rows.append({
+                            "endpoints": size,
+                            "threshold": threshold,
+                            "index_build_s": build_seconds,
+                            "baseline_ms": baseline_seconds / len(keywords) * 1000,
+                            "batched_ms": search_seconds / len(keywords) * 1000,
+                            "top_k_ms": tool_seconds / len(keywords) * 1000,
+                        })
+                finally:
+                    store.workspace.remove(loaded.name)
+        finally:
+            SNAPSHOT_CONFIG["directory"] = previous_directory
+    return rows
+
+
+def benchmark_bm25_search(sizes: Sequence[int], queries: Sequence[str] = DEFAULT_BM25_QUERIES, k: int = 10,
+                          repeat: int = 100, verify_max: int = 2000) -> List[Dict[str, Any]]:
+    """
+    Time BM25 index builds and queries per collection size; collections up to `verify_max`
+    endpoints are also checked against the brute-force reference, raising if rankings differ.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        previous_directory = SNAPSHOT_CONFIG["directory"]
+        SNAPSHOT_CONFIG["directory"] = os.path.join(directory, "snapshots")
+        try:
+            for size in sizes:
+                path = os.path.join(directory, f"synthetic_{size}.json")
+                with open(path, "w") as f:
+                    json.dump(synthetic_collection(size), f)
+                index: EndpointIndex = load_collection_file(path).index
+                bm25, build_seconds = _timed(lambda: index.bm25_index)
+
+                query_seconds = []
+                for query in queries:
+                    _, seconds = _timed(lambda: [bm25.search(query, k) for _ in range(repeat)])
+                    query_seconds.append(seconds / repeat)
+                    if size <= verify_max:
+                        actual = bm25.search(query, k)
+                        expected = reference_bm25_search(bm25, query, k)
+                        if [endpoint.endpoint_id for endpoint, _ in actual] != \
+                                [endpoint.endpoint_id for endpoint, _ in expected] or \
+                                any(not math.isclose(a, e, rel_tol=1e-5) for (_, a), (_, e) in zip(actual, expected)):
+                            raise AssertionError(f"BM25 ranking differs for {query!r}")
+                rows.append({
+                    "endpoints": size,
+                    "index_build_s": build_seconds,
+                    "terms": len(bm25.terms),
+                    "mean_query_ms": sum(query_seconds) / len(query_seconds) * 1000,
+                    "max_query_ms": max(query_seconds) * 1000,
+                })
+        finally:
+            SNAPSHOT_CONFIG["directory"] = previous_directory
+    return rows
+
+
+def benchmark_ingestion(sizes: Sequence[int], batch_sizes: Sequence[int], workers: Sequence[int],
+                        embedding_function=None) -> List[Dict[str, Any]]:
+    """
+    Time the embedding pipeline per collection size, batch size and worker count, ingesting into
+    a fresh in-memory Chroma collection each run. The model is called directly, without the
+    persistent embedding cache, so every run embeds every document.
+    """
+    import chromadb
+    from backend.embeddings import create_embedding_function
+    from backend.tools.rag_tools import _to_chroma_records, extract_endpoints_data
+
+    embedding_function = embedding_function or create_embedding_function()
+    client = chromadb.EphemeralClient()
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        previous_directory = SNAPSHOT_CONFIG["directory"]
+        SNAPSHOT_CONFIG["directory"] = os.path.join(directory, "snapshots")
+        try:
+            # One untimed call so model loading is not charged to the first run
+            embedding_function(["warm up"])
+            for size in sizes:
+                path = os.path.join(directory, f"synthetic_{size}.json")
+                with open(path, "w") as f:
+                    json.dump(synthetic_collection(size), f)
+                records = _to_chroma_records(extract_endpoints_data(load_collection_file(path).index))
+                for batch_size in batch_sizes:
+                    for worker_count in workers:
+                        collection = client.create_collection(f"benchmark_ingest_{size}_{batch_size}_{worker_count}",
+                                                              embedding_function=embedding_function)
+                        stats = embed_and_upsert(collection, records, embedding_function,
+                                                 batch_size=batch_size, workers=worker_count)
+                        client.delete_collection(collection.name)
+                        rows.append({
+                            "endpoints": size,
+                            "batch_size": batch_size,
+                            "workers": worker_count,
+                            "seconds": stats.seconds,
+                            "docs_per_second": stats.docs_per_second,
+                            "embed_s": stats.embed_seconds,
+                            "write_s": stats.write_seconds,
+                        })
+        finally:
+            SNAPSHOT_CONFIG["directory"] = previous_directory
+    return rows
+
+
+def synthetic_embeddings(count: int, dimension: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Unit vectors around `clusters` random centers, a stand-in for sentence embeddings of related endpoints."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centers[rng.integers(clusters, size=count)] + 0.6 * rng.standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def benchmark_vector_stores(sizes: Sequence[int], dimension: int = 384, queries: int = 200, k: int = 10,
+                            backends: Sequence[str] = ("chroma", "numpy-float16", "numpy-int8")) -> List[Dict[str, Any]]:
+    """
+    Time building and querying each vector store backend on synthetic embeddings, with recall@k
+    against exact float32 search and the memory the store added (resident set growth, and the
+    embedding matrix itself for the NumPy store).
+    """
+    import chromadb
+
+    rows = []
+    for size in sizes:
+        vectors = synthetic_embeddings(size, dimension)
+        rng = np.random.default_rng(1)
+        probes = vectors[rng.integers(size, size=queries)] + 0.3 * rng.standard_normal((queries, dimension)).astype(np.float32)
+        probes /= np.linalg.norm(probes, axis=1, keepdims=True)
+        expected = np.argsort(-(probes @ vectors.T), axis=1, kind="stable")[:, :k]
+        ids = [f"endpoint-{i}" for i in range(size)]
+        metadatas = [{"name": f"Endpoint {i}"} for i in range(size)]
+
+        for backend in backends:
+            before = _rss_bytes()
+            with tempfile.TemporaryDirectory() as directory:
+                start = time.perf_counter()
+                if backend == "chroma":
+                    client = chromadb.EphemeralClient()
+                    collection = ChromaVectorStore(client).get_or_create_collection(f"benchmark_vectors_{size}", None)
+                    step = client.get_max_batch_size()
+                else:
+                    collection = NumpyVectorCollection(f"benchmark_vectors_{size}", None, directory, backend.split("-")[1])
+                    step = 4096
+                for offset in range(0, size, step):
+                    collection.upsert(ids=ids[offset:offset + step], metadatas=metadatas[offset:offset + step],
+                                      embeddings=vectors[offset:offset + step])
+                build_seconds = time.perf_counter() - start
+                after = _rss_bytes()
+
+                query_seconds = []
+                hits = 0
+                for probe, truth in zip(probes, expected):
+                    result, seconds = _timed(lambda: collection.query(query_embeddings=[probe.tolist()], n_results=k,
+                                                                      include=["distances"]))
+                    query_seconds.append(seconds)
+                    found = {int(record_id.split("-")[1]) for record_id in result["ids"][0]}
+                    hits += len(found & set(truth.tolist()))
+                rows.append({
+                    "endpoints": size,
+                    "backend": backend,
+                    "build_s": build_seconds,
+                    "mean_query_ms": sum(query_seconds) / len(query_seconds) * 1000,
+                    "p95_query_ms": sorted(query_seconds)[int(0.95 * (len(query_seconds) - 1))] * 1000,
+                    "recall": hits / (len(expected) * k),
+                    "rss_mb": (after - before) / 2 ** 20 if before is not None and after is not None else None,
+                    "matrix_mb": collection.memory_bytes() / 2 ** 20 if backend != "chroma" else None,
+                })
+                if backend == "chroma":
+                    client.delete_collection(collection.name)
+    return rows
+
+
+def collection_embeddings(path: str, queries: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Embeddings of a real collection's endpoint documents with the configured model, and of the
+    names of `queries` endpoints drawn at random as probes (short queries against full documents).
+    """
+    from backend.embeddings import create_embedding_function
+    from backend.tools.rag_tools import _to_chroma_records, extract_endpoints_data
+
+    records = _to_chroma_records(extract_endpoints_data(load_collection_file(path).index))
+    embedding_function = create_embedding_function()
+    documents = np.asarray(embedding_function(records["documents"]), dtype=np.float32)
+    sample = random.Random(seed).choices(records["metadatas"], k=queries)
+    probes = np.asarray(embedding_function([metadata["name"] for metadata in sample]), dtype=np.float32)
+    return (documents / np.linalg.norm(documents, axis=1, keepdims=True),
+            probes / np.linalg.norm(probes, axis=1, keepdims=True))
+
+
+def benchmark_hnsw(sizes: Sequence[int], m_values: Sequence[int], construction_efs: Sequence[int],
+                   search_efs: Sequence[int], space: str = "cosine", dimension: int = 384, queries: int = 200,
+                   k: int = 10, collection_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Build Chroma's HNSW index once per combination of M, construction_ef and search_ef (Chroma
+    fixes them at creation) over synthetic embeddings of each size, or over a real collection,
+    and report the build time, p50/p99 single-query latency and recall@k against exact search.
+    """
+    import chromadb
+
+    if collection_path is not None:
+        datasets = [collection_embeddings(collection_path, queries)]
+    else:
+        datasets = []
+        for size in sizes:
+            vectors = synthetic_embeddings(size, dimension)
+            rng = np.random.default_rng(1)
+            probes = vectors[rng.integers(size, size=queries)] + 0.3 * rng.standard_normal((queries, dimension)).astype(np.float32)
+            datasets.append((vectors, probes / np.linalg.norm(probes, axis=1, keepdims=True)))
+
+    client = chromadb.EphemeralClient()
+    step = client.get_max_batch_size()
+    rows = []
+    for vectors, probes in datasets:
+        size = len(vectors)
+        # Unit vectors: cosine, l2 and ip distances all rank by the dot product
+        expected = np.argsort(-(probes @ vectors.T), axis=1, kind="stable")[:, :k]
+        ids = [str(i) for i in range(size)]
+        for m in m_values:
+            for construction_ef in construction_efs:
+                for search_ef in search_efs:
+                    settings = {"space": space, "M": m, "construction_ef": construction_ef, "search_ef": search_ef}
+                    collection = client.create_collection(f"benchmark_hnsw_{size}", embedding_function=None,
+                                                          metadata=hnsw_metadata(settings))
+                    start = time.perf_counter()
+                    for offset in range(0, size, step):
+                        collection.upsert(ids=ids[offset:offset + step], embeddings=vectors[offset:offset + step])
+                    build_seconds = time.perf_counter() - start
+
+                    query_seconds = []
+                    hits = 0
+                    for probe, truth in zip(probes, expected):
+                        result, seconds = _timed(lambda: collection.query(query_embeddings=[probe.tolist()],
+                                                                          n_results=k, include=[]))
+                        query_seconds.append(seconds)
+                        hits += len({int(record_id) for record_id in result["ids"][0]} & set(truth.tolist()))
+                    p50, p99 = np.percentile(query_seconds, [50, 99]) * 1000
+                    rows.append({"endpoints": size, "M": m, "construction_ef": construction_ef, "search_ef": search_ef,
+                                 "build_s": build_seconds, "p50_ms": p50, "p99_ms": p99,
+                                 "recall": hits / (len(expected) * k)})
+                    client.delete_collection(collection.name)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    load = subparsers.add_parser("load", help="in-memory vs streaming loads, checking they assign the same ids")
+    load.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    keyword = subparsers.add_parser("keyword", help="search_endpoints_by_keyword scoring and ranking paths")
+    keyword.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    keyword.add_argument("--thresholds", type=int, nargs="+", default=[60, 90])
+    keyword.add_argument("--top-k", type=int, default=20)
+    bm25 = subparsers.add_parser("bm25", help="lexical_search_endpoints index build and query latency")
+    bm25.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    bm25.add_argument("--top-k", type=int, default=10)
+    ingest = subparsers.add_parser("ingest", help="RAG ingestion throughput per batch size and worker count")
+    ingest.add_argument("--sizes", type=int, nargs="+", default=[2000])
+    ingest.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 256])
+    ingest.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    vectors = subparsers.add_parser("vectors", help="vector store backends: build time, query latency, recall and memory")
+    vectors.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    vectors.add_argument("--dimension", type=int, default=384)
+    vectors.add_argument("--queries", type=int, default=200)
+    vectors.add_argument("--top-k", type=int, default=10)
+    hnsw = subparsers.add_parser("hnsw", help="Chroma HNSW settings: build time, p50/p99 query latency and recall@k")
+    hnsw.add_argument("--sizes", type=int, nargs="+", default=[10000])
+    hnsw.add_argument("--collection", help="benchmark a real collection file instead, embedded with the configured model")
+    hnsw.add_argument("--space", choices=["cosine", "l2", "ip"], default="cosine")
+    hnsw.add_argument("--m", type=int, nargs="+", default=[16])
+    hnsw.add_argument("--construction-ef", type=int, nargs="+", default=[100, 200])
+    hnsw.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100, 200])
+    hnsw.add_argument("--dimension", type=int, default=384)
+    hnsw.add_argument("--queries", type=int, default=200)
+    hnsw.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.benchmark == "load":
+        print(f"{'endpoints':>10} {'in-memory s':>12} {'streaming s':>12} {'snapshot s':>11} {'same ids':>9}")
+        rows = benchmark_loading(args.sizes)
+        for row in rows:
+            print(f"{row['endpoints']:>10} {row['in_memory_s']:>12.2f} {row['streaming_s']:>12.2f} "
+                  f"{row['snapshot_s']:>11.2f} {str(row['ids_match']):>9}")
+        if not all(row["ids_match"] for row in rows):
+            raise SystemExit("Streaming and in-memory loads assigned different ids")
+    elif args.benchmark == "keyword":
+        print(f"{'endpoints':>10} {'threshold':>9} {'build s':>8} {'original ms':>12} {'all matches ms':>15} "
+              f"{'tool top-k ms':>14}")
+        for row in benchmark_keyword_search(args.sizes, thresholds=args.thresholds, top_k=args.top_k):
+            print(f"{row['endpoints']:>10} {row['threshold']:>9} {row['index_build_s']:>8.2f} "
+                  f"{row['baseline_ms']:>12.1f} {row['batched_ms']:>15.1f} {row['top_k_ms']:>14.1f}")
+    elif args.benchmark == "bm25":
+        print(f"{'endpoints':>10} {'build s':>8} {'terms':>8} {'mean query ms':>14} {'max query ms':>13}")
+        for row in benchmark_bm25_search(args.sizes, k=args.top_k):
+            print(f"{row['endpoints']:>10} {row['index_build_s']:>8.2f} {row['terms']:>8} "
+                  f"{row['mean_query_ms']:>14.3f} {row['max_query_ms']:>13.3f}")
+    elif args.benchmark == "ingest":
+        print(f"{'endpoints':>10} {'batch':>6} {'workers':>8} {'total s':>8} {'docs/s':>8} {'embed s':>8} {'write s':>8}")
+        for row in benchmark_ingestion(args.sizes, args.batch_sizes, args.workers):
+            print(f"{row['endpoints']:>10} {row['batch_size']:>6} {row['workers']:>8} {row['seconds']:>8.2f} "
+                  f"{row['docs_per_second']:>8.1f} {row['embed_s']:>8.2f} {row['write_s']:>8.2f}")
+    elif args.benchmark == "vectors":
+        print(f"{'endpoints':>10} {'backend':>14} {'build s':>8} {'mean ms':>8} {'p95 ms':>7} {'recall':>7} "
+              f"{'rss MB':>7} {'matrix MB':>10}")
+        for row in benchmark_vector_stores(args.sizes, args.dimension, args.queries, args.top_k):
+            rss = f"{row['rss_mb']:>7.1f}" if row["rss_mb"] is not None else f"{'-':>7}"
+            matrix = f"{row['matrix_mb']:>10.1f}" if row["matrix_mb"] is not None else f"{'-':>10}"
+            print(f"{row['endpoints']:>10} {row['backend']:>14} {row['build_s']:>8.2f} {row['mean_query_ms']:>8.2f} "
+                  f"{row['p95_query_ms']:>7.2f} {row['recall']:>7.3f} {rss} {matrix}")
+    elif args.benchmark == "hnsw":
+        print(f"{'endpoints':>10} {'M':>4} {'constr ef':>9} {'search ef':>9} {'build s':>8} {'p50 ms':>7} "
+              f"{'p99 ms':>7} {'recall@' + str(args.top_k):>9}")
+        for row in benchmark_hnsw(args.sizes, args.m, args.construction_ef, args.search_ef, args.space,
+                                  args.dimension, args.queries, args.top_k, args.collection):
+            print(f"{row['endpoints']:>10} {row['M']:>4} {row['construction_ef']:>9} {row['search_ef']:>9} "
+                  f"{row['build_s']:>8.2f} {row['p50_ms']:>7.2f} {row['p99_ms']:>7.2f} {row['recall']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Field-weighted BM25 index over the endpoints of a collection.
+
+Each endpoint's name, URL path, description, request body and response
+examples are tokenized once when the index is built, and again only for the
+endpoints an edit changes. Term frequencies are length-normalized per field,
+weighted and saturated (BM25F), so each (term, endpoint) pair stores its score
+contribution up to the term's idf. A query reads each of its terms' postings in
+descending impact order and stops as soon as no unread endpoint can reach the
+k-th best score found so far (Fagin's threshold algorithm).
+"""
+import re
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.config import BM25_CONFIG
+from backend.index import EndpointRecord, raw_body_text
+from backend.postings import merge_postings, renumbering
+
+FIELDS = ("name", "url", "description", "body", "response")
+
+# camelCase and acronym runs split apart ("getUserByID" -> get, user, by, id); other scripts kept whole
+_TOKEN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\W\d_]+")
+_MIN_DEPTH = 64     # postings read per query term before the first threshold check
+
+
+def normalize_token(token: str) -> str:
+    """Lowercase a token and fold a trailing plural 's' away ("Refunds" -> "refund")."""
+    token = token.lower()
+    if len(token) > 3 and token[-1] == "s" and token[-2] != "s":
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized word tokens of a text."""
+    return [normalize_token(token) for token in _TOKEN.findall(text)]
+
+
+def description_text(description: Any) -> str:
+    """Text of a Postman description, which is either a string or {"content": ..., "type": ...}."""
+    if isinstance(description, dict):
+        return str(description.get("content", "") or "")
+    return str(description or "")
+
+
+def body_text(body: Any) -> str:
+    """Searchable text of a request body: raw text, form fields, or a GraphQL query."""
+    if not isinstance(body, dict):
+        return ""
+    mode = body.get("mode", "")
+    if mode == "raw":
+        return raw_body_text(body)
+    if mode in ("urlencoded", "formdata"):
+        return " ".join(f"{field.get('key', '')} {field.get('value', '')}"
+                        for field in body.get(mode, []) or [] if isinstance(field, dict))
+    if mode == "graphql":
+        return str((body.get("graphql") or {}).get("query", ""))
+    return ""
+
+
+def endpoint_fields(endpoint: EndpointRecord) -> Tuple[str, ...]:
+    """Text of every BM25 field of an endpoint, in FIELDS order."""
+    body, responses = endpoint.load_payload()
+    query_keys = " ".join(str(param.get("key", "")) for param in endpoint.query if isinstance(param, dict))
+    response_text = " ".join(f"{response.get('name', '')} {response.get('body', '') or ''}"
+                             for response in responses if isinstance(response, dict))
+    return (
+        endpoint.name,
+        f"{endpoint.path} {query_keys}",
+        description_text(endpoint.description),
+        body_text(body),
+        response_text,
+    )
+
+
+class BM25Index:
+    """
+    BM25F scores in compressed sparse rows. The postings of the term with id t span
+    `_starts[t]:_starts[t + 1]` in two orders of the same entries: `_docs` / `_weights`
+    by endpoint position, for lookups, and `_ranked_docs` / `_ranked_weights` by
+    descending weight, for reading the best endpoints first. A weight is the term's
+    saturated frequency in the endpoint and its score contribution that times the
+    term's `_idf`, kept apart so that an edit, which changes every idf, leaves the
+    postings of the other endpoints valid. Field lengths are normalized against the
+    averages of the last full build.
+    """
+
+    def __init__(self, endpoints: Sequence[EndpointRecord]):
+        self.endpoints = endpoints
+        self.terms: Dict[str, int] = {}
+        self._average = np.zeros(len(FIELDS), dtype=np.float64)
+        self._idf = np.zeros(0, dtype=np.float64)
+        self._starts = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._ranked_docs = self._docs
+        self._ranked_weights = self._weights
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    @classmethod
+    def build(cls, endpoints: Sequence[EndpointRecord]) -> "BM25Index":
+        index = cls(endpoints)
+        rows = _tokenized(endpoints, index.terms)
+        lengths = rows[3]
+        # Per-field length normalization against that field's average length over endpoints having it
+        present = lengths > 0
+        index._average = lengths.sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+        term_ids, docs, weights = _postings(*rows, index._average)
+
+        frequencies = np.bincount(term_ids, minlength=len(index.terms))
+        index._starts = np.concatenate(([0], np.cumsum(frequencies))).astype(np.int64)
+        index._docs = docs.astype(np.int32)
+        index._weights = weights
+        index._idf = _idf(frequencies, len(endpoints))
+        # Within each term, best weight first and ties in collection order
+        ranked = np.lexsort((docs, -weights, term_ids))
+        index._ranked_docs = index._docs[ranked]
+        index._ranked_weights = weights[ranked]
+        return index
+
+    def updated(self, endpoints: Sequence[EndpointRecord], carried: np.ndarray) -> "BM25Index":
+        """
+        This index over a new version of its endpoints, where carried[i] is the position in
+        `self.endpoints` of an endpoint unchanged as endpoints[i] (increasing), or -1 for an
+        endpoint to index afresh. Only the fresh endpoints are tokenized; the postings of the
+        others are renumbered and every idf recomputed.
+        """
+        moved, fresh_positions = renumbering(carried, len(self.endpoints))
+        index = BM25Index(endpoints)
+        # Copied, as the version being replaced keeps answering queries meanwhile
+        index.terms = dict(self.terms)
+        index._average = self._average
+        rows = _tokenized([endpoints[position] for position in fresh_positions.tolist()], index.terms)
+        term_ids, fresh_docs, weights = _postings(*rows, self._average)
+        fresh_docs = fresh_positions[fresh_docs]
+
+        moved = moved.astype(np.int32)
+        keys = np.arange(len(self.terms))
+        _, frequencies, index._docs, (index._weights,) = merge_postings(
+            keys, self._starts, self._docs, (self._weights,), moved, term_ids, fresh_docs, (weights,))
+        _, _, index._ranked_docs, (index._ranked_weights,) = merge_postings(
+            keys, self._starts, self._ranked_docs, (self._ranked_weights,), moved, term_ids, fresh_docs, (weights,),
+            order=_by_weight)
+        index._starts = np.concatenate(([0], np.cumsum(frequencies))).astype(np.int64)
+        index._idf = _idf(frequencies, len(endpoints))
+        return index
+
+    def search(self, query: str, k: int) -> List[Tuple[EndpointRecord, float]]:
+        """The k best scoring endpoints for a query, ties in collection order."""
+        spans = []
+        for term in dict.fromkeys(tokenize(query)):
+            term_id = self.terms.get(term)
+            if term_id is not None and self._starts[term_id + 1] > self._starts[term_id]:
+                spans.append((int(self._starts[term_id]), int(self._starts[term_id + 1]), float(self._idf[term_id])))
+        if not spans or k <= 0:
+            return []
+
+        if len(spans) == 1:
+            start, end, idf = spans[0]
+            docs = self._ranked_docs[start:min(end, start + k)]
+            scores = idf * self._ranked_weights[start:min(end, start + k)].astype(np.float64)
+            return [(self.endpoints[doc], float(score)) for doc, score in zip(docs, scores)]
+
+        depth = max(k, _MIN_DEPTH)
+        while True:
+            seen = np.unique(np.concatenate([self._ranked_docs[start:min(end, start + depth)]
+                                             for start, end, _ in spans]))
+            scores = np.zeros(len(seen), dtype=np.float64)
+            for start, end, idf in spans:
+                postings = self._docs[start:end]
+                at = np.minimum(np.searchsorted(postings, seen), len(postings) - 1)
+                scores += np.where(postings[at] == seen, idf * self._weights[start:end][at].astype(np.float64), 0)
+            docs, scores = _best(seen, scores, k)
+
+            # An endpoint not read yet scores at most the next unread impact of every term. It can only
+            # reach that bound by holding exactly those impacts, and then comes after each term's next
+            # unread endpoint in collection order, losing a tie with the k-th result if that one is earlier.
+            unread = [(start + depth, idf) for start, end, idf in spans if start + depth < end]
+            if not unread:
+                return [(self.endpoints[doc], float(score)) for doc, score in zip(docs, scores)]
+            bound = sum(idf * float(self._ranked_weights[position]) for position, idf in unread)
+            next_unread = max(self._ranked_docs[position] for position, _ in unread)
+            if len(docs) == k and (scores[-1] > bound or (scores[-1] == bound and docs[-1] < next_unread)):
+                return [(self.endpoints[doc], float(score)) for doc, score in zip(docs, scores)]
+            depth *= 4
+
+
+def _best(docs: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The k highest scores, ties in ascending order of `docs` (which must be ascending), ranked."""
+    if len(docs) > k:
+        # Everything above the k-th score, then the earliest endpoints tied with it
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(above)]
+        best = np.concatenate((above, tied))
+        docs, scores = docs[best], scores[best]
+    ranked = np.lexsort((docs, -scores))
+    return docs[ranked], scores[ranked]
+
+
+def _tokenized(endpoints: Sequence[EndpointRecord], terms: Dict[str, int]
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    One (term id, frequency) row per distinct raw token of each field of each endpoint, how many
+    rows each field has, and each field's length in tokens; new terms are added to `terms`.
+    """
+    term_ids: List[int] = []
+    counts: List[int] = []
+    row_counts = np.zeros((len(endpoints), len(FIELDS)), dtype=np.int64)
+    lengths = np.zeros((len(endpoints), len(FIELDS)), dtype=np.float64)
+    token_ids: Dict[str, int] = {}   # raw token -> term id, so each spelling is normalized once
+    for position, endpoint in enumerate(endpoints):
+        for field, text in enumerate(endpoint_fields(endpoint)):
+            tokens = _TOKEN.findall(text)
+            if not tokens:
+                continue
+            frequencies = Counter(tokens)
+            for token in frequencies:
+                if token not in token_ids:
+                    token_ids[token] = terms.setdefault(normalize_token(token), len(terms))
+            term_ids.extend(map(token_ids.__getitem__, frequencies))
+            counts.extend(frequencies.values())
+            row_counts[position, field] = len(frequencies)
+            lengths[position, field] = len(tokens)
+    return (np.asarray(term_ids, dtype=np.int64), np.asarray(counts, dtype=np.float64), row_counts, lengths)
+
+
+def _postings(term_ids: np.ndarray, counts: np.ndarray, row_counts: np.ndarray, lengths: np.ndarray,
+              average: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(term id, endpoint, saturated frequency) of every term of the tokenized endpoints, by term then endpoint."""
+    weights = np.asarray([BM25_CONFIG["field_weights"][field] for field in FIELDS], dtype=np.float64)
+    k1, b = BM25_CONFIG["k1"], BM25_CONFIG["b"]
+    if not len(term_ids):
+        return term_ids, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    docs = np.repeat(np.arange(len(row_counts), dtype=np.int64), row_counts.sum(axis=1))
+    fields = np.repeat(np.tile(np.arange(len(FIELDS), dtype=np.int64), len(row_counts)), row_counts.ravel())
+    norms = 1 - b + b * lengths / np.where(average > 0, average, 1)
+    pseudo = weights[fields] * counts / norms[docs, fields]
+
+    # Fields (and spellings) of the same (term, endpoint) pair add up into one pseudo-frequency
+    order = np.lexsort((docs, term_ids))
+    term_ids, docs, pseudo = term_ids[order], docs[order], pseudo[order]
+    first = np.ones(len(term_ids), dtype=bool)
+    first[1:] = (term_ids[1:] != term_ids[:-1]) | (docs[1:] != docs[:-1])
+    starts = np.flatnonzero(first)
+    term_ids, docs, pseudo = term_ids[starts], docs[starts], np.add.reduceat(pseudo, starts)
+    return term_ids, docs, (pseudo * (k1 + 1) / (pseudo + k1)).astype(np.float32)
+
+
+def _idf(frequencies: np.ndarray, endpoints: int) -> np.ndarray:
+    return np.log1p((endpoints - frequencies + 0.5) / (frequencies + 0.5))
+
+
+def _by_weight(docs: np.ndarray, values: Sequence[np.ndarray]) -> np.ndarray:
+    """Order of postings ranked by descending weight, ties by ascending endpoint."""
+    (weights,) = values
+    # Non-negative floats order like their bit patterns
+    return ((0x7FFFFFFF - weights.view(np.int32).astype(np.int64)) << 32) | docs.astype(np.int64)
@@ -0,0 +1,117 @@
+"""
+Parallel bulk load of every collection file in backend/data/collections.
+
+Files are parsed and compiled in a process pool, largest first, so the whole
+directory warms in roughly the time of the largest file. Workers write their
+result to the snapshot cache and only send the fingerprint back; the main
+process then memory-maps the snapshots instead of unpickling full indexes.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config import BULK_LOAD_CONFIG, COLLECTIONS_DIR, SNAPSHOT_CONFIG
+from backend.index import EndpointIndex
+from backend.loader import load_collection_file
+from backend.snapshot import fingerprint_file, load_snapshot
+from backend.workspace import CollectionRegistry, LoadedCollection
+
+
+@dataclass
+class BulkLoadReport:
+    loaded: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    workers: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        text = (f"Loaded {len(self.loaded)} collection(s) in {self.seconds:.2f}s with {self.workers} worker(s); "
+                f"{len(self.unchanged)} already loaded and unchanged")
+        if self.failed:
+            text += f"; {len(self.failed)} failed: " + ", ".join(self.failed)
+        return text
+
+
+def _compile_worker(file_path: str, fingerprint: str) -> Optional[Tuple[EndpointIndex, Dict[str, Any]]]:
+    """Runs in a worker process. Returns nothing when the result was written to the snapshot cache."""
+    result = load_collection_file(file_path, fingerprint=fingerprint)
+    if SNAPSHOT_CONFIG["enabled"]:
+        return None
+    return result.index, result.header
+
+
+def _restore(fingerprint: str, payload: Optional[Tuple[EndpointIndex, Dict[str, Any]]]) -> Tuple[EndpointIndex, Dict[str, Any]]:
+    if payload is None:
+        payload = load_snapshot(fingerprint)
+        if payload is None:
+            raise RuntimeError("worker finished but its snapshot could not be read")
+    index, header = payload
+    index.fingerprint = fingerprint
+    return index, header
+
+
+def load_all_collections(registry: CollectionRegistry, directory: Optional[str] = None,
+                         max_workers: Optional[int] = None) -> BulkLoadReport:
+    """
+    Load every *.json collection in `directory` into the registry.
+
+    Collections that are already resident and unchanged are left untouched (with
+    their embeddings); collections with an up-to-date snapshot are mapped directly
+    and only the remaining files are compiled in the process pool.
+    """
+    start = time.perf_counter()
+    directory = str(directory or COLLECTIONS_DIR)
+    report = BulkLoadReport()
+
+    paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json")]
+    # Longest jobs first keeps the pool busy until the largest file is done
+    paths.sort(key=os.path.getsize, reverse=True)
+
+    pending: Dict[str, str] = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            fingerprint = fingerprint_file(path)
+            loaded = registry.get(name)
+            if loaded is not None and loaded.name == name and loaded.fingerprint == fingerprint:
+                report.unchanged.append(name)
+                continue
+            cached = load_snapshot(fingerprint) if SNAPSHOT_CONFIG["enabled"] else None
+            if cached is not None:
+                index, header = _restore(fingerprint, cached)
+                registry.add(LoadedCollection(name, path, index, header), activate=False)
+                report.loaded.append(name)
+                continue
+            pending[path] = fingerprint
+        except Exception as e:
+            report.failed[name] = str(e)
+
+    def register(path: str, compute):
+        name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            index, header = _restore(pending[path], compute())
+        except Exception as e:
+            report.failed[name] = str(e)
+            return
+        registry.add(LoadedCollection(name, path, index, header), activate=False)
+        report.loaded.append(name)
+
+    if pending:
+        report.workers = min(len(pending), max_workers or BULK_LOAD_CONFIG["max_workers"] or os.cpu_count() or 1)
+        if report.workers == 1:
+            # Not worth starting a process pool
+            for path, fingerprint in pending.items():
+                register(path, lambda: _compile_worker(path, fingerprint))
+        else:
+            with ProcessPoolExecutor(max_workers=report.workers) as pool:
+                futures = {pool.submit(_compile_worker, path, fingerprint): path for path, fingerprint in pending.items()}
+                # Compiled results are handed back as each worker finishes
+                for future in as_completed(futures):
+                    register(futures[future], future.result)
+
+    report.seconds = time.perf_counter() - start
+    print(f"[load_all_collections] {report.summary()}")
+    return report
@@ -55,3 +55,119 @@ MEMORY_CONFIG = {
     "max_token_limit": 4096,
     "k": 30
 }
+
+# Collection loading
+DATA_DIR = Path(__file__).resolve().parent / "data"
+COLLECTIONS_DIR = DATA_DIR / "collections"
+
+STREAMING_LOAD_CONFIG = {
+    "chunk_size": 1024 * 1024,                  # bytes read from disk per step
+    "auto_stream_min_bytes": 50 * 1024 * 1024,  # files at least this large are streamed by default
+    "trace_memory": False,                      # also trace the Python heap peak (tracemalloc, several times slower)
+}
+
+SNAPSHOT_CONFIG = {
+    "enabled": True,
+    "directory": str(DATA_DIR / "snapshots"),  # compiled collections keyed by file fingerprint
+    "max_snapshots": 64,
+}
+
+PAYLOAD_COMPRESSION_CONFIG = {
+    "enabled": True,                            # zstd-compress request bodies and response examples in snapshots
+    "level": 3,
+    "min_bytes": 256,                           # smaller payloads are stored as plain JSON
+    "dictionary_size": 112 * 1024,              # upper bound for the dictionary trained per collection
+    "dictionary_samples": 2000,                 # payloads buffered to train the dictionary
+    "dictionary_sample_bytes": 8 * 1024 * 1024, # ...or fewer, once they add up to this many bytes
+}
+
+KEYWORD_SEARCH_CONFIG = {
+    "workers": -1,                              # threads used to score a query batch; -1 uses every core
+}
+
+BM25_CONFIG = {
+    "k1": 1.2,                                  # term frequency saturation
+    "b": 0.75,                                  # length normalization, applied per field
+    "field_weights": {                          # how much a term occurrence counts in each field
+        "name": 3.0,
+        "url": 2.0,
+        "description": 1.5,
+        "body": 1.0,
+        "response": 0.5,
+    },
+}
+
+ENDPOINT_LOOKUP_CONFIG = {
+    "suffix_depth": 64,                         # characters the name suffix array is sorted on; longer queries are verified
+    "max_candidates": 10,                       # endpoints listed when a name is ambiguous
+}
+
+DETAIL_CACHE_CONFIG = {
+    "max_entries": 1024,                        # rendered get_endpoint_details documents kept across collections
+    "warm_on_load": 16,                         # most requested endpoints pre-rendered when a collection (re)loads; 0 disables
+}
+
+EMBEDDING_CONFIG = {
+    "backend": os.getenv("EMBEDDING_BACKEND", "onnx"),  # "onnx" (ChromaDB's bundled ONNX Runtime model) or "sentence-transformers"
+    "model_name": os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),  # the onnx backend only provides all-MiniLM-L6-v2
+    "intra_op_threads": int(os.getenv("EMBEDDING_THREADS", "0")),  # threads per inference call; 0 lets the runtime use every core
+    "inter_op_threads": 1,                      # threads running independent graph nodes; MiniLM is sequential
+    "batch_size": 32,                           # texts per forward pass within one embedding call
+    "device": os.getenv("EMBEDDING_DEVICE", "cpu"),  # sentence-transformers only: "cpu", "cuda", "mps"
+    "warm_on_startup": True,                    # load the model in the background when the server starts, not on the first search
+}
+
+EMBEDDING_CACHE_CONFIG = {
+    "enabled": True,                            # reuse embeddings of identical texts across loads and collections
+    "path": str(DATA_DIR / "embedding_cache" / "embeddings.sqlite3"),
+    "max_entries": 200_000,                     # least recently used embeddings are evicted beyond this
+}
+
+QUERY_EMBEDDING_CACHE_CONFIG = {
+    "max_entries": 1024,                        # search query embeddings kept in memory, least recently used evicted
+}
+
+EMBEDDING_PIPELINE_CONFIG = {
+    "batch_size": 64,                           # documents embedded and written per batch
+    "workers": 2,                               # embedding threads; the model already uses several cores per call
+    "max_pending": 4,                           # batches embedded ahead of the writes, bounding memory
+    "log_every": 1000,                          # documents between ingestion progress lines
+}
+
+RAG_INGESTION_CONFIG = {
+    "background": True,                         # ingest after load_postman_collection returns instead of during it
+    "workers": 1,                               # collections ingested at once; each already embeds on several threads
+    "search_wait_seconds": 10.0,                # semantic search waits this long for a running ingestion, then answers from what is ingested
+}
+
+VECTOR_STORE_CONFIG = {
+    "backend": os.getenv("VECTOR_STORE_BACKEND", "chroma"),  # "chroma" (SQLite + HNSW) or "numpy" (in-process exact search)
+    "numpy_directory": str(DATA_DIR / "vector_store"),
+    "numpy_dtype": os.getenv("VECTOR_STORE_DTYPE", "float16"),  # "float16", or "int8" with a scale per row for half the memory
+}
+
+HNSW_CONFIG = {
+    # Chroma's approximate index; fixed when a collection is created, so changing these rebuilds the
+    # collection's vectors on its next load (re-embedding hits the embedding cache). Collections created
+    # before these settings were recorded are rebuilt once. The numpy store is exact and only uses "space".
+    "space": "cosine",                          # "cosine", "l2" or "ip"; embeddings are normalized, so all three rank alike,
+                                                # and both stores report distances on this space's scale
+    "M": 16,                                    # graph neighbours per node: recall and memory grow with it
+    "construction_ef": 200,                     # candidate list while inserting: better graphs, slower builds
+    "search_ef": 200,                           # candidate list per query, raised to n_results when smaller; barely affects latency
+}
+
+HYBRID_SEARCH_CONFIG = {
+    "candidates": 50,                           # results taken from each retriever before fusion
+    "rrf_k": 60,                                # reciprocal rank fusion: score = sum of 1 / (rrf_k + rank)
+}
+
+BULK_LOAD_CONFIG = {
+    "on_startup": os.getenv("BULK_LOAD_ON_STARTUP", "false").lower() == "true",  # warm every collection when the server starts
+    "max_workers": None,                        # worker processes; defaults to the number of CPU cores
+}
+
+WATCHER_CONFIG = {
+    "enabled": os.getenv("WATCH_COLLECTIONS", "false").lower() == "true",  # re-index loaded collections when their file changes
+    "debounce_seconds": 0.5,                    # editors and exports write a file in several steps
+}
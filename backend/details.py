@@ -0,0 +1,182 @@
+"""
+Rendered endpoint detail documents and the LRU cache that keeps them.
+
+get_endpoint_details returns the same markdown document for an endpoint until
+its collection changes, so documents are cached per (collection fingerprint,
+endpoint id). The cache is told when a collection's index is replaced or
+dropped, and then discards that fingerprint's documents, unless another loaded
+collection with identical content still serves them, and pre-renders the
+endpoints asked for most often under the collection's new version.
+"""
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.config import DETAIL_CACHE_CONFIG
+from backend.index import EndpointIndex, EndpointRecord, raw_body_text
+
+
+def render_endpoint_details(found_endpoint: EndpointRecord) -> str:
+    """Markdown details of one endpoint as returned by get_endpoint_details."""
+    # Extract endpoint details
+    name = found_endpoint.name
+    method = found_endpoint.method
+    formatted_url = found_endpoint.url
+    
+    # Get headers
+    headers = found_endpoint.headers
+    headers_text = "\n".join([f"- {h.get('key', '')}: {h.get('value', '')}" for h in headers]) if headers else "No headers"
+    
+    # Get query params
+    query = found_endpoint.query
+    query_text = "\n".join([f"- {q.get('key', '')}: {q.get('value', '')}" for q in query]) if query else "No query parameters"
+    
+    # Get body
+    body, responses = found_endpoint.load_payload()
+    body_text = "No body"
+    if body and isinstance(body, dict):
+        mode = body.get("mode", "")
+        if mode == "raw":
+            body_text = raw_body_text(body)
+            if len(body_text) > 500:
+                body_text = body_text[:500] + "...(truncated)"
+    
+    # Get responses
+    response_text = "No example responses"
+    if responses:
+        response_text = f"{len(responses)} example response(s) available"
+        if responses:
+            sample_response = responses[0]
+            sample_code = sample_response.get("code", "")
+            sample_body = sample_response.get("body", "")
+            if sample_body and len(sample_body) > 500:
+                sample_body = sample_body[:500] + "...(truncated)"
+            response_text += f"\n\nSample Response (Status: {sample_code}):\n{sample_body}"
+    
+    # Compose detailed output
+    details = f"""
+# Endpoint: {name}
+
+- **Method**: {method}
+- **URL**: {formatted_url}
+
+## Headers
+{headers_text}
+
+## Query Parameters
+{query_text}
+
+## Request Body
+```
+{body_text}
+```
+
+## Responses
+{response_text}
+    """
+    
+    return details.strip()
+
+
+class DetailCache:
+    """
+    Thread-safe LRU of rendered detail documents keyed by (fingerprint, endpoint id). Reference
+    counts are kept per (collection title, endpoint id) so they survive reloads.
+    `fingerprint_in_use` tells whether a loaded collection still serves a version; its
+    documents are kept when one does.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None,
+                 fingerprint_in_use: Optional[Callable[[str], bool]] = None):
+        self.max_entries = DETAIL_CACHE_CONFIG["max_entries"] if max_entries is None else max_entries
+        self.fingerprint_in_use = fingerprint_in_use
+        self._documents: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._references: Counter = Counter()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, index: EndpointIndex, endpoint: EndpointRecord) -> str:
+        """The rendered document of an endpoint, rendering and caching it on a miss."""
+        key = (index.fingerprint, endpoint.endpoint_id)
+        with self._lock:
+            self._references[(index.name, endpoint.endpoint_id)] += 1
+            if index.fingerprint is None:
+                # Not loaded from a file: nothing identifies this version of the collection
+                self.misses += 1
+                return render_endpoint_details(endpoint)
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+                self.hits += 1
+                return document
+            self.misses += 1
+        # Rendered outside the lock, as it decodes the payload; a concurrent miss renders the same text
+        document = render_endpoint_details(endpoint)
+        self._store(key, document)
+        return document
+
+    def _store(self, key: Tuple[str, str], document: str):
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_entries:
+                self._documents.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, fingerprint: Optional[str]):
+        """Drop every document rendered from one version of a collection."""
+        with self._lock:
+            stale = [key for key in self._documents if key[0] == fingerprint]
+            for key in stale:
+                del self._documents[key]
+            self.invalidations += len(stale)
+
+    def warm(self, index: EndpointIndex, limit: Optional[int] = None) -> int:
+        """Render the collection's most referenced endpoints ahead of time; returns how many were added."""
+        limit = DETAIL_CACHE_CONFIG["warm_on_load"] if limit is None else limit
+        if limit <= 0 or index.fingerprint is None:
+            return 0
+        with self._lock:
+            referenced = [(endpoint_id, count) for (title, endpoint_id), count in self._references.items()
+                          if title == index.name]
+        referenced.sort(key=lambda reference: reference[1], reverse=True)
+
+        warmed = 0
+        for endpoint_id, _ in referenced[:limit]:
+            position = index.name_index.by_id.get(endpoint_id)
+            key = (index.fingerprint, endpoint_id)
+            if position is None or key in self._documents:
+                continue
+            self._store(key, render_endpoint_details(index.endpoints[position]))
+            warmed += 1
+        return warmed
+
+    def index_changed(self, previous: Optional[EndpointIndex], current: Optional[EndpointIndex]):
+        """Registry hook: the index served under a collection name was replaced, added or dropped."""
+        if previous is not None and (current is None or current.fingerprint != previous.fingerprint):
+            # Collections with identical content share a fingerprint, and so their documents
+            if self.fingerprint_in_use is None or not self.fingerprint_in_use(previous.fingerprint):
+                self.invalidate(previous.fingerprint)
+        if current is not None:
+            self.warm(current)
+
+    def stats(self, fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """Hit/miss counters; with a fingerprint, also how many documents of that version are cached."""
+        with self._lock:
+            stats = {
+                "entries": len(self._documents),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / (self.hits + self.misses), 3) if self.hits + self.misses else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+            if fingerprint is not None:
+                stats["collection_entries"] = sum(1 for key in self._documents if key[0] == fingerprint)
+        return stats
@@ -0,0 +1,189 @@
+"""
+Persistent embedding cache in front of the vector store's embedding function.
+
+Embeddings are stored in SQLite under backend/data/embedding_cache, keyed by
+model name and a hash of the embedded text, so identical documents are embedded
+once across reloads, dropped vector collections and collections that share
+endpoints. Least recently used entries are evicted past a size bound.
+
+Search queries additionally go through a small in-memory LRU, since agents and
+users repeat the same queries and a hit there skips the SQLite lookup too.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import xxhash
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from backend.config import EMBEDDING_CACHE_CONFIG, QUERY_EMBEDDING_CACHE_CONFIG
+
+_SQLITE_VARIABLES = 900     # keys per lookup statement, below SQLite's bound on host parameters
+
+
+def text_key(model: str, text: str) -> str:
+    """Cache key of a text embedded by a model."""
+    return f"{model}:{xxhash.xxh3_128_hexdigest(text.encode())}"
+
+
+def embedding_model_name(function: EmbeddingFunction) -> str:
+    """Name of the model behind an embedding function, seen through the cache wrapper."""
+    if isinstance(function, CachedEmbeddingFunction):
+        return function.model
+    return getattr(function, "MODEL_NAME", type(function).__name__)
+
+
+class EmbeddingCache:
+    """SQLite table of float32 embeddings with last-use times for LRU eviction, and hit/miss counters."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path or EMBEDDING_CACHE_CONFIG["path"]
+        self.max_entries = EMBEDDING_CACHE_CONFIG["max_entries"] if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use, so importing the module never touches the disk
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached embeddings of the keys that are present, marking them as just used."""
+        found: Dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            connection = self._connect()
+            for start in range(0, len(unique), _SQLITE_VARIABLES):
+                chunk = unique[start:start + _SQLITE_VARIABLES]
+                rows = connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+            if found:
+                now = time.time()
+                with connection:
+                    connection.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?",
+                                           [(now, key) for key in found])
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, entries: Dict[str, Any]):
+        """Store embeddings, then evict the least recently used ones beyond max_entries."""
+        if not entries:
+            return
+        now = time.time()
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in entries.items()]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows)
+                excess = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    connection.execute(
+                        "DELETE FROM embeddings WHERE key IN "
+                        "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (excess,))
+                    self.evictions += excess
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Embedding function that only runs the wrapped model on texts the cache has not seen."""
+
+    def __init__(self, function: EmbeddingFunction, cache: EmbeddingCache, model: Optional[str] = None):
+        self.function = function
+        self.cache = cache
+        self.model = model or embedding_model_name(function)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        keys = [text_key(self.model, text) for text in input]
+        found = self.cache.get_many(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, input):
+            if key not in found:
+                missing.setdefault(key, text)
+        if missing:
+            computed = self.function(list(missing.values()))
+            fresh = dict(zip(missing, (np.asarray(vector, dtype=np.float32) for vector in computed)))
+            self.cache.put_many(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+
+def cached(function: EmbeddingFunction, cache: Optional[EmbeddingCache] = None) -> EmbeddingFunction:
+    """`function` behind the persistent cache, or unchanged when EMBEDDING_CACHE_CONFIG disables it."""
+    if not EMBEDDING_CACHE_CONFIG["enabled"]:
+        return function
+    return CachedEmbeddingFunction(function, cache or EmbeddingCache())
+
+
+class QueryEmbeddingCache:
+    """In-memory LRU of query embeddings keyed by model and whitespace-normalized query text."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = QUERY_EMBEDDING_CACHE_CONFIG["max_entries"] if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, queries: Sequence[str], function: EmbeddingFunction) -> List[np.ndarray]:
+        """Embeddings of the queries, in order; the ones not cached are embedded in one batch."""
+        model = embedding_model_name(function)
+        keys = [(model, " ".join(query.split())) for query in queries]
+        found: Dict[Tuple[str, str], np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing:
+            computed = function([text for _, text in missing])
+            fresh = dict(zip(missing, (np.asarray(vector, dtype=np.float32) for vector in computed)))
+            found.update(fresh)
+            with self._lock:
+                self._entries.update(fresh)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return [found[key] for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
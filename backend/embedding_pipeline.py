@@ -0,0 +1,121 @@
+"""
+Batched, parallel embedding of documents into a vector store collection.
+
+Documents are split into batches that a pool of worker threads embeds, while
+the calling thread writes each finished batch to the collection together with
+its precomputed embeddings. Writing batch n therefore overlaps with embedding
+the batches after it, and at most `max_pending` batches are in flight so
+memory stays bounded on large collections. The ONNX runtime behind the default
+embedding function releases the GIL, so threads embed in parallel.
+"""
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from chromadb import EmbeddingFunction
+
+from backend.config import EMBEDDING_PIPELINE_CONFIG
+
+# Called after every written batch with (documents written, documents total)
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class PipelineStats:
+    """Outcome of one pipeline run."""
+    documents: int
+    batches: int
+    seconds: float
+    embed_seconds: float        # summed over workers, so it can exceed `seconds`
+    write_seconds: float
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.documents} documents in {self.batches} batches, {self.seconds:.2f}s "
+                f"({self.docs_per_second:.1f} docs/s; embedding {self.embed_seconds:.2f}s, writes {self.write_seconds:.2f}s)")
+
+
+def _batches(records: Dict[str, List[Any]], batch_size: int) -> List[Dict[str, List[Any]]]:
+    """Consecutive slices of chroma records (ids / documents / metadatas) of at most batch_size."""
+    total = len(records["ids"])
+    return [{key: values[start:start + batch_size] for key, values in records.items()}
+            for start in range(0, total, batch_size)]
+
+
+def embed_and_upsert(collection, records: Dict[str, List[Any]], embedding_function: EmbeddingFunction,
+                     progress: Optional[ProgressCallback] = None, batch_size: Optional[int] = None,
+                     workers: Optional[int] = None, max_pending: Optional[int] = None) -> PipelineStats:
+    """
+    Embed the documents of `records` in batches on a worker pool and upsert each batch, in
+    order, into `collection` with its embeddings. Unset tuning arguments come from
+    EMBEDDING_PIPELINE_CONFIG; the batch size is capped at the client's maximum batch size.
+    """
+    batch_size = batch_size or EMBEDDING_PIPELINE_CONFIG["batch_size"]
+    workers = workers or EMBEDDING_PIPELINE_CONFIG["workers"]
+    max_pending = max(max_pending or EMBEDDING_PIPELINE_CONFIG["max_pending"], workers)
+    max_batch_size = getattr(getattr(collection, "_client", None), "get_max_batch_size", None)
+    if callable(max_batch_size):
+        batch_size = min(batch_size, max_batch_size())
+
+    total = len(records["ids"])
+    batches = _batches(records, batch_size)
+    timings = {"embed": 0.0, "write": 0.0}
+    done = 0
+    started = time.perf_counter()
+
+    def embed(batch: Dict[str, List[Any]]):
+        batch_started = time.perf_counter()
+        embeddings = embedding_function(batch["documents"])
+        return embeddings, time.perf_counter() - batch_started
+
+    def write_oldest():
+        # Batches are written in submission order, so progress counts a prefix of the records
+        nonlocal done
+        batch, future = pending.popleft()
+        embeddings, seconds = future.result()
+        timings["embed"] += seconds
+        write_started = time.perf_counter()
+        collection.upsert(embeddings=embeddings, **batch)
+        timings["write"] += time.perf_counter() - write_started
+        done += len(batch["ids"])
+        if progress is not None:
+            progress(done, total)
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embedding") as pool:
+        try:
+            for batch in batches:
+                pending.append((batch, pool.submit(embed, batch)))
+                if len(pending) >= max_pending:
+                    write_oldest()
+            while pending:
+                write_oldest()
+        except BaseException:
+            for _, future in pending:
+                future.cancel()
+            raise
+
+    return PipelineStats(documents=total, batches=len(batches), seconds=time.perf_counter() - started,
+                         embed_seconds=timings["embed"], write_seconds=timings["write"])
+
+
+def log_progress(prefix: str, every: Optional[int] = None) -> ProgressCallback:
+    """Progress callback printing `[prefix] done/total documents (docs/s)` every `every` documents and at the end."""
+    every = every or EMBEDDING_PIPELINE_CONFIG["log_every"]
+    started = time.perf_counter()
+    state = {"logged": 0}
+
+    def report(done: int, total: int):
+        if done - state["logged"] < every and done < total:
+            return
+        state["logged"] = done
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        print(f"[{prefix}] Embedded {done}/{total} documents ({rate:.1f} docs/s)")
+
+    return report
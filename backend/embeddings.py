@@ -0,0 +1,139 @@
+"""
+Embedding model backends for RAG ingestion and semantic search.
+
+The model is configured in EMBEDDING_CONFIG: the ONNX Runtime build of
+all-MiniLM-L6-v2 that ChromaDB ships (the default), or any sentence-transformers
+model. Nothing is loaded at import time. LazyEmbeddingFunction builds the
+backend on its first call, or when it is warmed in the background after
+startup, so importing the tools and starting the API never pays for the model.
+Inference threads are pinned from the config, so embedding does not compete
+with a local LLM for every core.
+"""
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from backend.config import EMBEDDING_CONFIG
+
+ONNX_MODEL = "all-MiniLM-L6-v2"     # the only model the ONNX backend ships
+
+
+def embedding_backend_name(config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Model identity of a configuration, as used in embedding cache keys and vector fingerprints.
+    The ONNX build keeps the bare model name so embeddings stored before this option existed stay valid.
+    """
+    config = config or EMBEDDING_CONFIG
+    if config["backend"] == "sentence-transformers":
+        return f"sentence-transformers/{config['model_name']}"
+    return config["model_name"]
+
+
+def create_embedding_function(config: Optional[Dict[str, Any]] = None) -> EmbeddingFunction:
+    """Build the embedding backend a configuration selects; this loads the inference runtime."""
+    config = config or EMBEDDING_CONFIG
+    if config["backend"] == "onnx":
+        if config["model_name"] != ONNX_MODEL:
+            raise ValueError(f"The onnx embedding backend only provides {ONNX_MODEL}; "
+                             f"use the sentence-transformers backend for '{config['model_name']}'")
+        return _onnx_function(config)
+    if config["backend"] == "sentence-transformers":
+        return SentenceTransformerEmbeddings(config)
+    raise ValueError(f"Unknown embedding backend '{config['backend']}', expected 'onnx' or 'sentence-transformers'")
+
+
+def _onnx_function(config: Dict[str, Any]) -> EmbeddingFunction:
+    # Imported here: the module pulls in onnxruntime and tokenizers when instantiated
+    from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+    class PinnedONNXMiniLM(ONNXMiniLM_L6_V2):
+        """ChromaDB's ONNX MiniLM with configured session threads and batch size."""
+
+        def __init__(self):
+            super().__init__(preferred_providers=["CPUExecutionProvider"])
+
+        @property
+        def model(self):
+            # Same session as the parent's, with thread counts set before it is created
+            session = self.__dict__.get("_pinned_session")
+            if session is None:
+                options = self.ort.SessionOptions()
+                options.log_severity_level = 3
+                if config["intra_op_threads"]:
+                    options.intra_op_num_threads = config["intra_op_threads"]
+                if config["inter_op_threads"]:
+                    options.inter_op_num_threads = config["inter_op_threads"]
+                session = self.ort.InferenceSession(
+                    os.path.join(self.DOWNLOAD_PATH, self.EXTRACTED_FOLDER_NAME, "model.onnx"),
+                    providers=self._preferred_providers, sess_options=options)
+                self.__dict__["_pinned_session"] = session
+            return session
+
+        def __call__(self, input: Documents) -> Embeddings:
+            self._download_model_if_not_exists()
+            return self._forward(list(input), batch_size=config["batch_size"])
+
+    return PinnedONNXMiniLM()
+
+
+class SentenceTransformerEmbeddings(EmbeddingFunction[Documents]):
+    """A sentence-transformers model on the configured device, returning normalized embeddings."""
+
+    def __init__(self, config: Dict[str, Any]):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ValueError("The sentence-transformers embedding backend needs the sentence-transformers "
+                             "package (pip install sentence-transformers)") from e
+        if config["intra_op_threads"]:
+            import torch
+            torch.set_num_threads(config["intra_op_threads"])
+        self.MODEL_NAME = embedding_backend_name(config)
+        self.batch_size = config["batch_size"]
+        self.model = SentenceTransformer(config["model_name"], device=config["device"])
+
+    def __call__(self, input: Documents) -> Embeddings:
+        vectors = self.model.encode(list(input), batch_size=self.batch_size, convert_to_numpy=True,
+                                    normalize_embeddings=True, show_progress_bar=False)
+        return [np.asarray(vector, dtype=np.float32) for vector in vectors]
+
+
+class LazyEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Embedding function that builds the configured backend on first use; safe to call from several threads."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or EMBEDDING_CONFIG
+        self.MODEL_NAME = embedding_backend_name(self.config)
+        self._function: Optional[EmbeddingFunction] = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._function is not None
+
+    def _backend(self) -> EmbeddingFunction:
+        if self._function is None:
+            with self._lock:
+                if self._function is None:
+                    print(f"[LazyEmbeddingFunction] Loading the {self.config['backend']} embedding backend ({self.MODEL_NAME})")
+                    self._function = create_embedding_function(self.config)
+        return self._function
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self._backend()(input)
+
+    def warm(self):
+        """Load the backend and run it once, so the first real request does not pay for it."""
+        try:
+            self(["warm up"])
+            print("[LazyEmbeddingFunction] Embedding backend ready")
+        except Exception as e:
+            print(f"[LazyEmbeddingFunction] Warm-up failed: {str(e)}")
+
+    def warm_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.warm, name="embedding-warmup", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,466 @@
+"""
+Compiled endpoint index for a loaded Postman collection.
+
+The raw collection tree is walked exactly once, at load time, and turned into
+flat, immutable records that every collection tool reads from.
+"""
+import copy
+import json
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+import pandas as pd
+import xxhash
+
+from backend.postings import carried_positions
+
+if TYPE_CHECKING:
+    from backend.bm25_index import BM25Index
+    from backend.keyword_index import KeywordIndex
+    from backend.name_index import NameIndex
+
+
+class InlinePayload:
+    """Request body and response examples of an endpoint held as decoded objects."""
+    __slots__ = ("body", "responses")
+
+    def __init__(self, body: Dict[str, Any], responses: Tuple[Dict[str, Any], ...]):
+        self.body = body
+        self.responses = responses
+
+    def load(self) -> Tuple[Dict[str, Any], Tuple[Dict[str, Any], ...]]:
+        return self.body, self.responses
+
+    def search_texts(self) -> Tuple[str, Tuple[str, ...]]:
+        return payload_search_texts(self.body, self.responses)
+
+
+@dataclass(frozen=True)
+class EndpointRecord:
+    """A single request of the collection with its folder path already resolved."""
+    endpoint_id: str
+    order: int                      # position of the item in tree (depth-first) order
+    name: str
+    full_name: str                  # "Folder/Sub Folder/Endpoint"
+    parent_folder: str
+    folder_ids: Tuple[str, ...]     # ids of the enclosing folders, outermost first
+    method: str
+    url: str                        # raw URL, falling back to host + path
+    raw_url: str                    # raw URL only, as exported by Postman
+    path: str                       # "/" + path segments, falling back to the raw URL
+    description: Any
+    headers: Tuple[Dict[str, Any], ...]
+    query: Tuple[Dict[str, Any], ...]
+    digest: str = ""                # content hash of the item and its path, used to diff reloads
+    # Heavy data (request body, response examples); snapshot-backed records decode it on every access
+    payload: Any = field(default=None, compare=False, repr=False)
+
+    def load_payload(self) -> Tuple[Dict[str, Any], Tuple[Dict[str, Any], ...]]:
+        """Request body and response examples in one decode; prefer it over body + responses."""
+        return self.payload.load() if self.payload is not None else ({}, ())
+
+    def search_texts(self) -> Tuple[str, Tuple[str, ...]]:
+        """Lowercased body text and serialized response examples, as matched by keyword search."""
+        return self.payload.search_texts() if self.payload is not None else ("", ())
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        return self.load_payload()[0]
+
+    @property
+    def responses(self) -> Tuple[Dict[str, Any], ...]:
+        return self.load_payload()[1]
+
+    @property
+    def body_raw(self) -> str:
+        """Raw request body text, empty unless the body mode is 'raw'."""
+        return raw_body_text(self.body)
+
+
+@dataclass(frozen=True)
+class FolderRecord:
+    """A folder of the collection."""
+    folder_id: str
+    order: int
+    name: str
+    full_name: str
+    parent_folder: str
+    folder_ids: Tuple[str, ...]
+
+
+# A folder re-identified after its descendants were compiled: (first order, last order, depth, folder id)
+FolderRename = Tuple[int, int, int, str]
+
+
+def replace_folder_id(folder_ids: Tuple[str, ...], depth: int, folder_id: str) -> Tuple[str, ...]:
+    """`folder_ids` with the id of the enclosing folder at `depth` (0 = outermost) replaced."""
+    return folder_ids[:depth] + (folder_id,) + folder_ids[depth + 1:]
+
+
+def raw_body_text(body: Any) -> str:
+    """Text of a Postman request body in 'raw' mode, empty for any other mode."""
+    if body and isinstance(body, dict) and body.get("mode", "") == "raw":
+        return body.get("raw", "") or ""
+    return ""
+
+
+def payload_search_texts(body: Any, responses: Sequence[Dict[str, Any]]) -> Tuple[str, Tuple[str, ...]]:
+    """Normalized text of a payload for keyword search; snapshots store it precomputed."""
+    return raw_body_text(body).lower(), tuple(json.dumps(response).lower() for response in responses)
+
+
+def format_url(url: Any) -> str:
+    """Return the raw URL of a request, falling back to host + path."""
+    if isinstance(url, dict):
+        if "raw" in url:
+            return url["raw"]
+        host = url.get("host", [])
+        if isinstance(host, list):
+            host = ".".join(host)
+        path = url.get("path", [])
+        if path:
+            return f"{host}/" + "/".join(path)
+        return ""
+    return str(url)
+
+
+def format_path(url: Any) -> str:
+    """Return the path of a request, falling back to the raw URL."""
+    if isinstance(url, dict):
+        path_array = url.get("path", [])
+        if path_array:
+            return "/" + "/".join(path_array)
+        if "raw" in url:
+            return url["raw"]
+        return ""
+    return str(url)
+
+
+def item_digest(item: Dict[str, Any], full_name: str) -> str:
+    """Stable content hash of a request item (key order independent) and its folder path."""
+    payload = orjson.dumps(item, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return xxhash.xxh3_64_hexdigest(full_name.encode() + b"\0" + payload)
+
+
+def compile_endpoint(item: Dict[str, Any], order: int, parent_folder: str,
+                     folder_ids: Tuple[str, ...], full_name: str, endpoint_id: Optional[str] = None) -> EndpointRecord:
+    """Compile a single Postman request item into an EndpointRecord."""
+    request = item["request"]
+    if isinstance(request, str):
+        request = {"url": request}
+    url = request.get("url", {})
+
+    return EndpointRecord(
+        endpoint_id=endpoint_id or item.get("id") or full_name,
+        order=order,
+        name=item.get("name", ""),
+        full_name=full_name,
+        parent_folder=parent_folder,
+        folder_ids=folder_ids,
+        method=request.get("method", ""),
+        url=format_url(url),
+        raw_url=url.get("raw", "") if isinstance(url, dict) else str(url),
+        path=format_path(url),
+        description=item.get("description", ""),
+        headers=tuple(request.get("header", []) or []),
+        query=tuple(url.get("query", []) or []) if isinstance(url, dict) else (),
+        digest=item_digest(item, full_name),
+        payload=InlinePayload(request.get("body", {}) or {}, tuple(item.get("response", []) or [])),
+    )
+
+
+# Cached properties of EndpointIndex that search tools build on first use
+SEARCH_STRUCTURES = ("keyword_index", "bm25_index", "name_index")
+
+
+class EndpointIndex:
+    """
+    Flat, read-only view over a Postman collection.
+
+    Endpoints and folders are stored in tree order; aggregates used by the
+    tools are computed lazily on first access and cached.
+    """
+
+    def __init__(self, info: Dict[str, Any], endpoints: Sequence[EndpointRecord], folders: Sequence[FolderRecord]):
+        self.info = info
+        # Snapshot-backed indexes pass a lazily decoded sequence that must not be materialized here
+        self.endpoints = tuple(endpoints) if isinstance(endpoints, list) else endpoints
+        self.folders = tuple(folders)
+        self.fingerprint: Optional[str] = None   # content fingerprint of the source file, if known
+        self.payload_stats: Any = None           # PayloadStats of the snapshot backing this index, if any
+
+    @property
+    def name(self) -> str:
+        return self.info.get("name", "Unnamed Collection")
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    def warm(self, structures: Sequence[str] = SEARCH_STRUCTURES):
+        """Build the named lazily cached search structures now, so the first query does not pay for them."""
+        for structure in structures:
+            getattr(self, structure)
+
+    @cached_property
+    def nodes(self) -> Tuple[Any, ...]:
+        """Endpoints and folders merged back into tree order."""
+        return tuple(sorted(tuple(self.endpoints) + self.folders, key=lambda node: node.order))
+
+    @cached_property
+    def method_counts(self) -> Dict[str, int]:
+        return dict(Counter(endpoint.method for endpoint in self.endpoints))
+
+    @cached_property
+    def endpoints_by_method(self) -> Dict[str, List[EndpointRecord]]:
+        grouped: Dict[str, List[EndpointRecord]] = {}
+        for endpoint in self.endpoints:
+            grouped.setdefault(endpoint.method, []).append(endpoint)
+        return grouped
+
+    @cached_property
+    def folder_counts(self) -> Dict[str, int]:
+        """Number of endpoints directly inside each folder ('Root' for top-level endpoints)."""
+        return dict(Counter(endpoint.parent_folder or "Root" for endpoint in self.endpoints))
+
+    @cached_property
+    def keyword_index(self) -> "KeywordIndex":
+        """Trigram index over the fields matched by keyword search."""
+        from backend.keyword_index import KeywordIndex
+        return KeywordIndex.build(self.nodes)
+
+    @cached_property
+    def bm25_index(self) -> "BM25Index":
+        """Field-weighted BM25 index over the endpoints, used by lexical search."""
+        from backend.bm25_index import BM25Index
+        return BM25Index.build(self.endpoints)
+
+    @cached_property
+    def name_index(self) -> "NameIndex":
+        """Exact and partial name lookup used to resolve endpoint references."""
+        from backend.name_index import NameIndex
+        return NameIndex.build(self.endpoints)
+
+    @cached_property
+    def dataframe(self) -> pd.DataFrame:
+        """Tabular view of the endpoints used by the collection analyst agent."""
+        return pd.DataFrame([_dataframe_row(endpoint) for endpoint in self.endpoints])
+
+    def inherit(self, previous: "EndpointIndex", diff: "IndexDiff"):
+        """
+        Build this index's DataFrame and search structures from those the previous version had
+        built, rendering and indexing only added and changed endpoints (and folders whose name or
+        path changed) and renumbering the others. What the previous version never built stays lazy.
+        """
+        built = [name for name in ("dataframe",) + SEARCH_STRUCTURES if name in previous.__dict__]
+        if not built:
+            return
+        unchanged = set(diff.unchanged)
+        if "name_index" in built:
+            old_positions = previous.name_index.by_id
+        else:
+            old_positions = {endpoint.endpoint_id: i for i, endpoint in enumerate(previous.endpoints)}
+        carried = carried_positions([old_positions[endpoint.endpoint_id] if endpoint.endpoint_id in unchanged else -1
+                                     for endpoint in self.endpoints])
+
+        if "dataframe" in built:
+            kept = np.flatnonzero(carried >= 0)
+            fresh = np.flatnonzero(carried < 0)
+            rows = previous.dataframe.iloc[carried[kept]].set_axis(kept)
+            if len(fresh):
+                rendered = pd.DataFrame([_dataframe_row(self.endpoints[position]) for position in fresh.tolist()],
+                                        index=fresh, columns=rows.columns)
+                rows = pd.concat([rows, rendered]).sort_index()
+            self.dataframe = rows.reset_index(drop=True)
+        if "bm25_index" in built:
+            self.bm25_index = previous.bm25_index.updated(self.endpoints, carried)
+        if "name_index" in built:
+            self.name_index = previous.name_index.updated(self.endpoints, carried)
+        if "keyword_index" in built:
+            self.keyword_index = previous.keyword_index.updated(self.nodes, self._carried_nodes(previous, carried))
+
+    def _carried_nodes(self, previous: "EndpointIndex", carried: np.ndarray) -> np.ndarray:
+        """Carried positions of the nodes, from those of the endpoints; folders are matched by id and names."""
+        old_endpoints = np.fromiter((isinstance(node, EndpointRecord) for node in previous.nodes), dtype=bool,
+                                    count=len(previous.nodes))
+        new_endpoints = np.fromiter((isinstance(node, EndpointRecord) for node in self.nodes), dtype=bool,
+                                    count=len(self.nodes))
+        carried_nodes = np.full(len(self.nodes), -1, dtype=np.int64)
+        kept = np.flatnonzero(carried >= 0)
+        carried_nodes[np.flatnonzero(new_endpoints)[kept]] = np.flatnonzero(old_endpoints)[carried[kept]]
+        old_folders = {_folder_key(previous.nodes[position]): position
+                       for position in np.flatnonzero(~old_endpoints).tolist()}
+        for position in np.flatnonzero(~new_endpoints).tolist():
+            carried_nodes[position] = old_folders.get(_folder_key(self.nodes[position]), -1)
+        return carried_positions(carried_nodes)
+
+    def adopt_search_structures(self, other: "EndpointIndex"):
+        """
+        Take over the DataFrame and search structures built for `other`, another copy of the same
+        version (e.g. the in-memory one its snapshot was written from), reading this copy's records.
+        """
+        if "dataframe" in other.__dict__:
+            self.dataframe = other.dataframe
+        for structure in SEARCH_STRUCTURES:
+            if structure in other.__dict__:
+                adopted = copy.copy(other.__dict__[structure])
+                # The keyword index covers folders too
+                if structure == "keyword_index":
+                    adopted.nodes = self.nodes
+                else:
+                    adopted.endpoints = self.endpoints
+                setattr(self, structure, adopted)
+
+
+def _folder_key(folder: "FolderRecord") -> Tuple[str, str, str]:
+    """What identifies a folder to the keyword index across versions: its id and names."""
+    return folder.folder_id, folder.name, folder.full_name
+
+
+def _dataframe_row(endpoint: EndpointRecord) -> Dict[str, Any]:
+    return {
+        'endpoint_name': endpoint.name,
+        'endpoint_description': endpoint.description,
+        'endpoint_method': endpoint.method,
+        'endpoint_url': endpoint.raw_url,
+        'endpoint_headers': list(endpoint.headers),
+        'endpoint_body': endpoint.body,
+        'parent_folder': endpoint.parent_folder,
+    }
+
+
+@dataclass
+class IndexDiff:
+    """Endpoint ids that differ between two versions of a collection."""
+    added: List[str]
+    changed: List[str]
+    removed: List[str]
+    unchanged: List[str]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.removed)} removed, {len(self.unchanged)} unchanged")
+
+
+def diff_indexes(old: EndpointIndex, new: EndpointIndex) -> IndexDiff:
+    """Compare two versions of a collection endpoint by endpoint, using the item digests."""
+    old_digests = {endpoint.endpoint_id: endpoint.digest for endpoint in old.endpoints}
+    diff = IndexDiff([], [], [], [])
+    for endpoint in new.endpoints:
+        previous = old_digests.pop(endpoint.endpoint_id, None)
+        if previous is None:
+            diff.added.append(endpoint.endpoint_id)
+        elif previous != endpoint.digest:
+            diff.changed.append(endpoint.endpoint_id)
+        else:
+            diff.unchanged.append(endpoint.endpoint_id)
+    diff.removed = list(old_digests)
+    return diff
+
+
+class IndexBuilder:
+    """
+    Accumulates records in tree order and assigns each node its position and a unique id.
+    """
+
+    def __init__(self, sink: Optional[Callable[[EndpointRecord], None]] = None):
+        # With a sink (e.g. a snapshot writer), endpoints are handed over instead of being kept here
+        self.sink = sink
+        self.endpoints: List[EndpointRecord] = []
+        self.folders: List[FolderRecord] = []
+        self._order = 0
+        self._seen_ids: Dict[str, int] = {}
+        self.folder_renames: List[FolderRename] = []
+
+    def _unique_id(self, candidate: str) -> str:
+        count = self._seen_ids.get(candidate, 0)
+        self._seen_ids[candidate] = count + 1
+        return candidate if count == 0 else f"{candidate}#{count + 1}"
+
+    def next_order(self) -> int:
+        position = self._order
+        self._order += 1
+        return position
+
+    def add_endpoint(self, item: Dict[str, Any], order: int, parent_folder: str,
+                     folder_ids: Tuple[str, ...], full_name: str) -> EndpointRecord:
+        endpoint_id = self._unique_id(item.get("id") or full_name)
+        record = compile_endpoint(item, order, parent_folder, folder_ids, full_name, endpoint_id)
+        if self.sink is not None:
+            self.sink(record)
+        else:
+            self.endpoints.append(record)
+        return record
+
+    def add_folder(self, item: Dict[str, Any], order: int, parent_folder: str,
+                   folder_ids: Tuple[str, ...], full_name: str) -> FolderRecord:
+        record = FolderRecord(
+            folder_id=self._unique_id(item.get("id") or full_name),
+            order=order,
+            name=item.get("name", ""),
+            full_name=full_name,
+            parent_folder=parent_folder,
+            folder_ids=folder_ids,
+        )
+        self.folders.append(record)
+        return record
+
+    def reassign_folder_id(self, folder: FolderRecord, item_id: str) -> FolderRecord:
+        """
+        Give a folder added under its full name the id compile_collection assigns it, for a folder
+        whose "id" was read after its children had been streamed. Call it when the folder's item
+        is complete. Records kept here are updated; the rename is also recorded in `folder_renames`
+        for endpoints already handed to the sink.
+        """
+        # Released, as the full name was only taken for want of an id
+        self._seen_ids[folder.full_name] -= 1
+        renamed = replace(folder, folder_id=self._unique_id(item_id))
+        rename = (folder.order + 1, self._order - 1, len(folder.folder_ids), renamed.folder_id)
+        self.folder_renames.append(rename)
+        self.folders = [renamed if record is folder else _renamed(record, rename) for record in self.folders]
+        self.endpoints = [_renamed(record, rename) for record in self.endpoints]
+        return renamed
+
+    def build(self, info: Dict[str, Any]) -> EndpointIndex:
+        # An item that is both a request and a folder may be finished after its children
+        endpoints = sorted(self.endpoints, key=lambda endpoint: endpoint.order)
+        return EndpointIndex(info, endpoints, self.folders)
+
+
+def _renamed(record, rename: FolderRename):
+    """Endpoint or folder record with a folder rename applied, if it is a descendant of that folder."""
+    first, last, depth, folder_id = rename
+    if first <= record.order <= last:
+        return replace(record, folder_ids=replace_folder_id(record.folder_ids, depth, folder_id))
+    return record
+
+
+def walk_items(builder: IndexBuilder, items: List[Dict[str, Any]], parent_folder: str = "",
+               folder_ids: Tuple[str, ...] = ()) -> Iterator[EndpointRecord]:
+    """Add an in-memory item tree to the builder, yielding endpoints as they are compiled."""
+    for item in items:
+        name = item.get("name", "")
+        full_name = f"{parent_folder}/{name}" if parent_folder else name
+        order = builder.next_order()
+
+        if "request" in item:
+            yield builder.add_endpoint(item, order, parent_folder, folder_ids, full_name)
+
+        if "item" in item:
+            folder = builder.add_folder(item, order, parent_folder, folder_ids, full_name)
+            yield from walk_items(builder, item["item"], full_name, folder_ids + (folder.folder_id,))
+
+
+def compile_collection(collection_data: Dict[str, Any]) -> EndpointIndex:
+    """Walk the collection tree once and build its EndpointIndex."""
+    builder = IndexBuilder()
+    for _ in walk_items(builder, collection_data.get("item", [])):
+        pass
+    return builder.build(collection_data.get("info", {}))
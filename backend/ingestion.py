@@ -0,0 +1,125 @@
+"""
+Background RAG ingestion of loaded collections.
+
+Loading a collection only parses and indexes it; embedding its endpoints into
+the vector store is queued here and runs on a worker thread, so structural
+tools answer as soon as parsing completes. Each collection has at most one
+current job, whose progress (documents embedded so far, out of how many) is
+exposed to tools and the API while it runs. Batches are written to the vector
+store as they are embedded, so semantic search can answer from the subset that
+is already ingested before the job finishes.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from backend.config import RAG_INGESTION_CONFIG
+from backend.workspace import LoadedCollection
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+# ingest(loaded, progress) -> result message, as ingest_endpoints_to_rag
+IngestFunction = Callable[..., str]
+
+
+@dataclass
+class IngestionJob:
+    """One ingestion of a collection version, identified by the collection's fingerprint when submitted."""
+    collection: LoadedCollection
+    fingerprint: Optional[str]
+    state: str = PENDING
+    embedded: int = 0
+    to_embed: Optional[int] = None      # known once the first batch is written; unchanged documents are not counted
+    message: str = ""
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    future: Optional[Future] = None
+    _finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def progress(self, done: int, total: int):
+        self.embedded, self.to_embed = done, total
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes or `timeout` seconds pass; returns whether it finished."""
+        return self._finished.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        return {
+            "state": self.state,
+            "embedded": self.embedded,
+            "to_embed": self.to_embed,
+            "seconds": round(end - self.started_at, 2) if self.started_at else 0.0,
+            "message": self.message,
+        }
+
+
+class IngestionQueue:
+    """Runs ingestion jobs on a small thread pool and keeps the latest job of every collection by name."""
+
+    def __init__(self, ingest: IngestFunction, max_workers: Optional[int] = None):
+        self.ingest = ingest
+        self.max_workers = max_workers or RAG_INGESTION_CONFIG["workers"]
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, loaded: LoadedCollection) -> IngestionJob:
+        """
+        Queue ingestion of a collection, unless a job for this very collection version is already
+        queued, running or done. A job still queued for an older version is cancelled.
+        """
+        with self._lock:
+            current = self._jobs.get(loaded.name)
+            if current is not None and current.collection is loaded and current.fingerprint == loaded.fingerprint \
+                    and current.state != FAILED:
+                return current
+            if current is not None and current.future is not None and current.future.cancel():
+                current.state, current.message = FAILED, "Superseded by a newer version of the collection."
+                current._finished.set()
+
+            job = IngestionJob(collection=loaded, fingerprint=loaded.fingerprint)
+            self._jobs[loaded.name] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rag-ingest")
+            job.future = self._executor.submit(self._run, job)
+            return job
+
+    def _run(self, job: IngestionJob):
+        loaded = job.collection
+        job.state, job.started_at = RUNNING, time.time()
+        print(f"[ingestion] Ingesting '{loaded.name}' in the background")
+        try:
+            job.message = self.ingest(loaded, progress=job.progress)
+            job.state = DONE if loaded.loaded_to_rag else FAILED
+        except Exception as e:
+            job.state, job.message = FAILED, f"Error during ingestion: {str(e)}"
+        finally:
+            job.finished_at = time.time()
+            job._finished.set()
+        print(f"[ingestion] '{loaded.name}' {job.state} in {job.finished_at - job.started_at:.2f}s: {job.message}")
+
+        # The collection changed on disk while it was being ingested: catch the vectors up
+        if job.state == DONE and loaded.fingerprint != job.fingerprint:
+            self.submit(loaded)
+
+    def job(self, loaded: LoadedCollection) -> Optional[IngestionJob]:
+        """The latest job of this collection, if it was submitted for this collection object."""
+        with self._lock:
+            job = self._jobs.get(loaded.name)
+        return job if job is not None and job.collection is loaded else None
+
+    def status(self, loaded: LoadedCollection) -> Dict[str, Any]:
+        """Ingestion status of a collection, for tools and the API."""
+        job = self.job(loaded)
+        if job is not None:
+            return job.status()
+        return {"state": DONE if loaded.loaded_to_rag else "not_started", "embedded": 0, "to_embed": None,
+                "seconds": 0.0, "message": ""}
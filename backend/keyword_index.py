@@ -0,0 +1,517 @@
+"""
+Trigram inverted index over the text fields matched by keyword search.
+
+Every searchable field of every node (name, URL, header keys and values, raw
+body, response examples) is a document. Its distinct character trigrams are
+posted once when the index is built; a query then only scores the documents
+that share enough trigrams with the keyword to possibly reach the threshold.
+Short keywords and low thresholds admit no such bound and score every document.
+When the collection file changes, only the nodes that changed are indexed again.
+"""
+import heapq
+import math
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from backend.config import KEYWORD_SEARCH_CONFIG
+from backend.index import EndpointRecord
+from backend.postings import merge_postings, runs
+
+FIELD_NAME, FIELD_URL, FIELD_HEADER_KEY, FIELD_HEADER_VALUE, FIELD_BODY, FIELD_RESPONSE = range(6)
+ALL_FIELDS = range(6)
+LIGHT_FIELDS = (FIELD_NAME, FIELD_URL, FIELD_HEADER_KEY, FIELD_HEADER_VALUE)   # resident; payload texts are not
+
+_SEPARATOR = 0x1FFFFF           # above every code point
+_CHUNK_CHARS = 4 * 1024 * 1024  # short texts indexed per vectorized step while building
+_LONG_TEXT_CHARS = 4096         # texts at least this long are indexed one by one
+_SCORE_BATCH = 4096             # documents per cdist call in top-k search, between cutoff updates
+
+
+def trigram_codes(text: str) -> np.ndarray:
+    """Every trigram of a text, in order, packed into one integer per trigram (21 bits per code point)."""
+    points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    return (points[:-2] << 42) | (points[1:-1] << 21) | points[2:]
+
+
+def _trigram_pairs(texts: List[str], first_doc: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct (trigram code, document id) pairs of consecutive documents, computed in one vectorized pass."""
+    lengths = np.asarray([len(text) for text in texts], dtype=np.int64)
+    # One separator between texts, replaced by a value no code point takes so no trigram spans two documents
+    points = np.frombuffer("\0".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    points[np.cumsum(lengths + 1)[:-1] - 1] = _SEPARATOR
+    doc_of_point = np.repeat(np.arange(first_doc, first_doc + len(texts), dtype=np.int32), lengths + 1)[:len(points)]
+
+    codes = (points[:-2] << 42) | (points[1:-1] << 21) | points[2:]
+    valid = (points[:-2] != _SEPARATOR) & (points[1:-1] != _SEPARATOR) & (points[2:] != _SEPARATOR)
+    codes, docs = codes[valid], doc_of_point[:-2][valid]
+    # Stable, so repeats of a trigram within a document end up next to each other
+    order = np.argsort(codes, kind="stable")
+    codes, docs = codes[order], docs[order]
+    distinct = np.ones(len(codes), dtype=bool)
+    distinct[1:] = (codes[1:] != codes[:-1]) | (docs[1:] != docs[:-1])
+    return codes[distinct], docs[distinct]
+
+
+def min_shared_trigrams(keyword_length: int, threshold: float) -> int:
+    """
+    Lowest number of keyword trigram positions a text longer than the keyword must
+    contain to reach fuzz.partial_ratio >= threshold; 0 or less means no bound.
+
+    partial_ratio aligns the keyword (length k) with windows of the text of length
+    w <= k and scores 200 * M / (k + w), M being their longest common subsequence.
+    Each of the k - M keyword characters outside it breaks at most 3 keyword
+    trigrams, each of the w - M unmatched window characters at most 2, and every
+    trigram left intact occurs verbatim in the text.
+    """
+    k = keyword_length
+    bound = k - 2
+    for w in range(1, k + 1):
+        # Rounded down a little so float error never tightens the bound
+        matched = math.ceil(threshold * (k + w) / 200 - 1e-9)
+        if matched > w:
+            continue
+        bound = min(bound, (k - 2) - 3 * (k - matched) - 2 * (w - matched))
+    return bound
+
+
+class KeywordIndex:
+    """
+    Documents of an index's nodes with their lengths, and a trigram posting list:
+    `_grams` holds the distinct trigram codes sorted, `_docs[_starts[i]:_starts[i + 1]]`
+    the ids of the documents containing `_grams[i]`.
+
+    Texts of the light fields are kept as one contiguous list per field so they can be
+    scored in a single batch; payload texts stay in the snapshot and are gathered per query.
+    Documents that end up on the same search result (a header's key and value, all response
+    examples of an endpoint) share a match slot, which keeps the best of their scores.
+    Documents and slots are numbered in node order, also across `updated` versions.
+    """
+
+    def __init__(self, nodes: Sequence[Any]):
+        self.nodes = nodes
+        # Per document: node position, field, position within the field (header or response) and slot
+        self.doc_nodes = np.zeros(0, dtype=np.int64)
+        self.doc_fields = np.zeros(0, dtype=np.int64)
+        self.doc_subs = np.zeros(0, dtype=np.int64)
+        self._doc_slots = np.zeros(0, dtype=np.int64)
+        self._doc_rows = np.zeros(0, dtype=np.int64)      # row in the field's text list, -1 for payloads
+        self._node_starts = np.zeros(1, dtype=np.int64)   # first document of each node
+        # Per field: document ids in order, and the texts of the light fields
+        self._field_docs: Dict[int, np.ndarray] = {}
+        self._field_texts: Dict[int, List[str]] = {field: [] for field in LIGHT_FIELDS}
+        # Per match slot: node position, field of its first document, and sub
+        self.slots = np.zeros((0, 3), dtype=np.int64)
+        self._slot_groups = np.zeros(0, dtype=np.int64)
+        # Group of every result line seen so far; shared by the versions updated from this index
+        self._labels: Dict[str, int] = {}
+        # Documents of the (rare) groups made of several slots
+        self._shared_group_docs = np.zeros(0, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.int64)
+        self._grams = np.zeros(0, dtype=np.int64)
+        self._starts = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.doc_nodes)
+
+    @classmethod
+    def build(cls, nodes: Sequence[Any]) -> "KeywordIndex":
+        """Index the nodes (endpoints and folders) in order, one pass over their texts."""
+        index = cls(nodes)
+        doc_nodes: List[int] = []
+        doc_fields: List[int] = []
+        doc_subs: List[int] = []
+        lengths: List[int] = []
+        doc_slots: List[int] = []
+        node_starts: List[int] = []
+        # Slots rendering the same result line form one group, as the tool deduplicates by label
+        labels = index._labels
+        slots: List[Tuple[int, int, int]] = []
+        slot_groups: List[int] = []
+        pairs: List[Tuple[np.ndarray, np.ndarray]] = []
+        chunk: List[str] = []
+        chunk_start, chunk_chars = 0, 0
+        for position, node in enumerate(nodes):
+            node_starts.append(len(lengths))
+            for field, sub, text in node_documents(node):
+                merged = (field == FIELD_HEADER_VALUE or (field == FIELD_RESPONSE and sub > 0))
+                if not merged:
+                    slots.append((position, field, sub))
+                    slot_groups.append(labels.setdefault(match_label(node, field, sub), len(labels)))
+                doc_slots.append(len(slots) - 1)
+                doc_nodes.append(position)
+                doc_fields.append(field)
+                doc_subs.append(sub)
+                if field in LIGHT_FIELDS:
+                    index._field_texts[field].append(text)
+                lengths.append(len(text))
+                if len(text) >= _LONG_TEXT_CHARS:
+                    # Long texts are cheaper to deduplicate on their own; flush first to keep document order
+                    if chunk:
+                        pairs.append(_trigram_pairs(chunk, chunk_start))
+                        chunk, chunk_chars = [], 0
+                    doc = len(lengths) - 1
+                    grams = np.unique(trigram_codes(text))
+                    pairs.append((grams, np.full(len(grams), doc, dtype=np.int32)))
+                    chunk_start = doc + 1
+                    continue
+                chunk.append(text)
+                chunk_chars += len(text)
+                if chunk_chars >= _CHUNK_CHARS:
+                    pairs.append(_trigram_pairs(chunk, chunk_start))
+                    chunk_start += len(chunk)
+                    chunk, chunk_chars = [], 0
+        if chunk:
+            pairs.append(_trigram_pairs(chunk, chunk_start))
+
+        index.doc_nodes = np.asarray(doc_nodes, dtype=np.int64)
+        index.doc_fields = np.asarray(doc_fields, dtype=np.int64)
+        index.doc_subs = np.asarray(doc_subs, dtype=np.int64)
+        index._doc_slots = np.asarray(doc_slots, dtype=np.int64)
+        index._node_starts = np.asarray(node_starts + [len(lengths)], dtype=np.int64)
+        index._lengths = np.asarray(lengths, dtype=np.int64)
+        index.slots = np.asarray(slots, dtype=np.int64).reshape(-1, 3)
+        index._slot_groups = np.asarray(slot_groups, dtype=np.int64)
+        index._derive()
+        if pairs:
+            grams = np.concatenate([chunk_grams for chunk_grams, _ in pairs])
+            docs = np.concatenate([chunk_docs for _, chunk_docs in pairs])
+            # Pairs come in document order; a stable sort keeps every posting list in it
+            order = np.argsort(grams, kind="stable")
+            index._grams, starts = np.unique(grams[order], return_index=True)
+            index._starts = np.append(starts, len(order))
+            index._docs = docs[order]
+        return index
+
+    def _derive(self):
+        """Per-field document lists, text rows and shared-group documents, from the per-document arrays."""
+        self._field_docs = {field: np.flatnonzero(self.doc_fields == field) for field in ALL_FIELDS}
+        self._doc_rows = np.full(len(self), -1, dtype=np.int64)
+        for field in LIGHT_FIELDS:
+            self._doc_rows[self._field_docs[field]] = np.arange(len(self._field_docs[field]))
+        group_sizes = np.bincount(self._slot_groups, minlength=len(self._labels))
+        self._shared_group_docs = np.flatnonzero(group_sizes[self._slot_groups[self._doc_slots]] > 1)
+
+    def updated(self, nodes: Sequence[Any], carried: np.ndarray) -> "KeywordIndex":
+        """
+        This index over a new version of its nodes, where carried[i] is the position in `self.nodes`
+        of a node unchanged as nodes[i] (increasing), or -1 for a node to index afresh. Only the
+        fresh nodes are indexed; the documents, slots and postings of the others are renumbered.
+        """
+        fresh = KeywordIndex.build([nodes[position] for position in np.flatnonzero(carried < 0).tolist()])
+        index = KeywordIndex(nodes)
+        index._labels = self._labels
+        # Groups of the fresh slots, by label, among all the groups seen so far
+        fresh_groups = np.zeros(len(fresh._labels), dtype=np.int64)
+        for label, group in fresh._labels.items():
+            fresh_groups[group] = self._labels.setdefault(label, len(self._labels))
+
+        pieces: Dict[str, List[np.ndarray]] = {name: [] for name in (
+            "doc_nodes", "doc_fields", "doc_subs", "doc_slots", "node_starts", "lengths", "slots", "slot_groups")}
+        # New id of every document of this index (-1 if its node is re-indexed or gone) and of the fresh one
+        carried_docs = np.full(len(self), -1, dtype=np.int32)
+        fresh_docs = np.full(len(fresh), -1, dtype=np.int32)
+        doc_count, slot_count = 0, 0
+        for is_carried, first, position, length in runs(carried):
+            source = self if is_carried else fresh
+            first_doc, end_doc = source._node_starts[first], source._node_starts[first + length]
+            first_slot = source._doc_slots[first_doc]
+            end_slot = source._doc_slots[end_doc] if end_doc < len(source) else len(source.slots)
+            node_shift, doc_shift, slot_shift = position - first, doc_count - first_doc, slot_count - first_slot
+
+            pieces["doc_nodes"].append(source.doc_nodes[first_doc:end_doc] + node_shift)
+            pieces["doc_fields"].append(source.doc_fields[first_doc:end_doc])
+            pieces["doc_subs"].append(source.doc_subs[first_doc:end_doc])
+            pieces["doc_slots"].append(source._doc_slots[first_doc:end_doc] + slot_shift)
+            pieces["node_starts"].append(source._node_starts[first:first + length] + doc_shift)
+            pieces["lengths"].append(source._lengths[first_doc:end_doc])
+            slots = source.slots[first_slot:end_slot].copy()
+            slots[:, 0] += node_shift
+            pieces["slots"].append(slots)
+            groups = source._slot_groups[first_slot:end_slot]
+            pieces["slot_groups"].append(groups if is_carried else fresh_groups[groups])
+            for field in LIGHT_FIELDS:
+                first_row, end_row = np.searchsorted(source._field_docs[field], (first_doc, end_doc))
+                index._field_texts[field].extend(source._field_texts[field][first_row:end_row])
+            doc_map = carried_docs if is_carried else fresh_docs
+            doc_map[first_doc:end_doc] = np.arange(doc_count, doc_count + end_doc - first_doc)
+            doc_count += end_doc - first_doc
+            slot_count += end_slot - first_slot
+
+        def joined(name: str, empty: np.ndarray) -> np.ndarray:
+            return np.concatenate(pieces[name]) if pieces[name] else empty
+
+        index.doc_nodes = joined("doc_nodes", index.doc_nodes)
+        index.doc_fields = joined("doc_fields", index.doc_fields)
+        index.doc_subs = joined("doc_subs", index.doc_subs)
+        index._doc_slots = joined("doc_slots", index._doc_slots)
+        index._node_starts = np.append(joined("node_starts", np.zeros(0, dtype=np.int64)), doc_count)
+        index._lengths = joined("lengths", index._lengths)
+        index.slots = joined("slots", index.slots)
+        index._slot_groups = joined("slot_groups", index._slot_groups)
+        index._derive()
+
+        grams, counts, index._docs, _ = merge_postings(
+            self._grams, self._starts, self._docs, (), carried_docs,
+            np.repeat(fresh._grams, np.diff(fresh._starts)), fresh_docs[fresh._docs], ())
+        present = counts > 0
+        index._grams = grams[present]
+        index._starts = np.concatenate(([0], np.cumsum(counts[present])))
+        return index
+
+    def _postings(self, code: int) -> Optional[np.ndarray]:
+        i = np.searchsorted(self._grams, code)
+        if i == len(self._grams) or self._grams[i] != code:
+            return None
+        return self._docs[self._starts[i]:self._starts[i + 1]]
+
+    def candidates(self, keyword: str, threshold: float) -> Optional[np.ndarray]:
+        """
+        Ids of the documents that can score at least `threshold` against the keyword,
+        in document order; None when the keyword is too short or the threshold too low to prune.
+        """
+        needed = min_shared_trigrams(len(keyword), threshold)
+        if needed <= 0:
+            return None
+        shared = np.zeros(len(self), dtype=np.int64)
+        codes, multiplicities = np.unique(trigram_codes(keyword), return_counts=True)
+        for code, multiplicity in zip(codes, multiplicities):
+            docs = self._postings(code)
+            if docs is not None:
+                shared[docs] += multiplicity
+        # Texts no longer than the keyword are aligned the other way round and are always kept
+        return np.flatnonzero((shared >= needed) | (self._lengths <= len(keyword)))
+
+    def _field_batch(self, field: int, candidates: Optional[np.ndarray]) -> Tuple[np.ndarray, List[str]]:
+        """Document ids and texts of one light field, restricted to the candidates."""
+        docs, texts = self._field_docs[field], self._field_texts[field]
+        if candidates is None:
+            return docs, texts
+        rows = np.flatnonzero(np.isin(docs, candidates, assume_unique=True))
+        return docs[rows], [texts[row] for row in rows]
+
+    def _texts(self, docs: Sequence[int]) -> List[str]:
+        """Texts of the given documents; payload texts are decoded from the snapshot."""
+        texts = []
+        cached_position, cached_texts = -1, None
+        docs = np.asarray(docs, dtype=np.int64)
+        for field, row, position, sub in zip(self.doc_fields[docs].tolist(), self._doc_rows[docs].tolist(),
+                                             self.doc_nodes[docs].tolist(), self.doc_subs[docs].tolist()):
+            if field in LIGHT_FIELDS:
+                texts.append(self._field_texts[field][row])
+                continue
+            # A node's body and response texts come out of the snapshot together; decode them once
+            if position != cached_position:
+                cached_position, cached_texts = position, self.nodes[position].search_texts()
+            texts.append(cached_texts[0] if field == FIELD_BODY else cached_texts[1][sub])
+        return texts
+
+    def _payload_batch(self, candidates: Optional[np.ndarray]) -> Tuple[np.ndarray, List[str]]:
+        """Document ids and texts of the payload fields."""
+        docs = np.union1d(self._field_docs[FIELD_BODY], self._field_docs[FIELD_RESPONSE])
+        if candidates is not None:
+            docs = np.intersect1d(docs, candidates, assume_unique=True)
+        return docs, self._texts(docs)
+
+    def search(self, keyword: str, threshold: float) -> List[Tuple[Any, int, int, float]]:
+        """
+        (node, field, sub, score) of every match slot whose best document scores at least
+        `threshold` under fuzz.partial_ratio, in slot order. Each field is scored in one
+        batched rapidfuzz call across KEYWORD_SEARCH_CONFIG["workers"] threads.
+        """
+        best = self._slot_scores(keyword, threshold)
+        matches = []
+        for slot in np.flatnonzero(best >= threshold):
+            position, field, sub = self.slots[slot].tolist()
+            matches.append((self.nodes[position], field, sub, float(best[slot])))
+        return matches
+
+    def top_endpoints(self, keyword: str, threshold: float, k: int) -> List[Tuple[EndpointRecord, float]]:
+        """The k endpoints whose best field scores highest (at least `threshold`), ties in collection order."""
+        best = self._slot_scores(keyword, threshold)
+        slots = np.flatnonzero(best >= threshold)
+        positions = self.slots[slots, 0]
+        node_best = np.full(len(self.nodes), -1.0)
+        np.maximum.at(node_best, positions, best[slots])
+
+        matched = np.asarray([position for position in np.flatnonzero(node_best >= 0)
+                              if isinstance(self.nodes[position], EndpointRecord)], dtype=np.int64)
+        ranked = matched[np.lexsort((matched, -node_best[matched]))][:k]
+        return [(self.nodes[position], float(node_best[position])) for position in ranked]
+
+    def _slot_scores(self, keyword: str, threshold: float) -> np.ndarray:
+        """Best score of every match slot, -1 for slots none of whose documents could reach `threshold`."""
+        candidates = self.candidates(keyword, threshold)
+        batches = [self._field_batch(field, candidates) for field in LIGHT_FIELDS]
+        batches.append(self._payload_batch(candidates))
+
+        best = np.full(len(self.slots), -1.0)
+        for docs, texts in batches:
+            if not texts:
+                continue
+            np.maximum.at(best, self._doc_slots[docs], self._score(keyword, texts, threshold))
+        return best
+
+    def _score(self, keyword: str, texts: List[str], cutoff: float) -> np.ndarray:
+        # cdist compares against the cutoff in reduced precision and can drop a score equal to it;
+        # callers filter exactly, so a slightly lower cutoff only lets a few more scores through
+        cutoff = max(cutoff - 1e-3, 0)
+        # Texts go on the rows: rapidfuzz spreads rows, not columns, across its workers
+        return process.cdist(texts, [keyword], scorer=fuzz.partial_ratio, score_cutoff=cutoff,
+                             dtype=np.float64, workers=KEYWORD_SEARCH_CONFIG["workers"])[:, 0]
+
+    def top_matches(self, keyword: str, threshold: float, k: int) -> List[Tuple[str, float]]:
+        """
+        The k best distinct result lines as (label, score), best first and ties in collection
+        order: the head of the full ranking of search(), in memory proportional to k.
+
+        Documents are scored in batches whose score_cutoff rises to the k-th best score so far,
+        and the trigram shortlist is recomputed as it rises. Exact occurrences of the keyword
+        score 100 and are collected first; k of them settle the result without fuzzy scoring.
+        """
+        top = _TopK(k)
+        done = np.zeros(len(self), dtype=bool)
+
+        def offer(docs: np.ndarray, scores: np.ndarray):
+            # One offer per group: its best score and its first matching slot
+            best: Dict[int, Tuple[float, int]] = {}
+            hits = scores >= threshold
+            for slot, score in zip(self._doc_slots[docs[hits]].tolist(), scores[hits].tolist()):
+                group = int(self._slot_groups[slot])
+                entry = best.get(group)
+                best[group] = (score, slot) if entry is None else (max(score, entry[0]), min(slot, entry[1]))
+            for group, (score, slot) in best.items():
+                top.offer(group, slot, score)
+            done[docs] = True
+
+        # A label shared by several slots ranks at its first match, so those are never pruned
+        shared = self._shared_group_docs
+        if len(shared):
+            offer(shared, self._score(keyword, self._texts(shared), threshold))
+
+        exact = self.candidates(keyword, 100) if keyword else None
+        if exact is not None:
+            exact = exact[~done[exact]]
+            texts = self._texts(exact)
+            hits = [i for i, text in enumerate(texts)
+                    if text and (keyword in text if len(text) >= len(keyword) else text in keyword)]
+            offer(exact[hits], np.full(len(hits), 100.0))
+            if top.settled:
+                return top.ranked(self)
+
+        for field in ALL_FIELDS:
+            docs = self._field_docs[field]
+            docs = docs[~done[docs]]
+            shortlist_cutoff, shortlist = None, None
+            for start in range(0, len(docs), _SCORE_BATCH):
+                cutoff = top.cutoff(threshold)
+                if cutoff != shortlist_cutoff:
+                    shortlist_cutoff, shortlist = cutoff, self.candidates(keyword, cutoff)
+                batch = docs[start:start + _SCORE_BATCH]
+                if shortlist is not None:
+                    batch = batch[np.isin(batch, shortlist, assume_unique=True)]
+                if len(batch):
+                    offer(batch, self._score(keyword, self._texts(batch), cutoff))
+                # Only once every exact occurrence is known can a later 100 not rank ahead
+                if exact is not None and top.settled:
+                    return top.ranked(self)
+        return top.ranked(self)
+
+
+class _TopK:
+    """
+    Bounded min-heap of the k best groups, keyed by (score, -position) so that the root is
+    the entry the next better candidate evicts.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, int]] = []
+        self._entries: Dict[int, Tuple[float, int]] = {}   # group -> (score, position)
+
+    @property
+    def full(self) -> bool:
+        return len(self._heap) >= self.k
+
+    @property
+    def settled(self) -> bool:
+        """Nothing left can displace an entry: k perfect scores, all ranked ahead of later ties."""
+        return self.full and self._heap[0][0] >= 100
+
+    def cutoff(self, threshold: float) -> float:
+        return max(threshold, self._heap[0][0]) if self.full else threshold
+
+    def offer(self, group: int, position: int, score: float):
+        entry = self._entries.get(group)
+        if entry is not None:
+            # Same result line again: keep its best score and its first position
+            if score <= entry[0] and position >= entry[1]:
+                return
+            self._entries[group] = (max(score, entry[0]), min(position, entry[1]))
+            self._heap = [(s, -p, g) for g, (s, p) in self._entries.items()]
+            heapq.heapify(self._heap)
+            return
+        key = (score, -position, group)
+        if not self.full:
+            heapq.heappush(self._heap, key)
+        elif key[:2] > self._heap[0][:2]:
+            del self._entries[heapq.heapreplace(self._heap, key)[2]]
+        else:
+            return
+        self._entries[group] = (score, position)
+
+    def ranked(self, index: KeywordIndex) -> List[Tuple[str, float]]:
+        ranked = sorted(self._entries.values(), key=lambda entry: (-entry[0], entry[1]))
+        results = []
+        for score, slot in ranked:
+            position, field, sub = index.slots[slot].tolist()
+            results.append((match_label(index.nodes[position], field, sub), score))
+        return results
+
+
+def match_label(node: Any, field: int, sub: int) -> str:
+    """Result line of search_endpoints_by_keyword for a match slot, without its score."""
+    full_name = node.full_name.lower()
+    if field == FIELD_NAME:
+        if isinstance(node, EndpointRecord):
+            return f"{node.method} - {full_name}"
+        return f"Folder: {full_name}"
+
+    method = node.method or 'UNKNOWN'
+    if field == FIELD_URL:
+        return f"{method} {node.raw_url.lower()} - {full_name}"
+    if field == FIELD_HEADER_KEY:
+        # The header's key and value share this slot, scored with the better of the two
+        return f"{method} {full_name} - Header: {node.headers[sub].get('key', '')}"
+    if field == FIELD_BODY:
+        return f"{method} {full_name} - Found in request body"
+    return f"{full_name} - Found in response example"
+
+
+def field_text(node: Any, field: int, sub: int) -> str:
+    """Lowercased text of one light field of a node."""
+    if field == FIELD_NAME:
+        return node.name.lower()
+    if field == FIELD_URL:
+        return node.raw_url.lower()
+    if field == FIELD_HEADER_KEY:
+        return node.headers[sub].get("key", "").lower()
+    return str(node.headers[sub].get("value", "")).lower()
+
+
+def node_documents(node: Any) -> Iterator[Tuple[int, int, str]]:
+    """(field, sub, text) of every searchable field of a node, in keyword search order."""
+    yield FIELD_NAME, 0, node.name.lower()
+    if not isinstance(node, EndpointRecord):
+        return
+    yield FIELD_URL, 0, field_text(node, FIELD_URL, 0)
+    for i in range(len(node.headers)):
+        yield FIELD_HEADER_KEY, i, field_text(node, FIELD_HEADER_KEY, i)
+        yield FIELD_HEADER_VALUE, i, field_text(node, FIELD_HEADER_VALUE, i)
+    body_text, response_texts = node.search_texts()
+    if body_text:
+        yield FIELD_BODY, 0, body_text
+    for i, response_text in enumerate(response_texts):
+        yield FIELD_RESPONSE, i, response_text
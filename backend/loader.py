@@ -0,0 +1,382 @@
+"""
+Streaming, bounded-memory loader for large Postman Collection files.
+
+The collection is parsed incrementally: folder arrays are walked token by
+token and only one item (request, body and response examples) is decoded at a
+time, so the raw collection tree is never held in memory as a whole.
+"""
+import codecs
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from backend.config import SNAPSHOT_CONFIG, STREAMING_LOAD_CONFIG
+from backend.index import EndpointIndex, EndpointRecord, FolderRecord, IndexBuilder, compile_collection, walk_items
+from backend.snapshot import SnapshotWriter, fingerprint_file, load_snapshot, save_snapshot
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@dataclass
+class LoadStats:
+    """Throughput and memory figures for a single streaming load."""
+    bytes_read: int = 0
+    seconds: float = 0.0
+    endpoints: int = 0
+    peak_traced_bytes: Optional[int] = None   # peak Python heap during this load (tracemalloc)
+    peak_rss_bytes: Optional[int] = None      # process-wide high-water mark reported by the OS
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes_read / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        mb = 1024 * 1024
+        text = (f"Parsed {self.bytes_read / mb:.1f} MB and {self.endpoints} endpoints in {self.seconds:.2f}s "
+                f"({self.bytes_per_sec / mb:.1f} MB/s)")
+        if self.peak_traced_bytes is not None:
+            text += f", peak traced memory {self.peak_traced_bytes / mb:.1f} MB"
+        if self.peak_rss_bytes is not None:
+            text += f", peak process RSS {self.peak_rss_bytes / mb:.1f} MB"
+        return text
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _JSONStream:
+    """
+    Minimal pull parser over a UTF-8 JSON file.
+
+    Containers we want to stream through are walked with iter_object/iter_array;
+    any other value is decoded in one go with json.JSONDecoder.raw_decode.
+    """
+
+    def __init__(self, raw_file, chunk_size: int):
+        self._file = raw_file
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Append at least one chunk (or min_size bytes) to the buffer; False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(max(self._chunk_size, min_size))
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self._eof = True
+        text = self._decoder.decode(chunk, final=self._eof)
+        # Drop the consumed prefix so the buffer only holds the value being parsed
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of JSON input", self._buf, self._pos)
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buf, self._pos)
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Most likely a value split across chunks; grow the buffer geometrically
+                if not self._fill(len(self._buf) - self._pos):
+                    raise
+                continue
+            if end == len(self._buf) and not self._eof and not isinstance(value, (dict, list, str)):
+                # A number or literal may continue in the next chunk
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object starting at the cursor; the caller consumes each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buf, self._pos - 1)
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per element of the array starting at the cursor; the caller consumes each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buf, self._pos - 1)
+
+
+class CollectionStream:
+    """
+    Iterate over the endpoints of a collection file while it is being parsed.
+
+    Top-level members other than "item" (info, variables, auth, ...) are kept in
+    `header`; endpoints are compiled into `builder` and yielded one by one.
+    With a `sink`, compiled endpoints are handed to it instead of being kept.
+
+    A folder's children are streamed as soon as its name is known. If its "id"
+    only follows them, the children were compiled under the folder's full name;
+    the builder then re-identifies the folder (see `folder_renames`), so the built
+    index matches compile_collection's while yielded records keep the old id.
+    """
+
+    def __init__(self, file_path: str, chunk_size: Optional[int] = None, trace_memory: Optional[bool] = None,
+                 sink: Optional[Callable[[EndpointRecord], None]] = None):
+        self.file_path = file_path
+        self.chunk_size = chunk_size or STREAMING_LOAD_CONFIG["chunk_size"]
+        self.trace_memory = STREAMING_LOAD_CONFIG["trace_memory"] if trace_memory is None else trace_memory
+        self.builder = IndexBuilder(sink=sink)
+        self.header: Dict[str, Any] = {}
+        self.stats = LoadStats()
+
+    def __iter__(self) -> Iterator[EndpointRecord]:
+        started_tracing = False
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+        start = time.perf_counter()
+        try:
+            with open(self.file_path, "rb") as f:
+                stream = _JSONStream(f, self.chunk_size)
+                try:
+                    for key in stream.iter_object():
+                        if key == "item" and stream.peek() == "[":
+                            for record in self._iter_items(stream, "", ()):
+                                self.stats.endpoints += 1
+                                yield record
+                        else:
+                            self.header[key] = stream.read_value()
+                finally:
+                    self.stats.bytes_read = stream.bytes_read
+        finally:
+            self.stats.seconds = time.perf_counter() - start
+            if self.trace_memory:
+                self.stats.peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stats.peak_rss_bytes = _peak_rss_bytes()
+
+    def _iter_items(self, stream: _JSONStream, parent_folder: str,
+                    folder_ids: Tuple[str, ...]) -> Iterator[EndpointRecord]:
+        for _ in stream.iter_array():
+            yield from self._iter_item(stream, parent_folder, folder_ids)
+
+    def _iter_item(self, stream: _JSONStream, parent_folder: str,
+                   folder_ids: Tuple[str, ...]) -> Iterator[EndpointRecord]:
+        order = self.builder.next_order()
+        fields: Dict[str, Any] = {}
+        folder: Optional[FolderRecord] = None
+        id_known = False
+
+        for key in stream.iter_object():
+            if key == "item" and "name" in fields and stream.peek() == "[":
+                # Folder whose name is already known: stream its children instead of decoding them
+                full_name = f"{parent_folder}/{fields['name']}" if parent_folder else fields["name"]
+                id_known = bool(fields.get("id"))
+                folder = self.builder.add_folder(fields, order, parent_folder, folder_ids, full_name)
+                yield from self._iter_items(stream, full_name, folder_ids + (folder.folder_id,))
+            else:
+                fields[key] = stream.read_value()
+
+        name = fields.get("name", "")
+        full_name = f"{parent_folder}/{name}" if parent_folder else name
+
+        if "request" in fields:
+            yield self.builder.add_endpoint(fields, order, parent_folder, folder_ids, full_name)
+
+        if folder is not None and not id_known and fields.get("id"):
+            # "id" followed the streamed children, which were compiled under the folder's full name
+            self.builder.reassign_folder_id(folder, fields["id"])
+
+        if "item" in fields and folder is None:
+            # "item" came before "name", so the subtree had to be decoded in memory
+            folder = self.builder.add_folder(fields, order, parent_folder, folder_ids, full_name)
+            yield from walk_items(self.builder, fields["item"], full_name, folder_ids + (folder.folder_id,))
+
+    def build_index(self) -> EndpointIndex:
+        """Consume the stream and return the compiled index."""
+        for _ in self:
+            pass
+        return self.builder.build(self.header.get("info", {}))
+
+
+def load_collection_streaming(file_path: str, chunk_size: Optional[int] = None,
+                              trace_memory: Optional[bool] = None) -> Tuple[EndpointIndex, Dict[str, Any], LoadStats]:
+    """
+    Parse a collection file incrementally.
+
+    Returns the compiled index, the top-level collection members except "item",
+    and the throughput / memory statistics of the load.
+    """
+    collection_stream = CollectionStream(file_path, chunk_size=chunk_size, trace_memory=trace_memory)
+    index = collection_stream.build_index()
+    return index, collection_stream.header, collection_stream.stats
+
+
+@dataclass
+class LoadResult:
+    """Outcome of loading a collection file through the snapshot cache."""
+    index: EndpointIndex
+    header: Dict[str, Any]                  # top-level collection members except "item"
+    seconds: float = 0.0
+    from_snapshot: bool = False
+    stats: Optional[LoadStats] = None       # set for streaming parses
+
+    def summary(self) -> str:
+        if self.from_snapshot:
+            text = f"Restored {len(self.index)} endpoints from snapshot in {self.seconds * 1000:.1f} ms"
+        elif self.stats is not None:
+            text = self.stats.summary()
+        else:
+            text = f"Parsed {len(self.index)} endpoints in {self.seconds:.2f}s"
+        if self.index.payload_stats is not None:
+            text += f", {self.index.payload_stats.summary()}"
+        return text
+
+
+def _stream_into_snapshot(file_path: str, fingerprint: str) -> Optional[Tuple[EndpointIndex, Dict[str, Any], LoadStats]]:
+    """
+    Stream a collection straight into its snapshot, so request bodies and response examples
+    go to disk as they are parsed, then map the result. None if the snapshot cannot be written.
+    """
+    try:
+        writer = SnapshotWriter(fingerprint)
+    except OSError as e:
+        print(f"[load_collection_file] Could not write snapshot: {str(e)}")
+        return None
+
+    collection_stream = CollectionStream(file_path, sink=writer)
+    try:
+        for _ in collection_stream:
+            pass
+    except BaseException:
+        writer.abort()
+        raise
+    try:
+        writer.finish(collection_stream.builder.folders, collection_stream.header,
+                      collection_stream.builder.folder_renames)
+    except OSError as e:
+        print(f"[load_collection_file] Could not write snapshot: {str(e)}")
+        return None
+
+    cached = load_snapshot(fingerprint)
+    if cached is None:
+        return None
+    index, header = cached
+    return index, header, collection_stream.stats
+
+
+def parse_collection_file(file_path: str, streaming: Optional[bool] = None
+                          ) -> Tuple[EndpointIndex, Dict[str, Any], Optional[LoadStats]]:
+    """
+    Compile a collection file into an in-memory index, without the snapshot cache.
+    Returns the index, the top-level collection members except "item", and the
+    statistics of a streaming parse (None for an in-memory one).
+    """
+    if streaming is None:
+        streaming = os.path.getsize(file_path) >= STREAMING_LOAD_CONFIG["auto_stream_min_bytes"]
+    if streaming:
+        return load_collection_streaming(file_path)
+    with open(file_path, "r", encoding="utf-8") as f:
+        collection_data = json.load(f)
+    index = compile_collection(collection_data)
+    header = {key: value for key, value in collection_data.items() if key != "item"}
+    return index, header, None
+
+
+def load_collection_file(file_path: str, streaming: Optional[bool] = None,
+                         fingerprint: Optional[str] = None) -> LoadResult:
+    """
+    Load a collection file, reusing its compiled snapshot when the file is unchanged.
+
+    streaming=None streams files of at least STREAMING_LOAD_CONFIG["auto_stream_min_bytes"].
+    Pass `fingerprint` when the caller has already hashed the file.
+
+    With snapshots enabled the returned index is always snapshot-backed, so endpoint
+    payloads (bodies and response examples) are decoded on access instead of staying resident.
+    """
+    start = time.perf_counter()
+    fingerprint = fingerprint or fingerprint_file(file_path)
+
+    if SNAPSHOT_CONFIG["enabled"]:
+        cached = load_snapshot(fingerprint)
+        if cached is not None:
+            index, header = cached
+            index.fingerprint = fingerprint
+            return LoadResult(index, header, time.perf_counter() - start, from_snapshot=True)
+
+    if streaming is None:
+        streaming = os.path.getsize(file_path) >= STREAMING_LOAD_CONFIG["auto_stream_min_bytes"]
+
+    if streaming and SNAPSHOT_CONFIG["enabled"]:
+        streamed = _stream_into_snapshot(file_path, fingerprint)
+        if streamed is not None:
+            index, header, stats = streamed
+            index.fingerprint = fingerprint
+            return LoadResult(index, header, time.perf_counter() - start, stats=stats)
+
+    index, header, stats = parse_collection_file(file_path, streaming)
+    if SNAPSHOT_CONFIG["enabled"]:
+        try:
+            save_snapshot(fingerprint, index, header)
+            # Swap the in-memory payloads for the mapped ones
+            cached = load_snapshot(fingerprint)
+            if cached is not None:
+                index, header = cached
+        except OSError as e:
+            print(f"[load_collection_file] Could not write snapshot: {str(e)}")
+    index.fingerprint = fingerprint
+
+    return LoadResult(index, header, time.perf_counter() - start, stats=stats)
@@ -1,10 +1,41 @@
-from fastapi import FastAPI
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Optional
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from backend.agents import agent_stream  
+from backend.bulk_load import load_all_collections
+from backend.config import BULK_LOAD_CONFIG, EMBEDDING_CONFIG, WATCHER_CONFIG
+from backend.watcher import CollectionWatcher
+from backend.tools.rag_tools import attach_persisted_vectors, background_ingestion, embedding_backend
+import backend.store as store
 
-app = FastAPI()
+
+def warm_collections():
+    """Load every collection, then attach the vectors persisted for them before the restart."""
+    load_all_collections(store.workspace)
+    for loaded in store.workspace:
+        attach_persisted_vectors(loaded)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if EMBEDDING_CONFIG["warm_on_startup"]:
+        # Load the embedding model off the request path, before the first ingestion or search needs it
+        embedding_backend.warm_in_background()
+    if BULK_LOAD_CONFIG["on_startup"]:
+        # Warm every collection in the background so the server accepts requests right away
+        threading.Thread(target=warm_collections, name="bulk-load", daemon=True).start()
+    watcher = CollectionWatcher(store.workspace) if WATCHER_CONFIG["enabled"] else None
+    if watcher is not None:
+        watcher.start()
+    yield
+    if watcher is not None:
+        watcher.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow CORS
 app.add_middleware(
@@ -18,6 +49,31 @@ app.add_middleware(
 class Query(BaseModel):
     user_input: str
 
+class BulkLoadRequest(BaseModel):
+    max_workers: Optional[int] = None
+
 @app.post("/chat/")
 async def chat(query: Query):
-    return StreamingResponse(agent_stream(query.user_input), media_type="text/event-stream")
\ No newline at end of file
+    return StreamingResponse(agent_stream(query.user_input), media_type="text/event-stream")
+
+@app.get("/collections/")
+def list_collections():
+    active = store.workspace.active
+    return [
+        {"name": loaded.name, "title": loaded.title, "endpoints": len(loaded.index), "active": loaded is active,
+         "rag_ingestion": background_ingestion.status(loaded)}
+        for loaded in store.workspace
+    ]
+
+@app.get("/collections/{name}/ingestion/")
+def ingestion_status(name: str):
+    loaded = store.workspace.get(name)
+    if loaded is None or loaded.name != name:
+        raise HTTPException(status_code=404, detail=f"Collection '{name}' is not loaded.")
+    return background_ingestion.status(loaded)
+
+@app.post("/collections/load_all/")
+def load_all(request: Optional[BulkLoadRequest] = None):
+    # Plain def: FastAPI runs it in its thread pool, the parsing itself happens in worker processes
+    report = load_all_collections(store.workspace, max_workers=request.max_workers if request else None)
+    return {**asdict(report), "summary": report.summary()}
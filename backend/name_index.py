@@ -0,0 +1,253 @@
+"""
+Name lookup structures for resolving an endpoint reference to endpoints.
+
+Exact references (endpoint id, full name, name, URL path, "METHOD path") are
+answered from hash maps. Partial names are answered from a suffix array over
+the lowercased full names, so every endpoint whose full name contains the query
+is found with two binary searches instead of a scan of the collection.
+"""
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.config import ENDPOINT_LOOKUP_CONFIG
+from backend.index import EndpointRecord
+from backend.postings import renumbering, runs
+
+# Match tiers, best first; a reference resolves to an endpoint when its best tier holds exactly one
+TIER_ID, TIER_FULL_NAME, TIER_NAME, TIER_PATH, TIER_NAME_PREFIX, TIER_WORD, TIER_SUBSTRING = range(7)
+_SEPARATOR = "\0"
+
+
+def suffix_array(codes: np.ndarray, depth: int) -> np.ndarray:
+    """
+    Start positions of the suffixes of `codes` sorted by their first `depth` symbols (prefix
+    doubling); suffixes sharing those symbols keep position order.
+    """
+    rank = np.unique(codes, return_inverse=True)[1].astype(np.int64)
+    length = 1
+    while length < depth and len(rank) > 1:
+        # The rank of a suffix and that of the suffix `length` further on, packed into one sort key
+        keys = rank * (len(rank) + 1)
+        keys[:-length] += rank[length:] + 1
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+        changed = np.ones(len(order), dtype=bool)
+        changed[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        rank[order] = np.cumsum(changed) - 1
+        length *= 2
+        if changed.all():
+            break
+    return np.argsort(rank, kind="stable").astype(np.int32)
+
+
+@dataclass
+class NameMatch:
+    """An endpoint a reference may mean, and how closely it matched (TIER_*)."""
+    endpoint: EndpointRecord
+    tier: int
+
+    def sort_key(self) -> Tuple[int, int, int]:
+        # Within a tier, the tighter match (shorter full name) first, then tree order
+        return self.tier, len(self.endpoint.full_name), self.endpoint.order
+
+
+class NameIndex:
+    """
+    Hash maps from lowercased references to endpoints (ids to positions, the others to ids), and
+    a suffix array over `_text`, the lowercased full names joined by NUL, with `_starts` the
+    offset of each name.
+    """
+
+    def __init__(self, endpoints: Sequence[EndpointRecord]):
+        self.endpoints = endpoints
+        self.by_id: Dict[str, int] = {}
+        self._exact: Tuple[Dict[str, List[str]], ...] = ({}, {}, {})   # full name, name, path -> endpoint ids
+        self._text = ""
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._suffixes = np.zeros(0, dtype=np.int32)
+
+    @classmethod
+    def build(cls, endpoints: Sequence[EndpointRecord]) -> "NameIndex":
+        index = cls(endpoints)
+        full_names = []
+        for position, endpoint in enumerate(endpoints):
+            full_names.append(endpoint.full_name.lower())
+            index.by_id[endpoint.endpoint_id] = position
+            for which, key in _exact_keys(endpoint):
+                index._exact[which].setdefault(key, []).append(endpoint.endpoint_id)
+
+        index._text = _SEPARATOR.join(full_names)
+        lengths = np.asarray([len(name) for name in full_names], dtype=np.int64)
+        index._starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1])) if len(lengths) else index._starts
+        codes = np.frombuffer(index._text.encode("utf-32-le"), dtype=np.uint32)
+        index._suffixes = suffix_array(codes, ENDPOINT_LOOKUP_CONFIG["suffix_depth"])
+        return index
+
+    def updated(self, endpoints: Sequence[EndpointRecord], carried: np.ndarray) -> "NameIndex":
+        """
+        This index over a new version of its endpoints, where carried[i] is the position in
+        `self.endpoints` of an endpoint unchanged as endpoints[i] (increasing), or -1 for an
+        endpoint to index afresh. Map entries are rewritten only for endpoints that changed, ids
+        also for those that moved, and only the suffixes whose first `suffix_depth` characters
+        changed are sorted again.
+        """
+        if not len(endpoints) or not len(self.endpoints):
+            return NameIndex.build(endpoints)
+        moved, fresh = renumbering(carried, len(self.endpoints))
+        index = NameIndex(endpoints)
+        kept = np.flatnonzero(carried >= 0)
+        replaced = np.flatnonzero(moved < 0).tolist()
+        if np.array_equal(carried[kept], kept):
+            index.by_id = dict(self.by_id)
+            for position in replaced:
+                del index.by_id[self.endpoints[position].endpoint_id]
+        else:
+            new_position = moved.tolist()
+            index.by_id = {endpoint_id: new_position[position] for endpoint_id, position in self.by_id.items()
+                           if new_position[position] >= 0}
+        # The other maps hold ids, so only the entries of replaced and fresh endpoints change
+        index._exact = tuple(dict(table) for table in self._exact)
+        for position in replaced:
+            endpoint = self.endpoints[position]
+            for which, key in _exact_keys(endpoint):
+                table = index._exact[which]
+                remaining = [endpoint_id for endpoint_id in table[key] if endpoint_id != endpoint.endpoint_id]
+                if remaining:
+                    table[key] = remaining
+                else:
+                    del table[key]
+        for position in fresh.tolist():
+            endpoint = endpoints[position]
+            index.by_id[endpoint.endpoint_id] = position
+            for which, key in _exact_keys(endpoint):
+                table = index._exact[which]
+                table[key] = table.get(key, []) + [endpoint.endpoint_id]
+
+        # Names joined in runs of consecutive carried ones, each run one slice of the old text
+        old_lengths = np.diff(np.append(self._starts, len(self._text) + 1)) - 1
+        old_ends = self._starts + old_lengths
+        lengths = np.zeros(len(endpoints), dtype=np.int64)
+        lengths[kept] = old_lengths[carried[kept]]
+        pieces = []
+        for is_carried, first, position, length in runs(carried):
+            if is_carried:
+                pieces.append(self._text[self._starts[first]:old_ends[first + length - 1]])
+            else:
+                names = [endpoints[i].full_name.lower() for i in range(position, position + length)]
+                lengths[position:position + length] = [len(name) for name in names]
+                pieces.append(_SEPARATOR.join(names))
+        index._text = _SEPARATOR.join(pieces)
+        index._starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+        ends = index._starts + lengths
+
+        # Suffixes are sorted by their first `suffix_depth` characters, which may run into the next
+        # names. Those of a carried name keep their order if that much of the text after it is the
+        # same as before; the others are sorted into place one by one.
+        depth = ENDPOINT_LOOKUP_CONFIG["suffix_depth"]
+        settled = np.zeros(len(self.endpoints), dtype=bool)
+        for is_carried, first, position, length in runs(carried):
+            if not is_carried:
+                continue
+            last = position + length - 1
+            if last == len(endpoints) - 1 and first + length == len(self.endpoints):
+                run_end = len(index._text) + depth    # the text ends right after the run, before and after
+            else:
+                run_end = ends[last]
+            names = np.arange(position, position + length)
+            settled[first:first + length] = run_end - ends[names] >= depth
+            for name in names[~settled[first:first + length]].tolist():
+                old = int(carried[name])
+                settled[old] = (index._text[ends[name]:ends[name] + depth] ==
+                                self._text[old_ends[old]:old_ends[old] + depth])
+        owners = np.repeat(np.arange(len(self.endpoints)), old_lengths + 1)[self._suffixes]
+        shift = index._starts[np.maximum(moved, 0)] - self._starts
+        suffixes = self._suffixes[settled[owners]]
+        suffixes = suffixes + shift[owners[settled[owners]]]
+
+        def key(offset: int) -> Tuple[str, int]:
+            return index._text[offset:offset + depth], offset
+
+        unsettled = np.union1d(fresh, moved[~settled & (moved >= 0)])
+        offsets = sorted((offset for position in unsettled.tolist()
+                          for offset in range(index._starts[position], min(ends[position] + 1, len(index._text)))),
+                         key=key)
+        at, low = [], 0
+        for offset in offsets:
+            low = bisect_left(suffixes, key(offset), lo=low, key=key)
+            at.append(low)
+        index._suffixes = np.insert(suffixes, at, offsets).astype(np.int32)
+        return index
+
+    def containing(self, query: str) -> List[int]:
+        """Positions of the endpoints whose lowercased full name contains `query`, in tree order."""
+        if not query or _SEPARATOR in query:
+            return []
+        depth = ENDPOINT_LOOKUP_CONFIG["suffix_depth"]
+        probe = query[:depth]
+
+        def prefix(offset: int) -> str:
+            return self._text[offset:offset + len(probe)]
+
+        low = bisect_left(self._suffixes, probe, key=prefix)
+        high = bisect_right(self._suffixes, probe, lo=low, key=prefix)
+        offsets = self._suffixes[low:high]
+        if len(query) > depth:
+            offsets = offsets[[self._text.startswith(query, offset) for offset in offsets.tolist()]]
+        positions = np.searchsorted(self._starts, offsets, side="right") - 1
+        return np.unique(positions).tolist()
+
+    def candidates(self, reference: str) -> List[NameMatch]:
+        """Every endpoint the reference may mean, best match first."""
+        query = reference.strip().lower()
+        tiers: Dict[int, int] = {}
+        if reference.strip() in self.by_id:
+            tiers[self.by_id[reference.strip()]] = TIER_ID
+        for tier, table in zip((TIER_FULL_NAME, TIER_NAME, TIER_PATH), self._exact):
+            for endpoint_id in table.get(query, ()):
+                tiers.setdefault(self.by_id[endpoint_id], tier)
+
+        # Partial matches only when nothing matched exactly; they would all rank below it anyway
+        if not tiers:
+            for position in self.containing(query):
+                endpoint = self.endpoints[position]
+                if endpoint.name.lower().startswith(query):
+                    tiers[position] = TIER_NAME_PREFIX
+                elif _at_word_start(endpoint.full_name.lower(), query):
+                    tiers[position] = TIER_WORD
+                else:
+                    tiers[position] = TIER_SUBSTRING
+
+        ranked = [NameMatch(self.endpoints[position], tier) for position, tier in tiers.items()]
+        return sorted(ranked, key=NameMatch.sort_key)
+
+    def resolve(self, reference: str) -> Tuple[List[NameMatch], bool]:
+        """
+        Ranked candidates for a reference, and whether the first one is unambiguous: the only
+        candidate in the best tier that matched.
+        """
+        ranked = self.candidates(reference)
+        unique = bool(ranked) and (len(ranked) == 1 or ranked[1].tier > ranked[0].tier)
+        return ranked, unique
+
+
+def _exact_keys(endpoint: EndpointRecord) -> Iterator[Tuple[int, str]]:
+    """(map, key) of an endpoint's entries in the full name (0), name (1) and path (2) maps."""
+    yield 0, endpoint.full_name.lower()
+    yield 1, endpoint.name.lower()
+    path = endpoint.path.lower()
+    if path:
+        yield 2, path
+        yield 2, f"{endpoint.method.lower()} {path}"
+
+
+def _at_word_start(text: str, query: str) -> bool:
+    """Whether `query` occurs in `text` right after a separator (or at its start)."""
+    start = text.find(query)
+    while start != -1:
+        if start == 0 or not text[start - 1].isalnum():
+            return True
+        start = text.find(query, start + 1)
+    return False
@@ -0,0 +1,130 @@
+"""
+Incremental updates of the posting lists behind the keyword and BM25 indexes.
+
+A posting list holds, for each key (a trigram code or a term id) in ascending
+order, the documents containing it as one slice of a flat array. When a
+collection file changes, the postings of the re-indexed documents are dropped,
+every other document is renumbered, and the postings of the new versions are
+merged in at their place, so no list is sorted again.
+"""
+from bisect import bisect_left
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+
+def by_doc(docs: np.ndarray, values: Sequence[np.ndarray]) -> np.ndarray:
+    """Order of postings listed by ascending document id."""
+    return docs
+
+
+def merge_postings(keys: np.ndarray, starts: np.ndarray, docs: np.ndarray, values: Sequence[np.ndarray],
+                   doc_map: np.ndarray, new_keys: np.ndarray, new_docs: np.ndarray,
+                   new_values: Sequence[np.ndarray],
+                   order: Callable[[np.ndarray, Sequence[np.ndarray]], np.ndarray] = by_doc
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[np.ndarray]]:
+    """
+    Posting lists of `keys` (sorted, the postings of keys[i] at starts[i]:starts[i + 1] of `docs`
+    and of each array of `values`) with every document renumbered through `doc_map`, which must
+    preserve their order (-1 drops a document's postings), and the new postings merged in.
+
+    `order(docs, values)` gives sortable keys for the order of the postings within a key; new
+    postings already use new document ids. Returns the keys, the number of postings of each
+    (keys left without postings stay, with 0), the documents and the values.
+    """
+    docs = doc_map[docs]
+    counts = np.diff(starts)
+    gone = np.flatnonzero(docs < 0)
+    if len(gone):
+        counts = counts - np.bincount(np.searchsorted(starts, gone, side="right") - 1, minlength=len(keys))
+        docs = np.delete(docs, gone)
+        values = [np.delete(column, gone) for column in values]
+    starts = np.concatenate(([0], np.cumsum(counts)))
+
+    new_order = order(new_docs, new_values)
+    ranked = np.lexsort((new_order, new_keys))
+    new_keys, new_docs, new_order = new_keys[ranked], new_docs[ranked], new_order[ranked]
+    new_values = [column[ranked] for column in new_values]
+    # Postings of a key not seen before go where its slice will start, before the next key's
+    slots = np.searchsorted(keys, new_keys)
+    at = starts[slots]
+    known = np.flatnonzero(slots < len(keys))
+    known = known[keys[slots[known]] == new_keys[known]]
+    if len(known):
+        groups, firsts = np.unique(slots[known], return_index=True)
+        lasts = np.append(firsts[1:], len(known))
+        for slot, first, last in zip(groups.tolist(), firsts.tolist(), lasts.tolist()):
+            start, end = starts[slot], starts[slot + 1]
+            placed = known[first:last]
+            at[placed] += np.searchsorted(order(docs[start:end], [column[start:end] for column in values]),
+                                          new_order[placed])
+    docs = np.insert(docs, at, new_docs)
+    values = [np.insert(column, at, new_column) for column, new_column in zip(values, new_values)]
+
+    merged = np.union1d(keys, new_keys)
+    merged_counts = np.zeros(len(merged), dtype=np.int64)
+    merged_counts[np.searchsorted(merged, keys)] = counts
+    np.add.at(merged_counts, np.searchsorted(merged, new_keys), 1)
+    return merged, merged_counts, docs, values
+
+
+def renumbering(carried: np.ndarray, old_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For items of a new version, carried[i] being the position of item i in the old version (-1 for
+    items indexed afresh, positions increasing): the new position of each old item (-1 if dropped)
+    and the positions of the fresh items.
+    """
+    kept = np.flatnonzero(carried >= 0)
+    moved = np.full(old_count, -1, dtype=np.int64)
+    moved[carried[kept]] = kept
+    return moved, np.flatnonzero(carried < 0)
+
+
+def runs(carried: np.ndarray) -> List[Tuple[bool, int, int, int]]:
+    """
+    Maximal runs of new items taken in order from one source: (carried, first source position,
+    first new position, length), where the source is the old version for carried runs and the
+    fresh items, numbered in order, otherwise.
+    """
+    if not len(carried):
+        return []
+    carried_flags = carried >= 0
+    source = np.where(carried_flags, carried, np.cumsum(~carried_flags) - 1)
+    breaks = np.flatnonzero((carried_flags[1:] != carried_flags[:-1]) | (source[1:] != source[:-1] + 1)) + 1
+    firsts = np.concatenate(([0], breaks))
+    lengths = np.diff(np.append(firsts, len(carried)))
+    return [(bool(carried_flags[first]), int(source[first]), int(first), int(length))
+            for first, length in zip(firsts.tolist(), lengths.tolist())]
+
+
+def carried_positions(previous: Sequence[int]) -> np.ndarray:
+    """
+    For the items of a new version, their positions in the old version (-1 for new or changed
+    items), with the fewest items set to -1 that leaves the rest in increasing order: a longest
+    increasing subsequence, so that moving one item re-indexes that item only.
+    """
+    carried = np.array(previous, dtype=np.int64).reshape(-1)
+    found = np.flatnonzero(carried >= 0)
+    values = carried[found]
+    if np.all(values[1:] > values[:-1]):
+        return carried
+    # Patience sorting: tails[k] is the smallest last value of an increasing subsequence of length k + 1
+    tails: List[int] = []
+    tail_items: List[int] = []
+    parents = [-1] * len(values)
+    for item, value in enumerate(values.tolist()):
+        length = bisect_left(tails, value)
+        parents[item] = tail_items[length - 1] if length else -1
+        if length == len(tails):
+            tails.append(value)
+            tail_items.append(item)
+        else:
+            tails[length] = value
+            tail_items[length] = item
+    keep = np.zeros(len(values), dtype=bool)
+    item = tail_items[-1]
+    while item >= 0:
+        keep[item] = True
+        item = parents[item]
+    carried[found[~keep]] = -1
+    return carried
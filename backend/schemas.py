@@ -1,21 +1,42 @@
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
+class CollectionSelectorInput(BaseModel):
+    collection: Optional[str] = Field(None, description="Name of the loaded collection to use (file name or collection title). Defaults to the most recently loaded collection.")
+
 class LoadPostmanCollectionInput(BaseModel):
     file_path: str = Field(..., description="Path to the Postman Collection JSON file.")
+    streaming: Optional[bool] = Field(None, description="Parse the file incrementally to bound memory use. Leave empty to stream only very large files.")
 
-class RAGSearchEndpointsInput(BaseModel):
-    query: str = Field(..., description="The search query to find relevant endpoints.")
-    top_k: int = Field(5, description="Number of top results to return.")
+class RAGSearchEndpointsInput(CollectionSelectorInput):
+    query: Optional[str] = Field(None, description="The search query to find relevant endpoints.")
+    queries: Optional[List[str]] = Field(None, description="Several search queries (e.g. sub-questions) searched together in one call; results are grouped per query.")
+    top_k: int = Field(5, description="Number of top results to return (per query).")
+    methods: Optional[List[str]] = Field(None, description="Only endpoints with one of these HTTP methods, e.g. [\"POST\"].")
+    folder: Optional[str] = Field(None, description="Only endpoints in this folder (full folder path, e.g. \"Billing\" or \"Billing/Invoices\") or its subfolders.")
+    host: Optional[str] = Field(None, description="Only endpoints whose URL has this host, e.g. \"api.example.com\" or \"{{baseUrl}}\".")
+    has_body: Optional[bool] = Field(None, description="Only endpoints with (true) or without (false) a request body.")
+    status_codes: Optional[List[int]] = Field(None, description="Only endpoints with a response example having one of these status codes.")
+    wait_seconds: Optional[float] = Field(None, description="Seconds to wait for a collection that is still being ingested before answering from the endpoints ingested so far. Defaults to the server setting.")
 
-class SearchEndpointsInput(BaseModel):
+class SearchEndpointsInput(CollectionSelectorInput):
     keyword: str = Field(..., description="Keyword to search within endpoints.")
     threshold: int = Field(60, description="Similarity threshold (0-100) for fuzzy matching. Default is 60.")
     max_results: int = Field(20, description="Maximum number of results to return. Default is 20.")
 
-class EndpointDetailsInput(BaseModel):
-    endpoint_name: str = Field(..., description="Name of the endpoint to get details for.")
+class LexicalSearchInput(CollectionSelectorInput):
+    query: str = Field(..., description="Keywords to look up, e.g. 'refund' or 'webhook signature'.")
+    max_results: int = Field(10, description="Maximum number of results to return. Default is 10.")
+
+class HybridSearchInput(CollectionSelectorInput):
+    query: str = Field(..., description="Keyword, endpoint name or natural language description of what to find.")
+    max_results: int = Field(10, description="Maximum number of results to return. Default is 10.")
+    threshold: int = Field(60, description="Similarity threshold (0-100) for the fuzzy matches. Default is 60.")
+
+class EndpointDetailsInput(CollectionSelectorInput):
+    endpoint_name: str = Field(..., description="Name of the endpoint to get details for: its full name (Folder/Endpoint), name, URL path, or part of its name.")
 
-class DataframeAnalyzerInput(BaseModel):
+class DataframeAnalyzerInput(CollectionSelectorInput):
     query: str = Field(..., description="The user query in natural language text format.") 
 
 class SoftwareEngineerInput(BaseModel):
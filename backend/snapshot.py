@@ -0,0 +1,401 @@
+"""
+On-disk snapshot cache of compiled collections.
+
+Snapshots are keyed by an xxhash fingerprint of the collection file, so an
+unchanged file is never parsed twice. A snapshot is a single binary file that
+is memory-mapped on load: the offsets tables are read in place and endpoint
+records are decoded only when a tool touches them, which keeps repeat loads in
+the millisecond range and lets several processes share the same pages.
+
+Request bodies and response examples are stored apart from the light record
+fields and stay encoded in the mapping; they are decoded on every access and
+never become resident with the index. Large payloads are zstd-compressed with
+a dictionary trained on the collection's own payloads. Keyword search reads a
+precomputed, lowercased text of each payload instead of decompressing it.
+
+Layout (little-endian):
+    header    magic(8s) version(I) endpoint_count(I) records_start(Q) offsets_start(Q)
+              spans_start(Q) dictionary_offset(Q) dictionary_length(Q) meta_offset(Q) meta_length(Q)
+    payloads  per endpoint a tag byte (0 plain, 1 zstd) and its orjson [body, responses] array,
+              interleaved with an orjson [body_text, response_texts] search text array
+    dict      zstd dictionary of the collection, empty if none was trained
+    records   one orjson array per endpoint, light EndpointRecord fields in order
+    offsets   (endpoint_count + 1) x uint64, relative to records_start
+    spans     endpoint_count x (payload start, payload end, text start, text end) uint64, absolute
+    meta      orjson object: collection header, folders, precomputed aggregates and payload stats
+"""
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import xxhash
+import zstandard
+
+from backend.config import PAYLOAD_COMPRESSION_CONFIG, SNAPSHOT_CONFIG
+from backend.index import (EndpointIndex, EndpointRecord, FolderRecord, FolderRename, payload_search_texts,
+                           replace_folder_id)
+
+MAGIC = b"PMSNAP04"
+FORMAT_VERSION = 4
+_HEADER = struct.Struct("<8sIIQQQQQQQ")
+_OFFSET = struct.Struct("<Q")
+_SPAN_WIDTH = 4
+_PLAIN_PAYLOAD = b"\0"
+_ZSTD_PAYLOAD = b"\1"
+
+# Any change to the record layout invalidates existing snapshots
+_ENDPOINT_FIELDS = [field.name for field in fields(EndpointRecord) if field.name != "payload"]
+_FOLDER_FIELDS = [field.name for field in fields(FolderRecord)]
+_TUPLE_FIELDS = {"folder_ids", "headers", "query"}
+_TUPLE_POSITIONS = [i for i, name in enumerate(_ENDPOINT_FIELDS) if name in _TUPLE_FIELDS]
+_FOLDER_IDS_POSITION = _ENDPOINT_FIELDS.index("folder_ids")
+_LAYOUT_TAG = xxhash.xxh3_64_hexdigest(f"{FORMAT_VERSION}:{','.join(_ENDPOINT_FIELDS)}".encode())
+
+
+@dataclass
+class PayloadStats:
+    """Size of a collection's request bodies and response examples before and after compression."""
+    raw_bytes: int = 0              # encoded JSON, as held before compression
+    stored_bytes: int = 0           # as stored in the snapshot
+    dictionary_bytes: int = 0
+    compressed: int = 0             # payloads stored zstd-compressed
+
+    @property
+    def ratio(self) -> float:
+        stored = self.stored_bytes + self.dictionary_bytes
+        return self.raw_bytes / stored if stored else 1.0
+
+    def summary(self) -> str:
+        mb = 1024 * 1024
+        return (f"payloads {self.raw_bytes / mb:.1f} MB -> {(self.stored_bytes + self.dictionary_bytes) / mb:.1f} MB "
+                f"({self.ratio:.1f}x, {self.compressed} zstd-compressed)")
+
+
+def fingerprint_file(file_path: str, chunk_size: int = 4 * 1024 * 1024) -> str:
+    """Content fingerprint of a collection file."""
+    digest = xxhash.xxh3_128()
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_path(fingerprint: str) -> str:
+    return os.path.join(SNAPSHOT_CONFIG["directory"], f"{fingerprint}.{_LAYOUT_TAG}.snap")
+
+
+class PayloadStore:
+    """Payloads and search texts of a mapped snapshot, decompressed on demand."""
+
+    def __init__(self, buffer: mmap.mmap, count: int, spans_start: int, dictionary: bytes):
+        self._buffer = buffer
+        self._spans = memoryview(buffer)[spans_start:spans_start + _SPAN_WIDTH * count * _OFFSET.size].cast("Q")
+        self._dictionary = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        # Decompression contexts must not be used by two threads at once
+        self._local = threading.local()
+
+    def _decompressor(self) -> zstandard.ZstdDecompressor:
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            decompressor = self._local.decompressor = zstandard.ZstdDecompressor(dict_data=self._dictionary)
+        return decompressor
+
+    def payload(self, i: int) -> Tuple[Dict[str, Any], Tuple[Dict[str, Any], ...]]:
+        start, end = self._spans[_SPAN_WIDTH * i], self._spans[_SPAN_WIDTH * i + 1]
+        data = self._buffer[start + 1:end]
+        if self._buffer[start:start + 1] == _ZSTD_PAYLOAD:
+            data = self._decompressor().decompress(data)
+        body, responses = orjson.loads(data)
+        return body, tuple(responses)
+
+    def search_texts(self, i: int) -> Tuple[str, Tuple[str, ...]]:
+        start, end = self._spans[_SPAN_WIDTH * i + 2], self._spans[_SPAN_WIDTH * i + 3]
+        body_text, response_texts = orjson.loads(self._buffer[start:end])
+        return body_text, tuple(response_texts)
+
+
+class MappedPayload:
+    """Request body and response examples of an endpoint, kept encoded in the snapshot mapping."""
+    __slots__ = ("_store", "_position")
+
+    def __init__(self, store: PayloadStore, position: int):
+        self._store = store
+        self._position = position
+
+    def load(self) -> Tuple[Dict[str, Any], Tuple[Dict[str, Any], ...]]:
+        return self._store.payload(self._position)
+
+    def search_texts(self) -> Tuple[str, Tuple[str, ...]]:
+        return self._store.search_texts(self._position)
+
+
+class MappedEndpoints(Sequence):
+    """Read-only sequence of EndpointRecords decoded on first access from a memory-mapped snapshot."""
+
+    def __init__(self, buffer: mmap.mmap, count: int, records_start: int, offsets_start: int, payloads: PayloadStore):
+        self._buffer = buffer
+        self._count = count
+        self._offsets = memoryview(buffer)[offsets_start:offsets_start + (count + 1) * _OFFSET.size].cast("Q")
+        self._records_start = records_start
+        self._payloads = payloads
+        self._decoded: List[Optional[EndpointRecord]] = [None] * count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _decode(self, i: int) -> EndpointRecord:
+        record = self._decoded[i]
+        if record is None:
+            start = self._records_start + self._offsets[i]
+            end = self._records_start + self._offsets[i + 1]
+            values = orjson.loads(self._buffer[start:end])
+            for position in _TUPLE_POSITIONS:
+                values[position] = tuple(values[position])
+            record = self._decoded[i] = EndpointRecord(*values, payload=MappedPayload(self._payloads, i))
+        return record
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._decode(j) for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("endpoint index out of range")
+        return self._decode(i)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._decode(i)
+
+
+class SnapshotWriter:
+    """
+    Writes a snapshot in a single pass. Used as an IndexBuilder sink, each endpoint's
+    payload goes to disk as soon as it is compiled, so bodies and response examples
+    are never all resident at once. Only the first payloads are buffered, to train
+    the collection's zstd dictionary (see PAYLOAD_COMPRESSION_CONFIG).
+    """
+
+    def __init__(self, fingerprint: str):
+        self.directory = SNAPSHOT_CONFIG["directory"]
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = snapshot_path(fingerprint)
+        fd, self._tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(b"\0" * _HEADER.size)
+        self._position = _HEADER.size
+        # [order, light record blob, payload start, payload end, text start, text end]
+        self._entries: List[List[Any]] = []
+        self._method_counts: Counter = Counter()
+        self._folder_counts: Counter = Counter()
+        self.stats = PayloadStats()
+        # Payloads held back until the dictionary is trained
+        self._training = PAYLOAD_COMPRESSION_CONFIG["enabled"]
+        self._pending: List[Tuple[List[Any], bytes]] = []
+        self._pending_bytes = 0
+        self._compressor: Optional[zstandard.ZstdCompressor] = None
+        self._dictionary = b""
+
+    def __call__(self, endpoint: EndpointRecord):
+        self.add(endpoint)
+
+    def _write(self, data: bytes) -> Tuple[int, int]:
+        start = self._position
+        self._file.write(data)
+        self._position += len(data)
+        return start, self._position
+
+    def add(self, endpoint: EndpointRecord):
+        body, responses = endpoint.load_payload()
+        payload = orjson.dumps([body, responses])
+        blob = orjson.dumps([getattr(endpoint, name) for name in _ENDPOINT_FIELDS])
+        entry = [endpoint.order, blob, 0, 0, *self._write(orjson.dumps(payload_search_texts(body, responses)))]
+        self._entries.append(entry)
+        self._method_counts[endpoint.method] += 1
+        self._folder_counts[endpoint.parent_folder or "Root"] += 1
+        self.stats.raw_bytes += len(payload)
+
+        if not self._training:
+            self._store_payload(entry, payload)
+            return
+        self._pending.append((entry, payload))
+        self._pending_bytes += len(payload)
+        if (len(self._pending) >= PAYLOAD_COMPRESSION_CONFIG["dictionary_samples"]
+                or self._pending_bytes >= PAYLOAD_COMPRESSION_CONFIG["dictionary_sample_bytes"]):
+            self._train()
+
+    def _train(self):
+        """Train the dictionary on the buffered payloads, then write them out."""
+        config = PAYLOAD_COMPRESSION_CONFIG
+        samples = [payload for _, payload in self._pending if len(payload) >= config["min_bytes"]]
+        # zstd wants roughly ten times more sample data than dictionary
+        size = min(config["dictionary_size"], sum(len(sample) for sample in samples) // 10)
+        dictionary = None
+        if size >= 1024:
+            try:
+                dictionary = zstandard.train_dictionary(size, samples)
+            except zstandard.ZstdError as e:
+                print(f"[SnapshotWriter] Compressing without a dictionary: {str(e)}")
+        self._dictionary = dictionary.as_bytes() if dictionary is not None else b""
+        self.stats.dictionary_bytes = len(self._dictionary)
+        self._compressor = zstandard.ZstdCompressor(level=config["level"], dict_data=dictionary)
+
+        self._training = False
+        for entry, payload in self._pending:
+            self._store_payload(entry, payload)
+        self._pending = []
+        self._pending_bytes = 0
+
+    def _store_payload(self, entry: List[Any], payload: bytes):
+        stored = _PLAIN_PAYLOAD + payload
+        if self._compressor is not None and len(payload) >= PAYLOAD_COMPRESSION_CONFIG["min_bytes"]:
+            compressed = _ZSTD_PAYLOAD + self._compressor.compress(payload)
+            if len(compressed) < len(stored):
+                stored = compressed
+                self.stats.compressed += 1
+        entry[2], entry[3] = self._write(stored)
+        self.stats.stored_bytes += len(stored)
+
+    def _rename_folders(self, renames: Sequence[FolderRename]):
+        # Endpoints added before an enclosing folder's "id" was read carry the folder's provisional id
+        for entry in self._entries:
+            values = None
+            for first, last, depth, folder_id in renames:
+                if first <= entry[0] <= last:
+                    values = values or orjson.loads(entry[1])
+                    values[_FOLDER_IDS_POSITION] = replace_folder_id(tuple(values[_FOLDER_IDS_POSITION]), depth, folder_id)
+            if values is not None:
+                entry[1] = orjson.dumps(values)
+
+    def finish(self, folders: Sequence[FolderRecord], header: Dict[str, Any],
+               folder_renames: Sequence[FolderRename] = ()) -> str:
+        """
+        Write records, tables and meta, then move the snapshot into place atomically.
+        `folder_renames` are applied to the endpoints already added (see IndexBuilder.reassign_folder_id).
+        """
+        try:
+            if self._training:
+                self._train()
+            if folder_renames:
+                self._rename_folders(folder_renames)
+            dictionary_offset, _ = self._write(self._dictionary)
+
+            # An item that is both a request and a folder may be finished after its children
+            self._entries.sort(key=lambda entry: entry[0])
+            records_start = self._position
+            offsets = [0]
+            spans: List[int] = []
+            for _, blob, *entry_spans in self._entries:
+                self._write(blob)
+                offsets.append(offsets[-1] + len(blob))
+                spans += entry_spans
+            offsets_start, _ = self._write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            spans_start, _ = self._write(struct.pack(f"<{len(spans)}Q", *spans))
+
+            meta = orjson.dumps({
+                "header": header,
+                "folders": [[getattr(folder, name) for name in _FOLDER_FIELDS] for folder in folders],
+                "method_counts": dict(self._method_counts),
+                "folder_counts": dict(self._folder_counts),
+                "payload_stats": asdict(self.stats),
+            })
+            meta_offset, _ = self._write(meta)
+
+            self._file.seek(0)
+            self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(self._entries), records_start,
+                                          offsets_start, spans_start, dictionary_offset, len(self._dictionary),
+                                          meta_offset, len(meta)))
+            self._file.close()
+            # Readers never see a partial snapshot
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self.abort()
+            raise
+
+        _evict_old_snapshots(self.directory, keep=self.path)
+        return self.path
+
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+def save_snapshot(fingerprint: str, index: EndpointIndex, header: Dict[str, Any]) -> str:
+    """Write the compiled index to the snapshot cache and return the snapshot path."""
+    writer = SnapshotWriter(fingerprint)
+    try:
+        for endpoint in index.endpoints:
+            writer.add(endpoint)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish(index.folders, header)
+
+
+def load_snapshot(fingerprint: str) -> Optional[Tuple[EndpointIndex, Dict[str, Any]]]:
+    """Memory-map the snapshot for a fingerprint; None if there is no usable snapshot."""
+    path = snapshot_path(fingerprint)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, count, records_start, offsets_start, spans_start,
+         dictionary_offset, dictionary_length, meta_offset, meta_length) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            print(f"[load_snapshot] Ignoring incompatible snapshot: {path}")
+            return None
+        meta = orjson.loads(buffer[meta_offset:meta_offset + meta_length])
+        payloads = PayloadStore(buffer, count, spans_start,
+                                buffer[dictionary_offset:dictionary_offset + dictionary_length])
+    except (OSError, ValueError, struct.error, zstandard.ZstdError) as e:
+        print(f"[load_snapshot] Ignoring unreadable snapshot {path}: {str(e)}")
+        return None
+
+    # Refresh the mtime so eviction keeps recently used snapshots
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    endpoints = MappedEndpoints(buffer, count, records_start, offsets_start, payloads)
+    folders = [FolderRecord(*values[:-1], tuple(values[-1])) for values in meta["folders"]]
+    header = meta["header"]
+    index = EndpointIndex(header.get("info", {}), endpoints, folders)
+    index.method_counts = meta["method_counts"]
+    index.folder_counts = meta["folder_counts"]
+    index.payload_stats = PayloadStats(**meta["payload_stats"])
+    return index, header
+
+
+def _evict_old_snapshots(directory: str, keep: str):
+    """Keep at most SNAPSHOT_CONFIG['max_snapshots'] snapshots, dropping the least recently used."""
+    snapshots = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".snap")]
+    excess = len(snapshots) - SNAPSHOT_CONFIG["max_snapshots"]
+    if excess <= 0:
+        return
+    snapshots.sort(key=os.path.getmtime)
+    for path in snapshots:
+        if excess <= 0:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            excess -= 1
+        except OSError:
+            # Still mapped by another process on Windows; try again next time
+            pass
@@ -1,14 +1,16 @@
 """
 Module to store shared state between different parts of the application.
 """
+from backend.details import DetailCache
+from backend.workspace import CollectionRegistry
 
-# Shared state variables
-collection_data = None
-collection_df = None 
-
-# ChromaDB-related variables
-chroma_client = None
-chroma_collection = None
-collection_loaded_to_rag = False
+# Rendered get_endpoint_details documents, dropped whenever their collection is reloaded or cleared
+detail_cache = DetailCache()
 
+# Loaded collections, addressed by name; tools default to the most recently loaded one
+workspace = CollectionRegistry(on_index_change=detail_cache.index_changed)
+# Identical collections loaded under two names share their documents until neither serves them
+detail_cache.fingerprint_in_use = workspace.serves
 
+# Vector store behind RAG ingestion and search (backend/vector_store.py), opened on first ingestion
+vector_store = None
@@ -1,192 +1,412 @@
 from typing import List, Dict, Any, Optional
-import os
+import re
 import json
-from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-import chromadb
-from chromadb import PersistentClient
-import uuid
-from pathlib import Path
 from backend.schemas import RAGSearchEndpointsInput
 import backend.store as store
-from chromadb.utils import embedding_functions
-default_ef = embedding_functions.DefaultEmbeddingFunction()
+from backend.index import IndexDiff, raw_body_text
+from backend.workspace import LoadedCollection, missing_collection_message
+import xxhash
+from backend.embedding_cache import EmbeddingCache, QueryEmbeddingCache, cached, embedding_model_name
+from backend.embeddings import LazyEmbeddingFunction
+from backend.embedding_pipeline import ProgressCallback, embed_and_upsert, log_progress
+from backend.config import RAG_INGESTION_CONFIG
+from backend.ingestion import FAILED, IngestionQueue
+from backend.vector_store import open_vector_store
+# The model behind EMBEDDING_CONFIG loads on first use (or a startup warm-up), not on import
+embedding_backend = LazyEmbeddingFunction()
+# Documents and queries are both embedded through the persistent cache
+embedding_cache = EmbeddingCache()
+default_ef = cached(embedding_backend, embedding_cache)
+# Search queries also hit an in-memory LRU first
+query_embedding_cache = QueryEmbeddingCache()
 
-def initialize_chroma():
-    """Initialize the ChromaDB client and create a persistent directory if it doesn't exist."""
+def initialize_vector_store():
+    """Open the vector store VECTOR_STORE_CONFIG selects (ChromaDB or the in-process NumPy store)."""
+    store.vector_store = open_vector_store()
+    return store.vector_store
 
-    persist_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "chroma_db")
-    os.makedirs(persist_directory, exist_ok=True)
-    store.chroma_client = PersistentClient(path=persist_directory)
-    
-    return store.chroma_client
 
+def endpoint_host(url: str) -> str:
+    """Lowercased host of a request URL without scheme or path: "api.example.com:8443", "{{baseurl}}"."""
+    return re.split(r"[/?#]", url.strip().split("://", 1)[-1], maxsplit=1)[0].lower()
+
+def has_request_body(body: Any) -> bool:
+    """Whether a Postman request body has content in its mode (raw text, form fields, file, GraphQL)."""
+    return isinstance(body, dict) and bool(body.get("mode")) and bool(body.get(body["mode"]))
 
-def extract_endpoints_data(collection_data):
-    """Extract endpoint data from Postman collection for RAG indexing."""
+def extract_endpoints_data(index, endpoint_ids=None):
+    """
+    Extract endpoint data from the compiled collection index for RAG indexing.
+    Pass `endpoint_ids` to restrict the extraction to a subset of endpoints.
+    """
     endpoints_data = []
     
-    def process_items(items, parent_folder=""):
-        for item in items:
-            name = item.get("name", "")
-            full_name = f"{parent_folder}/{name}" if parent_folder else name
-            
-            if "request" in item:
-                # This is an endpoint
-                request = item["request"]
-                method = request.get("method", "")
-                url = request.get("url", {})
-                
-                # Extract URL
-                formatted_url = ""
-                if isinstance(url, dict):
-                    if "raw" in url:
-                        formatted_url = url["raw"]
-                    else:
-                        host = url.get("host", [])
-                        if isinstance(host, list):
-                            host = ".".join(host)
-                        path = url.get("path", [])
-                        if path:
-                            path = "/" + "/".join(path)
-                            formatted_url = f"{host}{path}"
-                else:
-                    formatted_url = str(url)
-                
-                # Extract description from item
-                description = item.get("description", "")
-                
-                # Extract query parameters
-                query_params = []
-                if isinstance(url, dict) and "query" in url:
-                    for param in url["query"]:
-                        param_desc = f"{param.get('key', '')}: {param.get('description', '')}"
-                        query_params.append(param_desc)
-                
-                # Extract headers
-                headers = []
-                for header in request.get("header", []):
-                    header_desc = f"{header.get('key', '')}: {header.get('description', '')}"
-                    headers.append(header_desc)
-                
-                # Extract body if available
-                body_text = ""
-                body = request.get("body", {})
-                if body and isinstance(body, dict):
-                    mode = body.get("mode", "")
-                    if mode == "raw":
-                        body_text = body.get("raw", "")[:200]  # Truncate to avoid too much text
-                
-                comprehensive_description = f"Method: {method}\nURL: {formatted_url}\n"
-                if description:
-                    comprehensive_description += f"Description: {description}\n"
-                if query_params:
-                    comprehensive_description += f"Query Parameters: {', '.join(query_params)}\n"
-                if headers:
-                    comprehensive_description += f"Headers: {', '.join(headers)}\n"
-                if body_text:
-                    comprehensive_description += f"Body Preview: {body_text}\n"
-                
-                endpoint_data = {
-                    "id": str(uuid.uuid4()),
-                    "name": full_name,
-                    "method": method,
-                    "url": formatted_url,
-                    "description": comprehensive_description
-                }
-                
-                endpoints_data.append(endpoint_data)
-            
-            if "item" in item:
-                process_items(item["item"], full_name)
+    for endpoint in index.endpoints:
+        if endpoint_ids is not None and endpoint.endpoint_id not in endpoint_ids:
+            continue
+
+        body, responses = endpoint.load_payload()
+
+        # Extract query parameters
+        query_params = [f"{param.get('key', '')}: {param.get('description', '')}" for param in endpoint.query]
+        
+        # Extract headers
+        headers = [f"{header.get('key', '')}: {header.get('description', '')}" for header in endpoint.headers]
+        
+        # Extract body if available
+        body_text = raw_body_text(body)[:200]  # Truncate to avoid too much text
+        
+        comprehensive_description = f"Method: {endpoint.method}\nURL: {endpoint.url}\n"
+        if endpoint.description:
+            comprehensive_description += f"Description: {endpoint.description}\n"
+        if query_params:
+            comprehensive_description += f"Query Parameters: {', '.join(query_params)}\n"
+        if headers:
+            comprehensive_description += f"Headers: {', '.join(headers)}\n"
+        if body_text:
+            comprehensive_description += f"Body Preview: {body_text}\n"
+        
+        endpoints_data.append({
+            "id": endpoint.endpoint_id,
+            "name": endpoint.full_name,
+            "method": endpoint.method,
+            "url": endpoint.url,
+            "description": comprehensive_description,
+            "folder": endpoint.parent_folder,
+            "host": endpoint_host(endpoint.url),
+            "has_body": has_request_body(body),
+            "status_codes": sorted({int(response["code"]) for response in responses
+                                    if isinstance(response, dict) and str(response.get("code", "")).isdigit()}),
+        })
     
-    process_items(collection_data.get("item", []))
     return endpoints_data
 
-def ingest_endpoints_to_rag() -> str:
+def _to_chroma_records(endpoints_data):
     """
-    Ingest endpoints from the loaded Postman collection into the RAG system.
-    This creates embeddings for endpoint names and descriptions and stores them in ChromaDB.
+    Shape extracted endpoint data as ChromaDB ids / documents / metadatas. Ids are the stable
+    endpoint ids; each metadata carries the content hash of what gets embedded. Metadata values
+    must be scalars, so each status code of the response examples is a `status_<code>` flag.
     """
-    if not store.collection_data:
-        return "No collection loaded. Please load a collection first using the load_postman_collection tool."
+    ids = []
+    documents = []
+    metadatas = []
+
+    for endpoint in endpoints_data:
+        document = f"{endpoint['name']}\n{endpoint['description']}"
+        metadata = {
+            "name": endpoint["name"],
+            "method": endpoint["method"],
+            "url": endpoint["url"],
+            "folder": endpoint["folder"],
+            "host": endpoint["host"],
+            "has_body": endpoint["has_body"],
+        }
+        for code in endpoint["status_codes"]:
+            metadata[f"status_{code}"] = True
+        metadata["content_hash"] = xxhash.xxh3_64_hexdigest(json.dumps([document, metadata], sort_keys=True).encode())
+        ids.append(endpoint["id"])
+        documents.append(document)
+        metadatas.append(metadata)
+
+    return {"ids": ids, "documents": documents, "metadatas": metadatas}
 
+def build_where(loaded: LoadedCollection, methods: Optional[List[str]] = None, folder: Optional[str] = None,
+                host: Optional[str] = None, has_body: Optional[bool] = None,
+                status_codes: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Vector store where clause for the metadata filters of a semantic search, or None without filters.
+    A folder matches itself and every folder nested in it; it is resolved against the collection's
+    folders to their exact names, since the vector store compares values exactly. Raises ValueError
+    when no folder matches.
+    """
+    clauses = []
+    if methods:
+        clauses.append({"method": {"$in": [method.strip().upper() for method in methods]}})
+    if folder and folder.strip("/ "):
+        prefix = folder.strip("/ ").lower()
+        folders = sorted({record.full_name for record in loaded.index.folders
+                          if record.full_name.lower() == prefix or record.full_name.lower().startswith(prefix + "/")})
+        if not folders:
+            raise ValueError(f"No folder of '{loaded.name}' is named '{folder}'.")
+        clauses.append({"folder": {"$in": folders}})
+    if host:
+        clauses.append({"host": endpoint_host(host)})
+    if has_body is not None:
+        clauses.append({"has_body": has_body})
+    if status_codes:
+        codes = [{f"status_{int(code)}": True} for code in dict.fromkeys(status_codes)]
+        clauses.append(codes[0] if len(codes) == 1 else {"$or": codes})
+
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+def _select_records(records, ids):
+    """The subset of chroma records whose id is in `ids`, in their original order."""
+    keep = [i for i, record_id in enumerate(records["ids"]) if record_id in ids]
+    return {key: [values[i] for i in keep] for key, values in records.items()}
+
+# Bumped whenever the documents or metadata built for an endpoint change, so stored vectors stop matching
+_RECORD_FORMAT = 2
+
+def vectors_fingerprint(loaded: LoadedCollection) -> Optional[str]:
+    """
+    Identity of the vectors a collection version gets: its source file fingerprint, the embedding
+    model and the record format. Stored in the vector collection's metadata once ingestion completes.
+    """
+    if loaded.fingerprint is None:
+        return None
+    return f"{loaded.fingerprint}:{embedding_model_name(default_ef)}:{_RECORD_FORMAT}"
+
+def _set_vectors_fingerprint(collection, fingerprint: str):
+    # Chroma rejects hnsw:* keys in modify(); they live on in the collection's configuration
+    metadata = {key: value for key, value in (collection.metadata or {}).items() if not key.startswith("hnsw:")}
+    metadata["source_fingerprint"] = fingerprint
+    collection.modify(metadata=metadata)
+    store.vector_store.persist(collection)
+
+def attach_persisted_vectors(loaded: LoadedCollection) -> bool:
+    """
+    Reuse the vectors persisted for this exact collection version, embedding model and record
+    format, without reading or re-embedding any endpoint. Returns whether they were attached.
+    """
+    fingerprint = vectors_fingerprint(loaded)
+    if loaded.loaded_to_rag or fingerprint is None:
+        return loaded.loaded_to_rag
     try:
-        if store.chroma_client is None:
-            store.chroma_client = initialize_chroma()
+        if store.vector_store is None:
+            store.vector_store = initialize_vector_store()
+        collection = store.vector_store.get_or_create_collection(
+            name=loaded.vector_collection_name, embedding_function=default_ef)
+        if (collection.metadata or {}).get("source_fingerprint") != fingerprint or collection.count() == 0:
+            return False
+    except Exception as e:
+        print(f"[attach_persisted_vectors] Could not open the persisted vectors: {str(e)}")
+        return False
+
+    loaded.vector_collection = collection
+    loaded.loaded_to_rag = True
+    print(f"[attach_persisted_vectors] Attached {collection.count()} persisted vectors to '{loaded.name}'")
+    return True
 
-        collection_name = store.collection_data.get("info", {}).get("name", "postman_collection")
-        collection_name = collection_name.replace(" ", "_").lower()
+def ingest_endpoints_to_rag(loaded: Optional[LoadedCollection] = None,
+                            progress: Optional[ProgressCallback] = None) -> str:
+    """
+    Ingest endpoints from a loaded Postman collection (the active one by default) into the RAG system.
+    This creates embeddings for endpoint names and descriptions and stores them in the vector store.
+
+    Vectors persisted for this exact collection version (see vectors_fingerprint) are reused as they
+    are. Otherwise ingestion is incremental: documents already stored under the same endpoint id and
+    content hash are skipped, so only new or changed endpoints are embedded and removed ones are deleted.
+    Those are embedded by the batched pipeline, which calls `progress(done, total)` after each
+    written batch (progress is logged when no callback is given).
+    """
+    loaded = loaded or store.workspace.active
+    if loaded is None:
+        return missing_collection_message(store.workspace)
 
-        try:
-            store.chroma_collection = store.chroma_client.get_collection(name=collection_name)
-            store.chroma_client.delete_collection(name=collection_name)
-        except Exception:
-            pass
+    try:
+        if store.vector_store is None:
+            store.vector_store = initialize_vector_store()
 
-        store.chroma_collection = store.chroma_client.create_collection(name=collection_name, embedding_function=default_ef)
+        loaded.vector_collection = store.vector_store.get_or_create_collection(
+            name=loaded.vector_collection_name, embedding_function=default_ef)
 
-        endpoints_data = extract_endpoints_data(store.collection_data)
+        fingerprint = vectors_fingerprint(loaded)
+        stored_fingerprint = (loaded.vector_collection.metadata or {}).get("source_fingerprint")
+        if fingerprint is not None and stored_fingerprint == fingerprint and loaded.vector_collection.count():
+            loaded.loaded_to_rag = True
+            return (f"Successfully ingested {loaded.vector_collection.count()} endpoints into RAG system "
+                    f"(reused the vectors persisted for this collection version).")
 
-        if not endpoints_data:
+        records = _to_chroma_records(extract_endpoints_data(loaded.index))
+        if not records["ids"]:
             return "No endpoints found in the collection to ingest."
 
-   
-        ids = []
-        documents = []
-        metadatas = []
-
-        for endpoint in endpoints_data:
-            ids.append(endpoint["id"])
-            documents.append(f"{endpoint['name']}\n{endpoint['description']}")
-            metadatas.append({
-                "name": endpoint["name"],
-                "method": endpoint["method"],
-                "url": endpoint["url"]
-            })
+        # Only metadata is read back; stored embeddings and documents stay in the vector store
+        stored = loaded.vector_collection.get(include=["metadatas"])
+        stored_hashes = {record_id: (metadata or {}).get("content_hash")
+                         for record_id, metadata in zip(stored["ids"], stored["metadatas"])}
+
+        current = set(records["ids"])
+        added = current - stored_hashes.keys()
+        updated = {record_id for record_id, metadata in zip(records["ids"], records["metadatas"])
+                   if record_id in stored_hashes and stored_hashes[record_id] != metadata["content_hash"]}
+        deleted = [record_id for record_id in stored_hashes if record_id not in current]
+        skipped = len(current) - len(added) - len(updated)
 
-        store.chroma_collection.add(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas
-        )
+        if deleted or added or updated:
+            # Unmarked while the vectors are in flux, so an interrupted ingestion is never attached as complete
+            _set_vectors_fingerprint(loaded.vector_collection, "")
+        if deleted:
+            loaded.vector_collection.delete(ids=deleted)
+        throughput = ""
+        if added or updated:
+            stats = embed_and_upsert(loaded.vector_collection, _select_records(records, added | updated), default_ef,
+                                     progress or log_progress("ingest_endpoints_to_rag"))
+            print(f"[ingest_endpoints_to_rag] Pipeline: {stats.summary()}")
+            throughput = f" Embedded {stats.documents} documents at {stats.docs_per_second:.1f} docs/s."
+        if fingerprint is not None and (deleted or added or updated or stored_fingerprint != fingerprint):
+            _set_vectors_fingerprint(loaded.vector_collection, fingerprint)
+        else:
+            store.vector_store.persist(loaded.vector_collection)
 
-        store.collection_loaded_to_rag = True
-        return f"Successfully ingested {len(endpoints_data)} endpoints into RAG system."
+        loaded.loaded_to_rag = True
+        print(f"[ingest_endpoints_to_rag] Embedding cache: {embedding_cache.stats()}")
+        return (f"Successfully ingested {len(current)} endpoints into RAG system "
+                f"({len(added)} added, {len(updated)} updated, {len(deleted)} deleted, {skipped} unchanged and skipped)."
+                f"{throughput}")
 
     except Exception as e:
         return f"Error during ingestion: {str(e)}"
 
+def update_endpoints_in_rag(loaded: LoadedCollection, diff: IndexDiff) -> str:
+    """
+    Apply an endpoint-level diff to a collection's vectors: removed endpoints are deleted and
+    only added or changed endpoints are re-embedded. Collections that were never ingested are left alone.
+    """
+    if not loaded.loaded_to_rag or loaded.vector_collection is None:
+        return "Collection is not ingested into the RAG system; nothing to update."
+
+    try:
+        _set_vectors_fingerprint(loaded.vector_collection, "")
+        if diff.removed:
+            loaded.vector_collection.delete(ids=diff.removed)
+
+        endpoints_data = extract_endpoints_data(loaded.index, set(diff.added) | set(diff.changed))
+        if endpoints_data:
+            stats = embed_and_upsert(loaded.vector_collection, _to_chroma_records(endpoints_data), default_ef,
+                                     log_progress("update_endpoints_in_rag"))
+            print(f"[update_endpoints_in_rag] Pipeline: {stats.summary()}")
+        _set_vectors_fingerprint(loaded.vector_collection, vectors_fingerprint(loaded) or "")
+
+        return f"Updated RAG system: {len(endpoints_data)} endpoints re-embedded, {len(diff.removed)} removed."
+    except Exception as e:
+        # Fall back to a full rebuild so the vectors never drift from the index
+        print(f"[update_endpoints_in_rag] Incremental update failed, re-ingesting: {str(e)}")
+        return ingest_endpoints_to_rag(loaded)
+
+# Collections are ingested on a worker thread after they load; see backend/ingestion.py
+background_ingestion = IngestionQueue(ingest_endpoints_to_rag)
+
+def ensure_ingested(loaded: LoadedCollection, wait: Optional[float] = None) -> Optional[str]:
+    """
+    Make sure a collection can be searched semantically; returns the error message when it cannot.
+    Ingestion runs in the background: this waits up to `wait` seconds (RAG_INGESTION_CONFIG's
+    search_wait_seconds by default) for it, then lets the search go ahead on the endpoints ingested
+    so far, if there are any.
+    """
+    if loaded.loaded_to_rag or attach_persisted_vectors(loaded):
+        return None
+    if not RAG_INGESTION_CONFIG["background"]:
+        result = ingest_endpoints_to_rag(loaded)
+        return None if loaded.loaded_to_rag else result
+
+    job = background_ingestion.submit(loaded)
+    job.wait(RAG_INGESTION_CONFIG["search_wait_seconds"] if wait is None else wait)
+    if loaded.loaded_to_rag:
+        return None
+    if job.state == FAILED:
+        return job.message or "Error during ingestion."
+    if loaded.vector_collection is not None and loaded.vector_collection.count() > 0:
+        return None
+    return (f"The semantic search index of '{loaded.name}' is still being built; try again shortly, "
+            f"or use keyword or lexical search meanwhile.")
+
+def ingestion_notice(loaded: LoadedCollection) -> Optional[str]:
+    """A note for search results answered while the collection is still being ingested, else None."""
+    job = background_ingestion.job(loaded)
+    if job is None or job.finished:
+        return None
+    progress = f"{job.embedded}/{job.to_embed}" if job.to_embed is not None else "0"
+    return (f"The semantic search index of '{loaded.name}' is still being built ({progress} endpoints embedded); "
+            f"these results only cover the endpoints ingested so far.")
+
+def query_vectors(loaded: LoadedCollection, queries: List[str], n_results: int, include: List[str],
+                  where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    One vector store query for several query texts, answered per query in Chroma's shape and
+    restricted to the endpoints matching `where` (see build_where). Query embeddings come from the
+    in-memory LRU; the ones not cached are embedded together in one batch.
+    """
+    embeddings = query_embedding_cache.embed(queries, default_ef)
+    if where is None:
+        return loaded.vector_collection.query(query_embeddings=embeddings, n_results=n_results, include=include)
+    return loaded.vector_collection.query(query_embeddings=embeddings, n_results=n_results, where=where, include=include)
+
+def semantic_rankings(loaded: LoadedCollection, query: str, n_results: int,
+                      wait: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    The n_results endpoints nearest to the query as {"id", "metadata", "distance"}, nearest first.
+    Raises RuntimeError when the collection cannot be ingested.
+    """
+    error = ensure_ingested(loaded, wait)
+    if error is not None:
+        raise RuntimeError(error)
+
+    results = query_vectors(loaded, [query], n_results, ['metadatas', 'distances'])
+    ids = results.get("ids", [[]])[0]
+    metadatas = results.get("metadatas", [[]])[0]
+    distances = results.get("distances", [[]])[0]
+    return [{"id": ids[i], "metadata": metadatas[i], "distance": distances[i]} for i in range(len(ids))]
+
 @tool("rag_search_endpoints", args_schema=RAGSearchEndpointsInput)
-def rag_search_endpoints(query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+def rag_search_endpoints(query: Optional[str] = None, queries: Optional[List[str]] = None, top_k: int = 10,
+                         methods: Optional[List[str]] = None, folder: Optional[str] = None, host: Optional[str] = None,
+                         has_body: Optional[bool] = None, status_codes: Optional[List[int]] = None,
+                         collection: Optional[str] = None, wait_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
     """
     Search for relevant endpoints using RAG (Retrieval Augmented Generation).
     Returns 5 ~ 10 endpoints that are semantically similar to the query, including similarity scores.
+    Pass several sub-queries in `queries` to search them all in one call; results are then grouped per query.
+    Filters (HTTP methods, folder, host, has a request body, status codes of the response examples) are
+    applied before ranking, so all top_k results match them.
+    While the collection is still being ingested, results only cover the endpoints ingested so far.
     """
-    if not store.collection_loaded_to_rag:
-        result = ingest_endpoints_to_rag()
-        if "Successfully" not in result:
-            return [{"error": result}]
+    texts = ([query] if query else []) + [text for text in queries or [] if text]
+    if not texts:
+        return [{"error": "Provide a query or a list of queries to search for."}]
+
+    loaded = store.workspace.get(collection)
+    if loaded is None:
+        return [{"error": missing_collection_message(store.workspace, collection)}]
+
+    try:
+        where = build_where(loaded, methods, folder, host, has_body, status_codes)
+    except ValueError as e:
+        return [{"error": str(e)}]
+
+    error = ensure_ingested(loaded, wait_seconds)
+    if error is not None:
+        return [{"error": error}]
     
     try:
-        results = store.chroma_collection.query(
-            query_texts=[query],
-            n_results=top_k,
-            include=['documents', 'metadatas']
-        )
-
-        formatted_results = []
-        documents = results.get("documents", [[]])[0]
-        metadatas = results.get("metadatas", [[]])[0]
-
-        for i in range(len(documents)):
-            result = {
-                "document": documents[i] if i < len(documents) else None,
-                "metadata": metadatas[i] if i < len(metadatas) else None,
-            }
-            formatted_results.append(result)
-
-        print(f"Formatted results: {formatted_results}")
+        results = query_vectors(loaded, texts, top_k, ['documents', 'metadatas'], where)
+
+        grouped_results = []
+        for position, text in enumerate(texts):
+            documents = results.get("documents", [[]] * len(texts))[position]
+            metadatas = results.get("metadatas", [[]] * len(texts))[position]
+            grouped_results.append({
+                "query": text,
+                "results": [
+                    {
+                        "document": documents[i] if i < len(documents) else None,
+                        "metadata": metadatas[i] if i < len(metadatas) else None,
+                    }
+                    for i in range(len(documents))
+                ],
+            })
+
+        print(f"[rag_search_endpoints] {len(texts)} queries; query embedding cache: {query_embedding_cache.stats()}")
+
+        # A single query keeps the flat result list
+        formatted_results = grouped_results[0]["results"] if not queries else grouped_results
+
+        notice = ingestion_notice(loaded)
+        if notice is not None:
+            formatted_results.append({"notice": notice})
 
         return formatted_results
     except Exception as e:
@@ -0,0 +1,428 @@
+"""
+Vector stores behind RAG ingestion and semantic search.
+
+A vector store hands out one collection per loaded Postman collection. Every
+collection speaks the subset of ChromaDB's collection API the RAG tools use:
+count, get, upsert (with precomputed embeddings), delete, query (texts or
+embeddings, optionally restricted by a `where` clause on metadata, answered
+with Chroma-shaped id / document / metadata / distance lists), and a
+`metadata` dict replaced through modify(). Two stores implement it, chosen by VECTOR_STORE_CONFIG["backend"]:
+
+- "chroma": a ChromaDB PersistentClient (SQLite plus an HNSW graph built with
+  the space and parameters of HNSW_CONFIG). Chroma fixes those when a
+  collection is created, so they are recorded in its metadata and a collection
+  built with other settings is dropped and recreated empty, to be re-ingested.
+- "numpy": an in-process matrix of normalized embeddings, stored as float16 or
+  int8 with a scale per row, memory-mapped from backend/data/vector_store.
+  Queries are exact: one matrix multiply over the rows, a block at a time,
+  then argpartition for the top k. A where clause is evaluated on bitmaps of
+  the rows holding each metadata value, and only the selected rows are scored.
+  Distances are reported on the scale of HNSW_CONFIG["space"], as Chroma's are.
+"""
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from chromadb import EmbeddingFunction, PersistentClient
+
+from backend.config import DATA_DIR, HNSW_CONFIG, VECTOR_STORE_CONFIG
+
+DTYPES = ("float16", "int8")
+SPACES = ("l2", "cosine", "ip")
+_QUERY_BLOCK = 1024         # rows cast to float32 and scored per matrix multiply; small enough to stay in cache
+INDEX_SETTINGS_KEY = "index_settings"      # collection metadata recording the HNSW settings it was built with
+
+
+def hnsw_metadata(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Chroma collection metadata creating its HNSW index with `config` (HNSW_CONFIG by default)."""
+    config = config or HNSW_CONFIG
+    metadata = {"hnsw:space": config["space"], "hnsw:M": config["M"],
+                "hnsw:construction_ef": config["construction_ef"], "hnsw:search_ef": config["search_ef"]}
+    # Chroma drops hnsw:* keys from the visible metadata on modify(), so the settings are also kept under a plain key
+    metadata[INDEX_SETTINGS_KEY] = ",".join(f"{key[5:]}={value}" for key, value in metadata.items())
+    return metadata
+
+
+class ChromaVectorStore:
+    """ChromaDB client; its collections are ChromaDB collections, which write through on every call."""
+
+    def __init__(self, client=None, path: Optional[str] = None, hnsw: Optional[Dict[str, Any]] = None):
+        if client is None:
+            path = path or str(DATA_DIR / "chroma_db")
+            os.makedirs(path, exist_ok=True)
+            client = PersistentClient(path=path)
+        self.client = client
+        self.metadata = hnsw_metadata(hnsw)
+
+    def get_or_create_collection(self, name: str, embedding_function: EmbeddingFunction):
+        collection = self.client.get_or_create_collection(name=name, embedding_function=embedding_function,
+                                                          metadata=self.metadata)
+        built_with = (collection.metadata or {}).get(INDEX_SETTINGS_KEY)
+        if built_with != self.metadata[INDEX_SETTINGS_KEY]:
+            print(f"[ChromaVectorStore] Rebuilding '{name}' with HNSW settings {self.metadata[INDEX_SETTINGS_KEY]} "
+                  f"(built with {built_with or 'the defaults'})")
+            self.client.delete_collection(name)
+            collection = self.client.create_collection(name=name, embedding_function=embedding_function,
+                                                       metadata=self.metadata)
+        return collection
+
+    def delete_collection(self, name: str):
+        self.client.delete_collection(name)
+
+    def persist(self, collection):
+        pass
+
+
+class NumpyVectorCollection:
+    """
+    Normalized embeddings of one collection in a (rows, dimension) matrix of `dtype`, the first
+    `_size` rows in use, with ids, documents and metadatas in row order. Queries score the
+    matrix in float32; int8 rows are scaled back by `_scales`. Distances follow Chroma's for the
+    same `space` on unit vectors: 2 - 2 * cosine similarity for "l2", 1 - cosine similarity otherwise.
+    """
+
+    def __init__(self, name: str, embedding_function: Optional[EmbeddingFunction], directory: str,
+                 dtype: str = "float16", space: Optional[str] = None):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector dtype '{dtype}', expected one of {', '.join(DTYPES)}")
+        space = space or HNSW_CONFIG["space"]
+        if space not in SPACES:
+            raise ValueError(f"Unsupported distance space '{space}', expected one of {', '.join(SPACES)}")
+        self.name = name
+        self.embedding_function = embedding_function
+        self.directory = directory
+        self.dtype = dtype
+        self.space = space
+        self.ids: List[str] = []
+        self.documents: List[Optional[str]] = []
+        self.metadatas: List[Optional[Dict[str, Any]]] = []
+        self.metadata: Dict[str, Any] = {}        # of the collection itself
+        self._rows: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._size = 0
+        self._writable = False      # False while the matrix is still the read-only memory map
+        self._dirty = False
+        self._bitmaps: Dict[str, Dict[Any, np.ndarray]] = {}    # metadata key -> value -> row mask
+        self._lock = threading.RLock()
+        self._open()
+
+    # Storage
+
+    def _paths(self) -> Dict[str, str]:
+        return {name: os.path.join(self.directory, file_name) for name, file_name in
+                (("records", "records.json"), ("vectors", "vectors.npy"), ("scales", "scales.npy"))}
+
+    def _open(self):
+        paths = self._paths()
+        if not os.path.exists(paths["records"]):
+            return
+        with open(paths["records"]) as f:
+            records = json.load(f)
+        self.ids, self.documents, self.metadatas = records["ids"], records["documents"], records["metadatas"]
+        self.metadata = records.get("metadata", {})
+        self._rows = {record_id: row for row, record_id in enumerate(self.ids)}
+        self._size = len(self.ids)
+        vectors = np.load(paths["vectors"], mmap_mode="r")
+        scales = np.load(paths["scales"]) if records["dtype"] == "int8" else None
+        if records["dtype"] == self.dtype:
+            self._vectors = vectors
+            self._scales = scales if scales is not None else self._scales
+        else:
+            # Stored with another dtype than configured: convert once, written back on the next persist
+            self._vectors, self._size = None, 0
+            self._append_rows(_dequantize(vectors, scales))
+            self._dirty = True
+
+    def persist(self):
+        """Write the collection to its directory if it changed since it was opened or last persisted."""
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            paths = self._paths()
+            _save_array(paths["vectors"], self._matrix())
+            if self.dtype == "int8":
+                _save_array(paths["scales"], self._scales[:self._size])
+            temporary = paths["records"] + ".tmp"
+            with open(temporary, "w") as f:
+                json.dump({"dtype": self.dtype, "metadata": self.metadata, "ids": self.ids,
+                           "documents": self.documents, "metadatas": self.metadatas}, f)
+            os.replace(temporary, paths["records"])
+            self._dirty = False
+
+    def _matrix(self) -> np.ndarray:
+        if self._vectors is None:
+            return np.zeros((0, 0), dtype=self.dtype)
+        return self._vectors[:self._size]
+
+    def memory_bytes(self) -> int:
+        """Bytes of the embedding matrix (and int8 scales) in use."""
+        return int(self._matrix().nbytes + (self._scales[:self._size].nbytes if self.dtype == "int8" else 0))
+
+    def _make_writable(self, dimension: int, extra_rows: int):
+        """Leave the memory map for an in-memory buffer with room for `extra_rows` more rows."""
+        needed = self._size + extra_rows
+        if self._writable and self._vectors.shape[0] >= needed:
+            return
+        capacity = max(needed, 2 * (self._vectors.shape[0] if self._writable else self._size), 64)
+        vectors = np.zeros((capacity, dimension), dtype=self.dtype)
+        scales = np.zeros(capacity, dtype=np.float32)
+        if self._vectors is not None and self._size:
+            if self._vectors.shape[1] != dimension:
+                raise ValueError(f"Embedding dimension {dimension} does not match the collection's "
+                                 f"dimension {self._vectors.shape[1]}")
+            vectors[:self._size] = self._vectors[:self._size]
+            if self.dtype == "int8":
+                scales[:self._size] = self._scales[:self._size]
+        self._vectors, self._scales, self._writable = vectors, scales, True
+
+    def _write_rows(self, rows: np.ndarray, embeddings: np.ndarray):
+        if self.dtype == "int8":
+            scales = np.abs(embeddings).max(axis=1) / 127
+            scales[scales == 0] = 1
+            self._vectors[rows] = np.round(embeddings / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+        else:
+            self._vectors[rows] = embeddings.astype(np.float16)
+
+    def _append_rows(self, embeddings: np.ndarray) -> np.ndarray:
+        self._make_writable(embeddings.shape[1], len(embeddings))
+        rows = np.arange(self._size, self._size + len(embeddings))
+        self._write_rows(rows, embeddings)
+        self._size += len(embeddings)
+        return rows
+
+    # Chroma collection API
+
+    def count(self) -> int:
+        return self._size
+
+    def modify(self, metadata: Optional[Dict[str, Any]] = None):
+        if metadata is not None:
+            with self._lock:
+                self.metadata = dict(metadata)
+                self._dirty = True
+
+    def get(self, ids: Optional[Sequence[str]] = None, include: Sequence[str] = ("metadatas", "documents")) -> Dict[str, Any]:
+        with self._lock:
+            rows = range(self._size) if ids is None else [self._rows[i] for i in ids if i in self._rows]
+            result: Dict[str, Any] = {"ids": [self.ids[row] for row in rows]}
+            for key in ("documents", "metadatas"):
+                if key in include:
+                    values = getattr(self, key)
+                    result[key] = [values[row] for row in rows]
+            return result
+
+    def upsert(self, ids: Sequence[str], documents: Optional[Sequence[str]] = None,
+               metadatas: Optional[Sequence[Dict[str, Any]]] = None, embeddings: Optional[Any] = None):
+        if not ids:
+            return
+        if embeddings is None:
+            if self.embedding_function is None or documents is None:
+                raise ValueError("upsert needs embeddings, or documents and an embedding function")
+            embeddings = self.embedding_function(list(documents))
+        embeddings = _normalized(embeddings)
+        documents = list(documents) if documents is not None else [None] * len(ids)
+        metadatas = list(metadatas) if metadatas is not None else [None] * len(ids)
+
+        with self._lock:
+            existing = [i for i, record_id in enumerate(ids) if record_id in self._rows]
+            fresh = [i for i, record_id in enumerate(ids) if record_id not in self._rows]
+            self._make_writable(embeddings.shape[1], len(fresh))
+            if existing:
+                self._write_rows(np.asarray([self._rows[ids[i]] for i in existing]), embeddings[existing])
+                for i in existing:
+                    row = self._rows[ids[i]]
+                    self.documents[row], self.metadatas[row] = documents[i], metadatas[i]
+            if fresh:
+                rows = self._append_rows(embeddings[fresh])
+                for i, row in zip(fresh, rows.tolist()):
+                    self._rows[ids[i]] = row
+                    self.ids.append(ids[i])
+                    self.documents.append(documents[i])
+                    self.metadatas.append(metadatas[i])
+            self._dirty = True
+            self._bitmaps.clear()
+
+    def delete(self, ids: Sequence[str]):
+        with self._lock:
+            rows = sorted({self._rows[i] for i in ids if i in self._rows}, reverse=True)
+            if not rows:
+                return
+            self._make_writable(self._vectors.shape[1], 0)
+            # Each deleted row takes the current last row, so the rows in use stay contiguous
+            for row in rows:
+                last = self._size - 1
+                del self._rows[self.ids[row]]
+                if row != last:
+                    self._vectors[row] = self._vectors[last]
+                    self._scales[row] = self._scales[last]
+                    self.ids[row], self.documents[row], self.metadatas[row] = \
+                        self.ids[last], self.documents[last], self.metadatas[last]
+                    self._rows[self.ids[row]] = row
+                self.ids.pop()
+                self.documents.pop()
+                self.metadatas.pop()
+                self._size -= 1
+            self._dirty = True
+            self._bitmaps.clear()
+
+    def query(self, query_texts: Optional[Sequence[str]] = None, query_embeddings: Optional[Any] = None,
+              n_results: int = 10, where: Optional[Dict[str, Any]] = None,
+              include: Sequence[str] = ("metadatas", "documents", "distances")) -> Dict[str, Any]:
+        if query_embeddings is None:
+            if self.embedding_function is None:
+                raise ValueError("query needs query_embeddings when the collection has no embedding function")
+            query_embeddings = self.embedding_function(list(query_texts))
+        queries = _normalized(query_embeddings)
+
+        with self._lock:
+            candidates = np.flatnonzero(self._where_mask(where)) if where else None
+            rows, similarities = self._top_k(queries, n_results, candidates)
+            result: Dict[str, Any] = {"ids": [[self.ids[row] for row in hits] for hits in rows]}
+            for key in ("documents", "metadatas"):
+                if key in include:
+                    values = getattr(self, key)
+                    result[key] = [[values[row] for row in hits] for hits in rows]
+            if "distances" in include:
+                scale = 2 if self.space == "l2" else 1
+                result["distances"] = [(scale - scale * scores).tolist() for scores in similarities]
+            return result
+
+    def _top_k(self, queries: np.ndarray, k: int, candidates: Optional[np.ndarray] = None):
+        """
+        Row numbers and cosine similarities of the k nearest rows to each query, nearest first,
+        among the `candidates` rows (ascending) if given; only those rows are read and scored.
+        """
+        total = self._size if candidates is None else len(candidates)
+        k = min(k, total)
+        if k <= 0:
+            return [[] for _ in queries], [np.zeros(0, dtype=np.float32) for _ in queries]
+        matrix = self._matrix()
+        similarities = np.empty((len(queries), total), dtype=np.float32)
+        for start in range(0, total, _QUERY_BLOCK):
+            if candidates is None:
+                block_rows = slice(start, min(start + _QUERY_BLOCK, total))
+            else:
+                block_rows = candidates[start:start + _QUERY_BLOCK]
+            block = matrix[block_rows].astype(np.float32)
+            scores = queries @ block.T
+            if self.dtype == "int8":
+                scores *= self._scales[block_rows]
+            similarities[:, start:start + len(block)] = scores
+
+        rows, best = [], []
+        for scores in similarities:
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            # Nearest first, ties in row order
+            top = top[np.lexsort((top, -scores[top]))]
+            rows.append((top if candidates is None else candidates[top]).tolist())
+            best.append(scores[top])
+        return rows, best
+
+    # Metadata filters
+
+    def _value_masks(self, key: str) -> Dict[Any, np.ndarray]:
+        """Bitmap of the rows holding each value of a metadata key, built on first use after a write."""
+        masks = self._bitmaps.get(key)
+        if masks is None:
+            rows_by_value: Dict[Any, List[int]] = {}
+            for row, metadata in enumerate(self.metadatas):
+                if metadata and key in metadata:
+                    rows_by_value.setdefault(metadata[key], []).append(row)
+            masks = {}
+            for value, rows in rows_by_value.items():
+                mask = np.zeros(self._size, dtype=bool)
+                mask[rows] = True
+                masks[value] = mask
+            self._bitmaps[key] = masks
+        return masks
+
+    def _where_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        Rows whose metadata satisfies a Chroma where clause: equality or $eq / $ne / $in / $nin on
+        a key, combined with $and / $or.
+        """
+        if "$and" in where or "$or" in where:
+            operator, clauses = next(iter(where.items()))
+            masks = [self._where_mask(clause) for clause in clauses]
+            return np.logical_and.reduce(masks) if operator == "$and" else np.logical_or.reduce(masks)
+
+        mask = np.ones(self._size, dtype=bool)
+        for key, condition in where.items():
+            operator, operand = next(iter(condition.items())) if isinstance(condition, dict) else ("$eq", condition)
+            masks = self._value_masks(key)
+            values = operand if operator in ("$in", "$nin") else [operand]
+            selected = np.zeros(self._size, dtype=bool)
+            for value in values:
+                if value in masks:
+                    selected |= masks[value]
+            if operator in ("$eq", "$in"):
+                mask &= selected
+            elif operator in ("$ne", "$nin"):
+                mask &= ~selected
+            else:
+                raise ValueError(f"Unsupported where operator '{operator}'")
+        return mask
+
+
+class NumpyVectorStore:
+    """Directory of NumpyVectorCollections, one subdirectory per collection, kept open once opened."""
+
+    def __init__(self, directory: Optional[str] = None, dtype: Optional[str] = None):
+        self.directory = directory or VECTOR_STORE_CONFIG["numpy_directory"]
+        self.dtype = dtype or VECTOR_STORE_CONFIG["numpy_dtype"]
+        self._collections: Dict[str, NumpyVectorCollection] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_collection(self, name: str, embedding_function: EmbeddingFunction) -> NumpyVectorCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = NumpyVectorCollection(name, embedding_function, os.path.join(self.directory, name), self.dtype)
+                self._collections[name] = collection
+            collection.embedding_function = embedding_function
+            return collection
+
+    def delete_collection(self, name: str):
+        with self._lock:
+            self._collections.pop(name, None)
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def persist(self, collection: NumpyVectorCollection):
+        collection.persist()
+
+
+def open_vector_store():
+    """The vector store VECTOR_STORE_CONFIG selects."""
+    backend = VECTOR_STORE_CONFIG["backend"]
+    if backend == "chroma":
+        return ChromaVectorStore()
+    if backend == "numpy":
+        return NumpyVectorStore()
+    raise ValueError(f"Unknown vector store backend '{backend}', expected 'chroma' or 'numpy'")
+
+
+def _normalized(embeddings: Any) -> np.ndarray:
+    """Embeddings as a float32 matrix of unit rows (zero rows stay zero)."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1)
+
+
+def _dequantize(vectors: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    return matrix * scales[:, None] if scales is not None else matrix
+
+
+def _save_array(path: str, array: np.ndarray):
+    """np.save through a temporary file, so a memory map of the previous file stays valid."""
+    temporary = path + ".tmp.npy"
+    np.save(temporary, np.ascontiguousarray(array))
+    os.replace(temporary, path)
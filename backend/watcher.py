@@ -0,0 +1,150 @@
+"""
+Watch backend/data/collections and incrementally re-index loaded collections.
+
+When a loaded collection file changes on disk, it is recompiled and diffed
+endpoint by endpoint against the resident version. Only the added, changed and
+removed endpoints are touched in the DataFrame, the search structures and the
+vector store; the snapshot of the new version is written in the background
+after it is served. Collections that are not loaded are ignored.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from backend.config import COLLECTIONS_DIR, SNAPSHOT_CONFIG, WATCHER_CONFIG
+from backend.index import EndpointIndex, IndexDiff, diff_indexes
+from backend.loader import parse_collection_file
+from backend.snapshot import fingerprint_file, load_snapshot, save_snapshot
+from backend.tools.rag_tools import update_endpoints_in_rag
+from backend.workspace import CollectionRegistry, LoadedCollection
+
+
+def reindex_collection(registry: CollectionRegistry, file_path: str) -> Optional[IndexDiff]:
+    """
+    Bring a loaded collection in line with its file on disk.
+    Returns the applied diff, or None if the collection is not loaded or the file is unchanged.
+    """
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    loaded = registry.get(name)
+    if loaded is None or loaded.name != name:
+        return None
+
+    start = time.perf_counter()
+    fingerprint = fingerprint_file(file_path)
+    if fingerprint == loaded.fingerprint:
+        return None
+
+    # Parsed in memory; the snapshot is written once the new version is served
+    index, header, _ = parse_collection_file(file_path)
+    index.fingerprint = fingerprint
+    parsed = time.perf_counter()
+    previous = loaded.index
+    diff = diff_indexes(previous, index)
+    index.inherit(previous, diff)
+    registry.swap_index(loaded, index)
+    loaded.header = header
+    loaded.source_path = file_path
+    updated = time.perf_counter()
+
+    rag_report = update_endpoints_in_rag(loaded, diff) if not diff.is_empty else "no vector changes"
+    print(f"[reindex_collection] {name}: {diff.summary()}; parsed in {parsed - start:.3f}s, "
+          f"index updated in {(updated - parsed) * 1000:.1f} ms ({rag_report})")
+    if SNAPSHOT_CONFIG["enabled"]:
+        threading.Thread(target=_serve_snapshot, args=(registry, loaded, index, header),
+                         name=f"snapshot-{name}", daemon=True).start()
+    return diff
+
+
+def _serve_snapshot(registry: CollectionRegistry, loaded: LoadedCollection, index: EndpointIndex,
+                    header: Dict[str, Any]):
+    """
+    Write the snapshot of a re-indexed version, then serve its memory-mapped copy with the same
+    search structures, so endpoint payloads stop being resident. Skipped if a newer version is served.
+    """
+    try:
+        save_snapshot(index.fingerprint, index, header)
+    except OSError as e:
+        print(f"[reindex_collection] Could not write snapshot: {str(e)}")
+        return
+    cached = load_snapshot(index.fingerprint)
+    if cached is None:
+        return
+    mapped, _ = cached
+    mapped.fingerprint = index.fingerprint
+    mapped.adopt_search_structures(index)
+    registry.swap_index(loaded, mapped, expected=index)
+
+
+class _CollectionChangeHandler(FileSystemEventHandler):
+    """Debounces file events and re-indexes each changed collection once they settle."""
+
+    def __init__(self, registry: CollectionRegistry, debounce_seconds: float):
+        self.registry = registry
+        self.debounce_seconds = debounce_seconds
+        self._timers: Dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    def on_created(self, event: FileSystemEvent):
+        self._schedule(event.src_path, event.is_directory)
+
+    def on_modified(self, event: FileSystemEvent):
+        self._schedule(event.src_path, event.is_directory)
+
+    def on_moved(self, event: FileSystemEvent):
+        # Atomic saves write a temporary file and rename it over the collection
+        self._schedule(event.dest_path, event.is_directory)
+
+    def _schedule(self, path, is_directory: bool):
+        path = os.fsdecode(path)
+        if is_directory or not path.endswith(".json"):
+            return
+        with self._lock:
+            timer = self._timers.pop(path, None)
+            if timer is not None:
+                timer.cancel()
+            timer = threading.Timer(self.debounce_seconds, self._reindex, args=(path,))
+            timer.daemon = True
+            self._timers[path] = timer
+            timer.start()
+
+    def _reindex(self, path: str):
+        with self._lock:
+            self._timers.pop(path, None)
+        if not os.path.exists(path):
+            return
+        try:
+            reindex_collection(self.registry, path)
+        except Exception as e:
+            # A half-written export fails to parse; the next modification event retries
+            print(f"[collection_watcher] Could not re-index {path}: {str(e)}")
+
+
+class CollectionWatcher:
+    """Background watchdog observer over the collections directory."""
+
+    def __init__(self, registry: CollectionRegistry, directory: Optional[str] = None,
+                 debounce_seconds: Optional[float] = None):
+        self.directory = str(directory or COLLECTIONS_DIR)
+        debounce = WATCHER_CONFIG["debounce_seconds"] if debounce_seconds is None else debounce_seconds
+        self._handler = _CollectionChangeHandler(registry, debounce)
+        self._observer: Optional[Observer] = None
+
+    def start(self):
+        if self._observer is not None:
+            return
+        self._observer = Observer()
+        self._observer.schedule(self._handler, self.directory, recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+        print(f"[collection_watcher] Watching {self.directory}")
+
+    def stop(self):
+        if self._observer is None:
+            return
+        self._observer.stop()
+        self._observer.join()
+        self._observer = None
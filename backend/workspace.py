@@ -0,0 +1,166 @@
+"""
+Registry of the collections that are resident in memory at the same time.
+
+Each collection keeps its own compiled index and vector store handle, so
+loading one collection never evicts another one's data or embeddings.
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import xxhash
+
+from backend.index import EndpointIndex
+
+_VECTOR_NAME_PREFIX = 54     # of the 63 characters a vector collection name may have; a dash and 8 hash digits follow
+
+
+@dataclass
+class LoadedCollection:
+    """A collection resident in the workspace, addressed by `name` (the file stem)."""
+    name: str
+    source_path: str
+    index: EndpointIndex
+    header: Dict[str, Any] = field(default_factory=dict)   # top-level members except "item"
+    vector_collection: Any = None
+    loaded_to_rag: bool = False
+
+    @property
+    def title(self) -> str:
+        return self.index.name
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        return self.index.fingerprint
+
+    @property
+    def vector_collection_name(self) -> str:
+        """
+        Name of the vector store collection holding this collection's embeddings: a readable prefix
+        of the file stem plus a hash of the exact stem, so stems differing only in case or punctuation
+        never share vectors. Valid for Chroma (3-63 characters of [a-z0-9._-], starting and ending
+        with a letter or digit, no "..").
+        """
+        prefix = re.sub(r"[^a-z0-9._-]+", "_", self.name.lower())
+        prefix = re.sub(r"\.{2,}", ".", prefix)[:_VECTOR_NAME_PREFIX].strip("._-") or "collection"
+        return f"{prefix}-{xxhash.xxh3_64_hexdigest(self.name.encode())[:8]}"
+
+
+def _normalize(selector: str) -> str:
+    return re.sub(r"[\s_\-]+", " ", selector.strip().lower())
+
+
+class CollectionRegistry:
+    """Thread-safe, insertion-ordered set of loaded collections with an active default."""
+
+    def __init__(self, on_index_change: Optional[Callable[[Optional[EndpointIndex], Optional[EndpointIndex]], None]] = None):
+        self._collections: "OrderedDict[str, LoadedCollection]" = OrderedDict()
+        self._active: Optional[str] = None
+        self._lock = threading.RLock()
+        # Called as (previous index, new index) when a name starts, stops or changes serving an index
+        self.on_index_change = on_index_change
+
+    def _index_changed(self, previous: Optional[EndpointIndex], current: Optional[EndpointIndex]):
+        # Outside the lock: the hook may do real work (e.g. pre-render documents)
+        if self.on_index_change is not None and previous is not current:
+            self.on_index_change(previous, current)
+
+    def __len__(self) -> int:
+        return len(self._collections)
+
+    def __iter__(self) -> Iterator[LoadedCollection]:
+        with self._lock:
+            return iter(list(self._collections.values()))
+
+    @property
+    def active(self) -> Optional[LoadedCollection]:
+        with self._lock:
+            return self._collections.get(self._active) if self._active else None
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._collections)
+
+    def add(self, collection: LoadedCollection, activate: bool = True) -> LoadedCollection:
+        """Register a collection, replacing any previous version with the same name."""
+        with self._lock:
+            previous = self._collections.get(collection.name)
+            self._collections[collection.name] = collection
+            if activate or self._active is None:
+                self._active = collection.name
+        self._index_changed(previous.index if previous is not None else None, collection.index)
+        return collection
+
+    def swap_index(self, collection: LoadedCollection, index: EndpointIndex,
+                   expected: Optional[EndpointIndex] = None) -> bool:
+        """
+        Serve a new version of a resident collection; with `expected`, only if that is the index
+        it still serves. Returns whether the index was swapped.
+        """
+        with self._lock:
+            previous = collection.index
+            if expected is not None and previous is not expected:
+                return False
+            # One assignment, so concurrent tool calls see either version, never a mix
+            collection.index = index
+        self._index_changed(previous, index)
+        return True
+
+    def serves(self, fingerprint: Optional[str]) -> bool:
+        """Whether a loaded collection currently serves this version of a collection file."""
+        with self._lock:
+            return fingerprint is not None and any(collection.index.fingerprint == fingerprint
+                                                   for collection in self._collections.values())
+
+    def activate(self, name: str):
+        with self._lock:
+            if name in self._collections:
+                self._active = name
+
+    def get(self, selector: Optional[str] = None) -> Optional[LoadedCollection]:
+        """
+        Resolve a collection by file name, file stem or collection title (case-insensitive).
+        No selector means the active collection.
+        """
+        with self._lock:
+            if not selector:
+                return self.active
+            if selector in self._collections:
+                return self._collections[selector]
+
+            wanted = _normalize(selector)
+            if wanted.endswith(".json"):
+                wanted = wanted[:-len(".json")]
+            for collection in self._collections.values():
+                if wanted in (_normalize(collection.name), _normalize(collection.title)):
+                    return collection
+            return None
+
+    def remove(self, selector: Optional[str] = None) -> Optional[LoadedCollection]:
+        with self._lock:
+            collection = self.get(selector)
+            if collection is None:
+                return None
+            del self._collections[collection.name]
+            if self._active == collection.name:
+                self._active = next(reversed(self._collections), None)
+        self._index_changed(collection.index, None)
+        return collection
+
+    def clear(self):
+        with self._lock:
+            removed = list(self._collections.values())
+            self._collections.clear()
+            self._active = None
+        for collection in removed:
+            self._index_changed(collection.index, None)
+
+
+def missing_collection_message(registry: CollectionRegistry, selector: Optional[str] = None) -> str:
+    """Tool-facing explanation of why no collection could be resolved."""
+    if selector and len(registry):
+        return (f"Collection '{selector}' is not loaded. Loaded collections: {', '.join(registry.names())}. "
+                "Load it first using the load_postman_collection tool.")
+    return "No collection loaded. Please load a collection first using the load_postman_collection tool."